@@ -0,0 +1,125 @@
+"""
+Prueba de carga HTTP contra el despliegue sync (gunicorn + WSGI) y el async
+(uvicorn + /api/async/): requests/s y p50/p99 con N clientes concurrentes.
+
+    docker compose up -d web web-async
+    python benchmarks/bench_async.py --concurrency 64 --duration 20
+    python benchmarks/bench_async.py --slow-share 0.1 --slow-radius 200000
+
+Una fracción `--slow-share` de los requests son `nearby` con un radio
+enorme (consultas lentas); las latencias de los demás se reportan aparte
+para ver si las lentas los bloquean. No usa Django: sólo la biblioteca
+estándar, para poder correrlo desde cualquier máquina.
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+TARGETS = {
+    "sync": ("http://localhost:8000", "/api/spots/"),
+    "async": ("http://localhost:8001", "/api/async/spots/"),
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))] if values else float("nan")
+
+
+def fetch(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    request = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(request, timeout=60) as r:
+            r.read()
+            return r.status
+    except urllib.error.HTTPError as exc:
+        return exc.code
+    except OSError:
+        return 0
+
+
+def sample_points(base, prefix, n):
+    with urllib.request.urlopen(f"{base}{prefix}?page_size={n}", timeout=60) as r:
+        results = json.load(r)["results"]
+    return [tuple(s["location"]["coordinates"]) for s in results] or [(-99.1332, 19.4326)]
+
+
+def make_request(rng, base, prefix, points, args):
+    """(tipo, url, body) de un request al azar de la mezcla."""
+    lng, lat = rng.choice(points)
+    lng += rng.uniform(-0.01, 0.01)
+    lat += rng.uniform(-0.01, 0.01)
+    if rng.random() < args.slow_share:
+        return "lento", f"{base}{prefix}nearby/?lat={lat}&lng={lng}&radius={args.slow_radius}&page_size=50", None
+    if rng.random() < 0.5:
+        return "rápido", f"{base}{prefix}nearby/?lat={lat}&lng={lng}&radius={args.radius}&page_size=50", None
+    d = 0.02
+    polygon = {"type": "Polygon", "coordinates": [[
+        [lng - d, lat - d], [lng + d, lat - d], [lng + d, lat + d], [lng - d, lat + d], [lng - d, lat - d],
+    ]]}
+    return "rápido", f"{base}{prefix}within/?page_size=50", {"polygon": polygon}
+
+
+def run(name, base, prefix, args):
+    points = sample_points(base, prefix, 200)
+    deadline = time.perf_counter() + args.duration
+    timings = {"rápido": [], "lento": []}
+    errors = 0
+    lock = threading.Lock()
+
+    def client(seed):
+        nonlocal errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            kind, url, body = make_request(rng, base, prefix, points, args)
+            started = time.perf_counter()
+            status = fetch(url, body)
+            elapsed = (time.perf_counter() - started) * 1e3
+            with lock:
+                if status == 200:
+                    timings[kind].append(elapsed)
+                else:
+                    errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(client, range(args.seed, args.seed + args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    done = sum(len(v) for v in timings.values())
+    print(f"{name:<6} {done / elapsed:>9.1f} req/s  errores {errors:>5}")
+    for kind, values in timings.items():
+        if values:
+            print(
+                f"  {kind:<7} n={len(values):>6}  p50 {percentile(values, 50):8.1f} ms"
+                f"  p99 {percentile(values, 99):8.1f} ms"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--sync-url", default=TARGETS["sync"][0])
+    parser.add_argument("--async-url", default=TARGETS["async"][0])
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--radius", type=float, default=2000)
+    parser.add_argument("--slow-share", type=float, default=0.0)
+    parser.add_argument("--slow-radius", type=float, default=200000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    bases = {"sync": args.sync_url, "async": args.async_url}
+    print(f"{args.concurrency} clientes, {args.duration:.0f}s por despliegue, lentos: {args.slow_share:.0%}")
+    for name in args.targets:
+        run(name, bases[name].rstrip("/"), TARGETS[name][1], args)
+
+
+if __name__ == "__main__":
+    main()
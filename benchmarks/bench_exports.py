@@ -0,0 +1,98 @@
+"""
+Throughput y pico de memoria al bajar el catálogo completo: listado
+paginado (page_size=200) contra las exportaciones en streaming.
+
+    python benchmarks/bench_exports.py
+    python benchmarks/bench_exports.py --modes ndjson csv --chunk-size 5000
+
+Cada modo corre en un proceso aparte para que el pico de RSS
+(ru_maxrss) sea sólo suyo.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+MODES = {
+    "paginado": None,
+    "ndjson": "/api/spots/export/ndjson/",
+    "csv": "/api/spots/export/csv/",
+    "geojson": "/api/spots/export/geojson/",
+}
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, chunk_size):
+    import django
+
+    django.setup()
+    from django.test import Client, override_settings
+
+    client = Client()
+    client.get("/api/health/")
+    baseline = rss_mb()
+    started = time.perf_counter()
+    size = requests = 0
+
+    if MODES[mode] is None:
+        url = "/api/spots/?page_size=200"
+        with override_settings(SPOTS_RESPONSE_CACHE=False):
+            while url:
+                r = client.get(url)
+                requests += 1
+                size += len(r.content)
+                url = r.json()["next"]
+    else:
+        with override_settings(SPOTS_EXPORT_CHUNK_SIZE=chunk_size):
+            r = client.get(MODES[mode])
+            requests = 1
+            for chunk in r.streaming_content:
+                size += len(chunk)
+
+    elapsed = time.perf_counter() - started
+    from spots.models import Spot
+
+    rows = Spot.objects.filter(removed_at__isnull=True).count()
+    print(json.dumps({
+        "mode": mode, "rows": rows, "requests": requests, "seconds": elapsed,
+        "mb": size / 1e6, "rss_peak_mb": rss_mb(), "rss_delta_mb": rss_mb() - baseline,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--run", choices=list(MODES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run(args.run, args.chunk_size)
+        return
+
+    print(f"{'modo':<10} {'filas':>9} {'requests':>9} {'seg':>8} {'filas/s':>10} {'MB':>8} {'RSS pico':>9} {'Δ RSS':>8}")
+    for mode in args.modes:
+        out = subprocess.run(
+            [sys.executable, __file__, "--run", mode, "--chunk-size", str(args.chunk_size)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        s = json.loads(out.strip().splitlines()[-1])
+        rate = s["rows"] / s["seconds"] if s["seconds"] else 0
+        print(
+            f"{mode:<10} {s['rows']:>9} {s['requests']:>9} {s['seconds']:>8.2f} {rate:>10.0f} "
+            f"{s['mb']:>8.1f} {s['rss_peak_mb']:>8.0f}M {s['rss_delta_mb']:>7.0f}M"
+        )
+
+
+if __name__ == "__main__":
+    main()
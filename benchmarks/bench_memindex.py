@@ -0,0 +1,88 @@
+"""
+Latencia de /api/spots/nearby/ y /api/spots/within/ con PostGIS y con el
+índice espacial en memoria, sobre los spots ya cargados en la base.
+
+    python benchmarks/bench_memindex.py --samples 500 --radius 2000
+
+Reporta p50/p99 por endpoint y motor. Los centros de consulta se toman de
+spots existentes para que cada consulta tenga resultados.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.test import Client, override_settings  # noqa: E402
+
+from spots import memindex  # noqa: E402
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+def run(label, client, requests):
+    timings = []
+    for method, url, body in requests:
+        started = time.perf_counter()
+        if method == "get":
+            r = client.get(url)
+        else:
+            r = client.post(url, body, content_type="application/json")
+        timings.append((time.perf_counter() - started) * 1e3)
+        assert r.status_code == 200, r.content
+    print(
+        f"  {label:<8} p50 {percentile(timings, 50):8.2f} ms   p99 {percentile(timings, 99):8.2f} ms"
+        f"   media {statistics.mean(timings):8.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--samples", type=int, default=300)
+    parser.add_argument("--radius", type=float, default=2000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    index = memindex.get_index()
+    print(f"índice construido: {len(index)} spots en {time.perf_counter() - started:.2f}s")
+    if not len(index):
+        return
+
+    rng = random.Random(args.seed)
+    nearby, within = [], []
+    for _ in range(args.samples):
+        i = rng.randrange(len(index))
+        lat, lng = float(index.lats[i]), float(index.lngs[i])
+        nearby.append((
+            "get", f"/api/spots/nearby/?lat={lat}&lng={lng}&radius={args.radius}&page_size={args.page_size}", None,
+        ))
+        half = args.radius / 111_320
+        ring = [[lng - half, lat - half], [lng - half, lat + half], [lng + half, lat + half], [lng + half, lat - half]]
+        body = f'{{"polygon": {{"type": "Polygon", "coordinates": [{ring}]}}}}'
+        within.append(("post", f"/api/spots/within/?page_size={args.page_size}", body))
+
+    client = Client()
+    for name, requests in (("nearby", nearby), ("within", within)):
+        print(f"{name} ({len(requests)} consultas, page_size={args.page_size})")
+        with override_settings(SPOTS_MEMORY_INDEX=False):
+            run("PostGIS", client, requests)
+        with override_settings(SPOTS_MEMORY_INDEX=True):
+            run("memoria", client, requests)
+
+
+if __name__ == "__main__":
+    main()
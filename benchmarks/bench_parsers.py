@@ -0,0 +1,102 @@
+"""
+Micro-benchmark de los parsers de load_data sobre un CSV real.
+
+    python benchmarks/bench_parsers.py --csv data/LK_SPOTS.csv --repeat 20
+
+Compara las funciones originales (to_dec, to_float, to_int, parse_date,
+map_modality) contra los parsers por columna de RowParser.
+"""
+import argparse
+import csv
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from spots.management.commands.utils import (  # noqa: E402
+    RowParser, _fast_float, map_modality, norm, parse_date, to_dec, to_float, to_int,
+)
+
+
+def legacy_row(row):
+    spot_id = to_int(norm(row.get("spot_id")))
+    lat = to_float(row.get("spot_latitude"))
+    lng = to_float(row.get("spot_longitude"))
+    if spot_id is None or lat is None or lng is None:
+        return None
+    rec = dict(
+        spot_id=spot_id, lat=lat, lng=lng,
+        state=norm(row.get("spot_state")),
+        municipality=norm(row.get("spot_municipality")),
+        settlement=norm(row.get("spot_settlement")),
+        region=norm(row.get("spot_region")),
+        corridor=norm(row.get("spot_corridor")),
+        title=norm(row.get("spot_title")),
+        description=norm(row.get("spot_description")),
+        address=norm(row.get("spot_address")),
+        sector_id=to_int(row.get("spot_sector_id")),
+        type_id=to_int(row.get("spot_type_id")),
+        modality=map_modality(row.get("spot_modality")),
+        user_id=norm(row.get("uuiid") or row.get("user_id")),
+        created_date=parse_date(row.get("spot_created_date")),
+    )
+    for field, column in RowParser.DECIMAL_COLUMNS:
+        rec[field] = to_dec(row.get(column))
+    return rec
+
+
+def bench(label, factory, values, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        fn = factory()
+        started = time.perf_counter()
+        for v in values:
+            fn(v)
+        best = min(best, time.perf_counter() - started)
+    per_value = best / len(values) * 1e9 if values else 0
+    print(f"  {label:<10} {best * 1e3:9.2f} ms  {per_value:8.0f} ns/valor")
+    return best
+
+
+def compare(name, legacy, fast, values, repeat):
+    """`fast` es una fábrica: cada repetición arranca con caches vacíos."""
+    print(f"{name} ({len(values)} valores)")
+    old = bench("actual", lambda: legacy, values, repeat)
+    new = bench("rápido", fast, values, repeat)
+    print(f"  speedup    {old / new:9.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="data/LK_SPOTS.csv")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.csv, encoding="utf-8-sig", newline="") as f:
+        rows = list(csv.DictReader(f))
+
+    column = lambda name: [r.get(name) for r in rows]  # noqa: E731
+
+    compare("spot_created_date", parse_date, lambda: RowParser().date.parse,
+            column("spot_created_date"), args.repeat)
+    compare("spot_price_total_mxn_rent", to_dec, lambda: RowParser().decimals[2][2],
+            column("spot_price_total_mxn_rent"), args.repeat)
+    compare("spot_latitude", to_float, lambda: _fast_float, column("spot_latitude"), args.repeat)
+    compare("spot_modality", map_modality, lambda: RowParser().modality,
+            column("spot_modality"), args.repeat)
+    compare("fila completa", legacy_row, RowParser, rows, args.repeat)
+
+    row_parser = RowParser()
+    mismatches = sum(legacy_row(r) != row_parser(r) for r in rows)
+    print(f"filas con resultado distinto: {mismatches}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+SpotListSerializer + JSONRenderer contra el encoder de spots/api/fast.py,
+sobre páginas reales del listado.
+
+    python benchmarks/bench_serializers.py --page-size 200 --pages 20 --repeat 5
+
+Mide consulta + serialización + render de cada página y verifica que ambos
+caminos produzcan exactamente los mismos bytes.
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from spots.api import fast  # noqa: E402
+from spots.api.serializers import SpotListSerializer  # noqa: E402
+from spots.api.views import SpotViewSet  # noqa: E402
+
+
+def serializer_page(qs, page):
+    return JSONRenderer().render(SpotListSerializer(list(qs[page]), many=True).data)
+
+
+def fast_page(qs, page):
+    return fast.encoder.encode_rows(list(fast.rows(qs)[page]))
+
+
+def bench(label, fn, pages, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for page in pages:
+            fn(SpotViewSet.queryset, page)
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<12} {best * 1e3:9.1f} ms   {best / len(pages) * 1e3:7.2f} ms/página")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--page-size", type=int, default=200)
+    parser.add_argument("--pages", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    total = SpotViewSet.queryset.count()
+    pages = [
+        slice(i * args.page_size, (i + 1) * args.page_size)
+        for i in range(min(args.pages, -(-total // args.page_size)))
+    ]
+    if not pages:
+        print("No hay spots cargados.")
+        return
+
+    qs = SpotViewSet.queryset
+    mismatches = sum(serializer_page(qs, page) != fast_page(qs, page) for page in pages)
+    print(f"{len(pages)} páginas de {args.page_size} spots (páginas con bytes distintos: {mismatches})")
+    old = bench("serializer", serializer_page, pages, args.repeat)
+    new = bench("rápido", fast_page, pages, args.repeat)
+    print(f"  speedup      {old / new:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -23,6 +23,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "spots.middleware.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -51,23 +52,24 @@ TEMPLATES = [{
 WSGI_APPLICATION = "config.wsgi.application"
 ASGI_APPLICATION = "config.asgi.application"
 
+
+def database_from_url(url):
+    u = urlparse(url)
+    return {
+        "NAME": u.path.lstrip("/"),
+        "USER": u.username,
+        "PASSWORD": u.password,
+        "HOST": u.hostname,
+        "PORT": u.port or "5432",
+    }
+
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 if DATABASE_URL:
-    u = urlparse(DATABASE_URL)
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.contrib.gis.db.backends.postgis",
-            "NAME": u.path.lstrip("/"),
-            "USER": u.username,
-            "PASSWORD": u.password,
-            "HOST": u.hostname,
-            "PORT": u.port or "5432",
-        }
-    }
+    DATABASES = {"default": database_from_url(DATABASE_URL)}
 else:
     DATABASES = {
         "default": {
-            "ENGINE": "django.contrib.gis.db.backends.postgis",
             "NAME": "geodb",
             "USER": "geo",
             "PASSWORD": "geo",
@@ -76,6 +78,45 @@ else:
         }
     }
 
+# Manejo de conexiones (ver spots/db/). DB_POOL=1 usa el pool en el proceso
+# (CONN_MAX_AGE queda en 0); si no, conexiones persistentes por hilo durante
+# DB_CONN_MAX_AGE segundos. Con DB_PGBOUNCER=1 (modo transacción) se apagan los
+# cursores del lado del servidor y las sentencias preparadas.
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+DB_PGBOUNCER = os.getenv("DB_PGBOUNCER", "0") == "1"
+DATABASES["default"].update({
+    "ENGINE": "spots.db.backends.postgis",
+    "CONN_MAX_AGE": 0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "60")),
+    "CONN_HEALTH_CHECKS": True,
+    "DISABLE_SERVER_SIDE_CURSORS": DB_PGBOUNCER,
+    "OPTIONS": {
+        "connect_timeout": int(os.getenv("DB_CONNECT_TIMEOUT", "5")),
+        "prepared_statements": not DB_PGBOUNCER and os.getenv("DB_PREPARED_STATEMENTS", "1") == "1",
+    },
+})
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "20")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "5")),
+        "max_lifetime": float(os.getenv("DB_POOL_MAX_LIFETIME", "3600")),
+    }
+
+# Réplicas de lectura para SpotViewSet (ver spots/db/replicas.py), URLs separadas
+# por comas. En los tests cada réplica tiene su propia base (test_<base>_replica_N).
+SPOTS_READ_REPLICAS = []
+for i, url in enumerate(filter(None, os.getenv("DATABASE_REPLICA_URLS", "").split(",")), start=1):
+    alias = f"replica_{i}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        **database_from_url(url),
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"NAME": f"test_{DATABASES['default']['NAME']}_{alias}"},
+    }
+    SPOTS_READ_REPLICAS.append(alias)
+DATABASE_ROUTERS = ["spots.db.replicas.ReplicaRouter"]
+SPOTS_REPLICA_MAX_LAG = float(os.getenv("SPOTS_REPLICA_MAX_LAG", "30"))
+SPOTS_REPLICA_CHECK_INTERVAL = float(os.getenv("SPOTS_REPLICA_CHECK_INTERVAL", "5"))
+
 LANGUAGE_CODE = "es"
 TIME_ZONE = "UTC"
 USE_I18N = True
@@ -90,6 +131,69 @@ REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
+# CACHE_BACKEND admite cualquier backend de Django, p.ej.
+# django.core.cache.backends.redis.RedisCache con CACHE_LOCATION=redis://redis:6379/1
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"),
+        "LOCATION": os.getenv("CACHE_LOCATION", "geospots"),
+        "TIMEOUT": int(os.getenv("CACHE_TIMEOUT", "3600")),
+    }
+}
+if CACHES["default"]["BACKEND"].endswith("LocMemCache"):
+    CACHES["default"]["OPTIONS"] = {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "5000"))}
+# Buffer de consultas lentas (ver spots/slow_queries.py); en archivos para que
+# `manage.py slow_queries` vea lo que capturaron los workers del mismo host.
+# En archivos las capturas simultáneas pueden pisarse: en producción, Redis o Memcached.
+CACHES["profiling"] = {
+    "BACKEND": os.getenv("PROFILING_CACHE_BACKEND", "django.core.cache.backends.filebased.FileBasedCache"),
+    "LOCATION": os.getenv("PROFILING_CACHE_LOCATION", str(BASE_DIR / "data" / "profiling")),
+    "TIMEOUT": None,
+    "OPTIONS": {"MAX_ENTRIES": 10_000},
+}
+
+# Cache de respuestas de SpotViewSet por versión del dataset (ver spots/cache.py).
+SPOTS_RESPONSE_CACHE = os.getenv("SPOTS_RESPONSE_CACHE", "1") == "1"
+SPOTS_CACHE_ALIAS = os.getenv("SPOTS_CACHE_ALIAS", "default")
+SPOTS_DATASET_VERSION_TTL = float(os.getenv("SPOTS_DATASET_VERSION_TTL", "5"))
+
+# Listado/nearby/within/top-rent en JSON sin pasar por SpotListSerializer (ver spots/api/fast.py).
+SPOTS_FAST_SERIALIZER = os.getenv("SPOTS_FAST_SERIALIZER", "1") == "1"
+
+# Filas por cada fetch del cursor del lado del servidor en las exportaciones.
+SPOTS_EXPORT_CHUNK_SIZE = int(os.getenv("SPOTS_EXPORT_CHUNK_SIZE", "2000"))
+
+# Snapshots columnar (Parquet/Arrow) por versión del dataset (ver spots/snapshot.py).
+SPOTS_SNAPSHOT_DIR = Path(os.getenv("SPOTS_SNAPSHOT_DIR", BASE_DIR / "data" / "snapshots"))
+
+# Zoom máximo de la grilla de clusters precalculada por load_data (ver spots/clusters.py).
+SPOTS_GRID_MAX_ZOOM = int(os.getenv("SPOTS_GRID_MAX_ZOOM", "10"))
+
+# Atributos por defecto de cada feature en los vector tiles (ver spots/api/tiles.py).
+SPOTS_TILE_FIELDS = os.getenv("SPOTS_TILE_FIELDS", "spot_id,sector_id,type_id,price_total_rent_mxn").split(",")
+
+# Hilos (y conexiones a Postgres) por proceso para las vistas async bajo /api/async/.
+SPOTS_ASYNC_DB_THREADS = int(os.getenv("SPOTS_ASYNC_DB_THREADS", "16"))
+
+# Métricas por acción de SpotViewSet en /metrics y aviso en el log de los
+# requests que pasan el presupuesto de consultas o de tiempo (ver spots/middleware.py).
+SPOTS_METRICS = os.getenv("SPOTS_METRICS", "1") == "1"
+SPOTS_METRICS_QUERY_BUDGET = int(os.getenv("SPOTS_METRICS_QUERY_BUDGET", "20"))
+SPOTS_METRICS_TIME_BUDGET_MS = float(os.getenv("SPOTS_METRICS_TIME_BUDGET_MS", "1000"))
+
+# Consultas de SpotViewSet y load_data de SPOTS_SLOW_QUERY_MS o más: SQL, parámetros
+# y, para una fracción SPOTS_SLOW_QUERY_EXPLAIN_RATE, el plan de EXPLAIN (ANALYZE, BUFFERS).
+SPOTS_SLOW_QUERIES = os.getenv("SPOTS_SLOW_QUERIES", "1") == "1"
+SPOTS_SLOW_QUERY_MS = float(os.getenv("SPOTS_SLOW_QUERY_MS", "250"))
+SPOTS_SLOW_QUERY_EXPLAIN_RATE = float(os.getenv("SPOTS_SLOW_QUERY_EXPLAIN_RATE", "0.1"))
+SPOTS_SLOW_QUERY_BUFFER = int(os.getenv("SPOTS_SLOW_QUERY_BUFFER", "100"))
+SPOTS_SLOW_QUERY_CACHE_ALIAS = os.getenv("SPOTS_SLOW_QUERY_CACHE_ALIAS", "profiling")
+
+# Índice espacial en memoria para nearby/within (ver spots/memindex.py).
+SPOTS_MEMORY_INDEX = os.getenv("SPOTS_MEMORY_INDEX", "0") == "1"
+SPOTS_MEMORY_INDEX_TTL = int(os.getenv("SPOTS_MEMORY_INDEX_TTL", "300"))
+SPOTS_MEMORY_INDEX_CELL_DEG = float(os.getenv("SPOTS_MEMORY_INDEX_CELL_DEG", "0.05"))
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "GeoSpots API",
     "DESCRIPTION": "API geoespacial (Django + GeoDjango + DRF + PostGIS).",
@@ -2,10 +2,13 @@ from django.contrib import admin
 from django.urls import path, include
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
+from spots.api.health import prometheus_metrics
+
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/", include("spots.api.urls")),
+    path("metrics", prometheus_metrics, name="metrics"),
 
     path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
     path("api/docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
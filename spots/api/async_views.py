@@ -0,0 +1,73 @@
+"""
+Versiones async de las acciones de lectura de SpotViewSet, para servir bajo
+ASGI (config.asgi con uvicorn). Cada request espera en el event loop y la
+vista DRF (consulta, serialización y cache) corre en un pool acotado de
+SPOTS_ASYNC_DB_THREADS hilos, cada uno con su propia conexión a Postgres: una
+consulta espacial lenta ocupa un hilo del pool, no el worker entero.
+
+Django 5.0 no tiene un driver async para el ORM (sus métodos a* pasan por un
+único hilo por request), así que el paralelismo contra la base lo da el pool.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from .renderers import MVTRenderer
+from .views import SpotViewSet
+
+_executor = None
+_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, "SPOTS_ASYNC_DB_THREADS", 16), thread_name_prefix="spots-db"
+            )
+        return _executor
+
+
+def _in_pool(view):
+    """La vista sync renderizada dentro del hilo, con las conexiones del hilo al día."""
+
+    def call(request, *args, **kwargs):
+        close_old_connections()
+        try:
+            response = view(request, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            return response
+        finally:
+            close_old_connections()
+
+    return call
+
+
+def async_view(actions, **initkwargs):
+    call = _in_pool(SpotViewSet.as_view(actions, **initkwargs))
+
+    async def view(request, *args, **kwargs):
+        return await sync_to_async(call, thread_sensitive=False, executor=executor())(request, *args, **kwargs)
+
+    view.csrf_exempt = True
+    # Como en las vistas de DRF, para identificar la acción (p.ej. en spots.middleware).
+    view.cls = SpotViewSet
+    view.actions = actions
+    return view
+
+
+spot_list = async_view({"get": "list"})
+spot_detail = async_view({"get": "retrieve"})
+nearby = async_view({"get": "nearby"})
+within = async_view({"post": "within"})
+within_batch = async_view({"post": "within_batch"})
+average_price_by_sector = async_view({"get": "average_price_by_sector"})
+top_rent = async_view({"get": "top_rent"})
+price_statistics = async_view({"get": "price_statistics"})
+clusters = async_view({"get": "clusters"})
+tile = async_view({"get": "tile"}, renderer_classes=[MVTRenderer])
@@ -0,0 +1,140 @@
+"""
+Exportaciones completas del listado filtrado, generadas y transmitidas por
+partes para que la memoria del worker no dependa del tamaño del resultado.
+"""
+import csv
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, FloatField, Func, TextField
+from django.http import StreamingHttpResponse
+
+# Columnas que viajan como properties de cada Feature (las del listado).
+PROPERTY_COLUMNS = (
+    "spot_id", "title", "sector_id", "type_id", "modality", "area_sqm",
+    "price_total_rent_mxn", "settlement_id", "region_id", "corridor_id",
+)
+
+
+class RawGeometry(Func):
+    """
+    La columna geométrica tal cual. GeoDjango agrega ::bytea al seleccionar
+    un campo geométrico; esto sólo sirve para subconsultas que se resuelven
+    en SQL y nunca se leen en Python.
+    """
+
+    template = "%(expressions)s"
+    output_field = TextField()
+
+
+def chunk_size():
+    return getattr(settings, "SPOTS_EXPORT_CHUNK_SIZE", 2000)
+
+
+def geojson_chunks(queryset, size=None):
+    """
+    FeatureCollection armada por PostGIS: cada fila sale como Feature de
+    ST_AsGeoJSON(t.*) y se lee con un cursor del lado del servidor.
+    """
+    size = size or chunk_size()
+    inner = queryset.annotate(geom=RawGeometry("location")).values(*PROPERTY_COLUMNS, "geom")
+    sql, params = inner.query.sql_with_params()
+
+    yield '{"type":"FeatureCollection","features":['
+    first = True
+    with connections[queryset.db].chunked_cursor() as cursor:
+        cursor.execute(f"SELECT ST_AsGeoJSON(t.*, 'geom', 15) FROM ({sql}) t", params)
+        while True:
+            rows = cursor.fetchmany(size)
+            if not rows:
+                break
+            chunk = ",".join(row[0] for row in rows)
+            yield chunk if first else "," + chunk
+            first = False
+    yield "]}"
+
+
+def geojson_response(queryset, filename="spots.geojson"):
+    response = StreamingHttpResponse(geojson_chunks(queryset), content_type="application/geo+json")
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# Columnas de las exportaciones NDJSON/CSV: el spot con sus entidades por nombre.
+EXPORT_COLUMNS = (
+    "spot_id", "title", "sector_id", "type_id", "modality", "lat", "lng", "address",
+    "area_sqm", "price_sqm_rent_mxn", "price_total_rent_mxn", "price_sqm_sale_mxn",
+    "price_total_sale_mxn", "maintenance_cost_mxn",
+    "state", "municipality", "settlement", "region", "corridor", "created_date",
+)
+
+
+def export_rows(queryset, size=None):
+    """
+    Tuplas en el orden de EXPORT_COLUMNS, leídas con .iterator(chunk_size),
+    que en Postgres usa un cursor del lado del servidor.
+    """
+    queryset = queryset.defer("location", "description").annotate(
+        lng=Func(F("location"), function="ST_X", output_field=FloatField()),
+        lat=Func(F("location"), function="ST_Y", output_field=FloatField()),
+    )
+    for spot in queryset.iterator(chunk_size=size or chunk_size()):
+        settlement = spot.settlement
+        municipality = settlement.municipality if settlement else None
+        yield (
+            spot.spot_id, spot.title, spot.sector_id, spot.type_id, spot.modality, spot.lat, spot.lng,
+            spot.address, spot.area_sqm, spot.price_sqm_rent_mxn, spot.price_total_rent_mxn,
+            spot.price_sqm_sale_mxn, spot.price_total_sale_mxn, spot.maintenance_cost_mxn,
+            municipality.state.name if municipality else None,
+            municipality.name if municipality else None,
+            settlement.name if settlement else None,
+            spot.region.name if spot.region_id else None,
+            spot.corridor.name if spot.corridor_id else None,
+            spot.created_date,
+        )
+
+
+def _batched(lines, size):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            yield "".join(batch)
+            batch = []
+    if batch:
+        yield "".join(batch)
+
+
+def ndjson_chunks(queryset, size=None):
+    """Un objeto JSON por línea; decimales como string y fechas en ISO 8601."""
+    size = size or chunk_size()
+    encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(",", ":"))
+    lines = (encoder.encode(dict(zip(EXPORT_COLUMNS, row))) + "\n" for row in export_rows(queryset, size))
+    return _batched(lines, size)
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def csv_chunks(queryset, size=None):
+    size = size or chunk_size()
+    writer = csv.writer(_Echo())
+    lines = (writer.writerow(["" if v is None else v for v in row]) for row in export_rows(queryset, size))
+    yield writer.writerow(EXPORT_COLUMNS)
+    yield from _batched(lines, size)
+
+
+EXPORTS = {
+    "ndjson": (ndjson_chunks, "application/x-ndjson"),
+    "csv": (csv_chunks, "text/csv; charset=utf-8"),
+}
+
+
+def stream_response(output, queryset):
+    chunks, content_type = EXPORTS[output]
+    response = StreamingHttpResponse(chunks(queryset), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="spots.{output}"'
+    return response
@@ -0,0 +1,137 @@
+"""
+Serialización rápida de SpotListSerializer: lee sólo las columnas
+necesarias con values(), las coordenadas como floats (ST_X/ST_Y) y arma el
+JSON con un encoder por fila precompilado. La salida es byte a byte igual a
+la de JSONRenderer sobre SpotListSerializer.
+"""
+import json
+
+from django.conf import settings
+from django.db.models import FloatField, Func
+from django.http import HttpResponse
+from rest_framework.renderers import JSONRenderer
+
+from .serializers import SpotListSerializer
+
+FOREIGN_KEYS = {"settlement", "region", "corridor"}
+
+_PLACEHOLDER = "\x00results\x00"
+_PLACEHOLDER_JSON = json.dumps(_PLACEHOLDER).encode()
+
+
+def enabled(request):
+    return (
+        getattr(settings, "SPOTS_FAST_SERIALIZER", True)
+        and getattr(request.accepted_renderer, "format", None) == "json"
+    )
+
+
+def _column(field):
+    if field == "location":
+        return None
+    return f"{field}_id" if field in FOREIGN_KEYS else field
+
+
+def _str(value):
+    return "null" if value is None else json.dumps(value, ensure_ascii=False)
+
+
+def _int(value):
+    return "null" if value is None else str(int(value))
+
+
+def _decimal(value):
+    # DecimalField(decimal_places=2) de DRF: string con formato fijo.
+    return "null" if value is None else f'"{value:f}"'
+
+
+def _coord(value):
+    # GeometryField pasa por OGR, que escribe las coordenadas con 15 cifras
+    # significativas; json.loads y json.dumps las devuelven como repr(float).
+    return repr(float("%.15g" % value))
+
+
+def _location(row):
+    return f'{{"type":"Point","coordinates":[{_coord(row["x"])},{_coord(row["y"])}]}}'
+
+
+def _formatter(field):
+    model_field = SpotListSerializer.Meta.model._meta.get_field(field)
+    if field in FOREIGN_KEYS:
+        return _int
+    internal = model_field.get_internal_type()
+    if internal == "DecimalField":
+        return _decimal
+    if internal in ("CharField", "TextField"):
+        return _str
+    return _int
+
+
+class RowEncoder:
+    """Encoder de filas de values() para los campos de un serializer, en su orden."""
+
+    def __init__(self, fields=SpotListSerializer.Meta.fields):
+        self.fields = tuple(fields)
+        self.columns = tuple(c for c in map(_column, self.fields) if c)
+        steps = []
+        for i, field in enumerate(self.fields):
+            prefix = ("{" if i == 0 else ",") + json.dumps(field) + ":"
+            if field == "location":
+                steps.append((prefix, None, _location))
+            else:
+                steps.append((prefix, _column(field), _formatter(field)))
+        self._steps = tuple(steps)
+
+    def __call__(self, row):
+        parts = []
+        for prefix, column, fmt in self._steps:
+            parts.append(prefix)
+            parts.append(fmt(row) if column is None else fmt(row[column]))
+        parts.append("}")
+        return "".join(parts)
+
+    def encode_rows(self, rows):
+        body = "[" + ",".join(map(self, rows)) + "]"
+        return body.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+encoder = RowEncoder()
+
+
+def rows(queryset, *extra):
+    """values() con las columnas del encoder, las coordenadas y los campos extra (p.ej. de orden)."""
+    annotations = queryset.query.annotations
+    extra = tuple(f for f in ("id",) + extra if f not in encoder.columns)
+    extra += tuple(f for f in ("distance",) if f in annotations and f not in extra)
+    return queryset.annotate(
+        x=Func("location", function="ST_X", output_field=FloatField()),
+        y=Func("location", function="ST_Y", output_field=FloatField()),
+    ).values(*encoder.columns, *extra, "x", "y")
+
+
+def json_response(body):
+    return HttpResponse(body, content_type="application/json")
+
+
+def list_response(page):
+    return json_response(encoder.encode_rows(page))
+
+
+def paginated_response(view, page):
+    """
+    Envuelve la página ya codificada con el mismo cuerpo que arma el
+    paginador de la vista (count/next/previous o next para keyset).
+    """
+    envelope = view.get_paginated_response(_PLACEHOLDER).data
+    rendered = JSONRenderer().render(envelope)
+    return json_response(rendered.replace(_PLACEHOLDER_JSON, encoder.encode_rows(page), 1))
+
+
+def grouped_response(groups):
+    """Lista de objetos {..., "results": [...]} a partir de pares (campos, filas del grupo)."""
+    renderer = JSONRenderer()
+    parts = [
+        renderer.render({**meta, "results": _PLACEHOLDER}).replace(_PLACEHOLDER_JSON, encoder.encode_rows(rows), 1)
+        for meta, rows in groups
+    ]
+    return json_response(b"[" + b",".join(parts) + b"]")
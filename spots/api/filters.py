@@ -1,23 +1,127 @@
-from django.db.models import QuerySet
+from datetime import datetime, time, timedelta
+from decimal import Decimal, InvalidOperation
+
+from django.contrib.gis.db.models import PointField
+from django.contrib.gis.db.models.functions import Distance
+from django.contrib.gis.geos import Point
+from django.contrib.gis.measure import D
+from django.db.models import QuerySet, Value
+from django.db.models.functions import Cast, Lower
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+from spots.models import Corridor, Municipality, Region, Spot, State
+
+# Filtros por nombre -> tabla de entidades; en Spot se filtra por <param>_id.
+NAME_FILTERS = {"municipality": Municipality, "state": State, "region": Region, "corridor": Corridor}
+
+# Campos con filtro de rango: ?<campo>_min=...&<campo>_max=... (extremos inclusivos).
+RANGE_FIELDS = (
+    "area_sqm", "price_total_rent_mxn", "price_sqm_rent_mxn",
+    "price_total_sale_mxn", "price_sqm_sale_mxn", "created_date",
+)
+RANGE_PARAMS = tuple(f"{field}_{end}" for field in RANGE_FIELDS for end in ("min", "max"))
+
+FILTER_PARAMS = ("sector", "type", "modality", *NAME_FILTERS, *RANGE_PARAMS)
 
-def apply_spot_filters(qs: QuerySet, params) -> QuerySet:
-    sector = params.get("sector")
-    type_ = params.get("type")
-    municipality = params.get("municipality")
 
-    if sector:
+def filter_values(params, name):
+    """Valores de un filtro repetido (?municipality=A&municipality=B) o separado por comas."""
+    raw = params.getlist(name) if hasattr(params, "getlist") else [params.get(name)]
+    return [v.strip() for value in raw if value for v in value.split(",") if v.strip()]
+
+
+def int_values(params, name):
+    """Valores enteros de un filtro; los que no son números se ignoran."""
+    values = []
+    for value in filter_values(params, name):
         try:
-            qs = qs.filter(sector_id=int(sector))
+            values.append(int(value))
         except ValueError:
             pass
+    return values
+
 
-    if type_:
+def range_bound(field, value, upper):
+    """
+    (lookup, valor) de un extremo del rango. created_date acepta fecha o
+    fecha y hora; con una fecha sola, _max incluye todo ese día.
+    """
+    if field != "created_date":
         try:
-            qs = qs.filter(type_id=int(type_))
-        except ValueError:
-            pass
+            number = Decimal(value)
+        except InvalidOperation:
+            raise ValueError(value)
+        if not number.is_finite():
+            raise ValueError(value)
+        return ("lte" if upper else "gte"), number
+
+    moment = parse_datetime(value)
+    if moment is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        if upper:
+            return "lt", make_aware(datetime.combine(day + timedelta(days=1), time.min))
+        return "gte", make_aware(datetime.combine(day, time.min))
+    return ("lte" if upper else "gte"), make_aware(moment) if is_naive(moment) else moment
 
-    if municipality:
-        qs = qs.filter(settlement__municipality__name__iexact=municipality.strip())
+
+def lookup_ids(model, names):
+    """
+    Subconsulta de ids cuyo nombre coincide sin distinguir mayúsculas. Los dos
+    lados pasan por lower() de Postgres (mismo criterio que el índice sobre
+    lower(name), también con acentos) y el filtro sigue siendo una sola consulta.
+    """
+    return (
+        model.objects.alias(name_lower=Lower("name"))
+        .filter(name_lower__in=[Lower(Value(name)) for name in names])
+        .values("id")
+    )
+
+
+def apply_spot_filters(qs: QuerySet, params) -> QuerySet:
+    sectors = int_values(params, "sector")
+    types = int_values(params, "type")
+    modalities = [m for m in filter_values(params, "modality") if m in Spot.Modality.values]
+
+    if sectors:
+        qs = qs.filter(sector_id__in=sectors)
+
+    if types:
+        qs = qs.filter(type_id__in=types)
+
+    if modalities:
+        qs = qs.filter(modality__in=modalities)
+
+    for name, model in NAME_FILTERS.items():
+        names = filter_values(params, name)
+        if names:
+            qs = qs.filter(**{f"{name}_id__in": lookup_ids(model, names)})
+
+    for field in RANGE_FIELDS:
+        for end, upper in (("min", False), ("max", True)):
+            value = params.get(f"{field}_{end}")
+            if not value:
+                continue
+            try:
+                lookup, bound = range_bound(field, value.strip(), upper)
+            except ValueError:
+                continue
+            qs = qs.filter(**{f"{field}__{lookup}": bound})
 
     return qs
+
+
+def apply_nearby(qs: QuerySet, lat: float, lng: float, radius: float) -> QuerySet:
+    """
+    Radio en metros sobre geography: ST_DWithin sobre la misma expresión
+    que indexa spot_location_geog_idx, y distancia sólo para los candidatos.
+    """
+    p = Point(lng, lat, srid=4326)
+    return (
+        qs.alias(geog=Cast("location", PointField(geography=True, srid=4326)))
+        .filter(geog__dwithin=(p, D(m=radius)))
+        .annotate(distance=Distance("geog", p))
+        .order_by("distance", "id")
+    )
@@ -1,6 +1,52 @@
-from rest_framework.decorators import api_view
+from django.db import DatabaseError, connection
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
 
+from spots import metrics, slow_queries
+from spots.db import pool, prepared, replicas
+
 @api_view(["GET"])
 def health(request):
-    return Response({"status": "ok"})
\ No newline at end of file
+    return Response({"status": "ok"})
+
+
+@api_view(["GET"])
+def health_db(request):
+    """Conectividad con Postgres, pools, contadores de sentencias preparadas y estado de las réplicas."""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        status = "ok"
+    except DatabaseError:
+        status = "error"
+    return Response(
+        {
+            "status": status,
+            "conn_max_age": connection.settings_dict["CONN_MAX_AGE"],
+            "pools": pool.pool_stats(),
+            "prepared_statements": prepared.stats(),
+            "replicas": replicas.replica_stats(),
+        },
+        status=200 if status == "ok" else 503,
+    )
+
+
+def prometheus_metrics(request):
+    """Métricas del proceso en el formato de texto de Prometheus."""
+    return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@api_view(["GET", "DELETE"])
+@permission_classes([IsAdminUser])
+def slow_query_log(request):
+    """Buffer de consultas lentas con sus planes (ver spots/slow_queries.py); DELETE lo vacía."""
+    if request.method == "DELETE":
+        slow_queries.clear()
+        return Response(status=204)
+    try:
+        limit = int(request.query_params.get("limit", 50))
+    except ValueError:
+        limit = 50
+    return Response(slow_queries.entries(limit=max(limit, 1), action=request.query_params.get("action")))
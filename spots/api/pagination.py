@@ -1,6 +1,127 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination, _positive_int
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 class DefaultPagination(PageNumberPagination):
     page_size = 50
     page_size_query_param = "page_size"
     max_page_size = 200
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor opaco sobre una clave de orden única
+    (`spot_id` en el listado, `(distance, id)` en nearby). Cada página es un
+    `WHERE clave > cursor ORDER BY clave LIMIT n`, sin OFFSET; el costo no
+    depende de la profundidad. El COUNT(*) es opcional (`?count=true`).
+    """
+
+    page_size = DefaultPagination.page_size
+    page_size_query_param = DefaultPagination.page_size_query_param
+    max_page_size = DefaultPagination.max_page_size
+    mode_query_param = "pagination"
+    cursor_query_param = "cursor"
+    count_query_param = "count"
+    invalid_cursor_message = "Cursor inválido."
+
+    def __init__(self, ordering=("spot_id",)):
+        self.ordering = tuple(ordering)
+
+    @classmethod
+    def is_requested(cls, request):
+        params = getattr(request, "query_params", {})
+        return params.get(cls.mode_query_param) == "keyset" or cls.cursor_query_param in params
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        self.count = None
+        if request.query_params.get(self.count_query_param, "").lower() in ("1", "true"):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            return _positive_int(
+                request.query_params[self.page_size_query_param],
+                strict=True,
+                cutoff=self.max_page_size,
+            )
+        except (KeyError, ValueError):
+            return self.page_size
+
+    def after(self, position):
+        # (a, b) > (x, y)  <=>  a > x OR (a = x AND b > y)
+        condition = None
+        for field, value in reversed(list(zip(self.ordering, position))):
+            greater = Q(**{f"{field}__gt": value})
+            condition = greater if condition is None else greater | (Q(**{field: value}) & condition)
+        return condition
+
+    def position(self, row):
+        values = []
+        for field in self.ordering:
+            value = row[field] if isinstance(row, dict) else getattr(row, field)
+            values.append(getattr(value, "m", value))
+        return values
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+        except (TypeError, ValueError, UnicodeError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(position, list)
+            or len(position) != len(self.ordering)
+            or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in position)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def encode_cursor(self, position):
+        raw = json.dumps(position, separators=(",", ":")).encode("ascii")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.mode_query_param, "keyset")
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.position(self.page[-1])))
+
+    def get_paginated_response(self, data):
+        body = {}
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["results"] = data
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "count": {"type": "integer", "example": 123},
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
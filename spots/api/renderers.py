@@ -0,0 +1,40 @@
+from rest_framework.renderers import BaseRenderer
+
+
+class StreamRenderer(BaseRenderer):
+    """Sólo para negociar el media type; la vista devuelve la respuesta ya armada."""
+
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class GeoJSONRenderer(StreamRenderer):
+    media_type = "application/geo+json"
+    format = "geojson"
+
+
+class NDJSONRenderer(StreamRenderer):
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+
+
+class CSVRenderer(StreamRenderer):
+    media_type = "text/csv"
+    format = "csv"
+
+
+class ParquetRenderer(StreamRenderer):
+    media_type = "application/vnd.apache.parquet"
+    format = "parquet"
+
+
+class ArrowRenderer(StreamRenderer):
+    media_type = "application/vnd.apache.arrow.file"
+    format = "arrow"
+
+
+class MVTRenderer(StreamRenderer):
+    media_type = "application/vnd.mapbox-vector-tile"
+    format = "mvt"
@@ -1,6 +1,6 @@
 from rest_framework_gis.serializers import GeoModelSerializer
 from rest_framework import serializers
-from django.contrib.gis.geos import Polygon
+from django.contrib.gis.geos import MultiPolygon, Polygon
 from spots.models import Spot
 
 
@@ -33,20 +33,83 @@ class NearbyParamsSerializer(serializers.Serializer):
     lng = serializers.FloatField(required=True)
     radius = serializers.FloatField(required=False, default=1000, min_value=0)
 
+class ClustersParamsSerializer(serializers.Serializer):
+    bbox = serializers.CharField()
+    zoom = serializers.IntegerField(required=False, min_value=0, max_value=22)
+    cell = serializers.FloatField(required=False, min_value=0.0001, max_value=90)
+
+    def validate_bbox(self, value):
+        try:
+            min_lng, min_lat, max_lng, max_lat = (float(v) for v in value.split(","))
+        except ValueError:
+            raise serializers.ValidationError("Formato: min_lng,min_lat,max_lng,max_lat")
+        if not (-180 <= min_lng < max_lng <= 180 and -90 <= min_lat < max_lat <= 90):
+            raise serializers.ValidationError("bbox fuera de rango o con mínimos >= máximos.")
+        return min_lng, min_lat, max_lng, max_lat
+
+    def validate(self, attrs):
+        if ("zoom" in attrs) == ("cell" in attrs):
+            raise serializers.ValidationError("Indicar zoom o cell (uno de los dos).")
+        return attrs
+
+
+def _ring(coords):
+    try:
+        ring = [(float(x), float(y)) for x, y in coords]
+    except Exception:
+        raise serializers.ValidationError("Coordenadas inválidas. Formato [[lng,lat],...]")
+    if ring and ring[0] != ring[-1]:
+        ring.append(ring[0])
+    if len(ring) < 4:
+        raise serializers.ValidationError("Cada anillo necesita al menos 3 vértices distintos.")
+    return ring
+
+
+def _polygon(rings):
+    if not rings or not isinstance(rings, list) or not rings[0]:
+        raise serializers.ValidationError("polygon.coordinates inválidos")
+    return Polygon(*[_ring(r) for r in rings])
+
+
+def geojson_polygon(value):
+    """
+    Polygon o MultiPolygon GeoJSON -> geometría GEOS (SRID=4326). El primer
+    anillo de cada polígono es el exterior y los siguientes son huecos; los
+    anillos se cierran si hace falta.
+    """
+    if not isinstance(value, dict) or value.get("type") not in ("Polygon", "MultiPolygon"):
+        raise serializers.ValidationError("polygon.type debe ser 'Polygon' o 'MultiPolygon'")
+    coords = value.get("coordinates")
+    if not coords or not isinstance(coords, list):
+        raise serializers.ValidationError("polygon.coordinates inválidos")
+    if value["type"] == "Polygon":
+        geom = _polygon(coords)
+    else:
+        geom = MultiPolygon(*[_polygon(p) for p in coords])
+    geom.srid = 4326
+    return geom
+
+
 class WithinPolygonSerializer(serializers.Serializer):
     polygon = serializers.DictField()
 
     def validate_polygon(self, value):
-        if not isinstance(value, dict) or value.get("type") != "Polygon":
-            raise serializers.ValidationError("polygon.type debe ser 'Polygon'")
-        coords = value.get("coordinates")
-        if not coords or not isinstance(coords, list) or not coords[0]:
-            raise serializers.ValidationError("polygon.coordinates inválidos")
-        try:
-            ring = [(float(x), float(y)) for x, y in coords[0]]
-        except Exception:
-            raise serializers.ValidationError("Coordenadas inválidas. Formato [[lng,lat],...]")
-        if ring[0] != ring[-1]:
-            ring.append(ring[0])
-        poly = Polygon(ring, srid=4326)
-        return poly
+        return geojson_polygon(value)
+
+
+class WithinBatchSerializer(serializers.Serializer):
+    MAX_POLYGONS = 100
+
+    polygons = serializers.ListField(
+        child=serializers.DictField(), min_length=1, max_length=MAX_POLYGONS
+    )
+    mode = serializers.ChoiceField(choices=["count", "ids"], default="count")
+
+    def validate_polygons(self, value):
+        polygons = []
+        for i, item in enumerate(value):
+            try:
+                polygons.append(geojson_polygon(item))
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError({i: exc.detail})
+        return polygons
@@ -0,0 +1,55 @@
+"""
+Mapbox Vector Tiles de los spots, armadas por PostGIS con ST_AsMVTGeom /
+ST_AsMVT en una consulta por tile que filtra la envolvente con && sobre el
+índice GiST de location.
+"""
+from django.conf import settings
+from django.db import connections
+
+from .exports import RawGeometry
+from .filters import filter_values
+
+LAYER = "spots"
+EXTENT = 4096
+BUFFER = 64
+MAX_ZOOM = 22
+
+# Atributos que pueden viajar en cada feature (?fields=...); los decimales van como double.
+TILE_FIELDS = (
+    "spot_id", "title", "sector_id", "type_id", "modality", "area_sqm",
+    "price_total_rent_mxn", "price_sqm_rent_mxn", "price_total_sale_mxn", "price_sqm_sale_mxn",
+)
+DECIMAL_FIELDS = {
+    "area_sqm", "price_total_rent_mxn", "price_sqm_rent_mxn", "price_total_sale_mxn", "price_sqm_sale_mxn",
+}
+
+
+def tile_fields(params):
+    """Los de ?fields=... o SPOTS_TILE_FIELDS, en ese orden y sin los desconocidos."""
+    requested = filter_values(params, "fields") or getattr(settings, "SPOTS_TILE_FIELDS", TILE_FIELDS)
+    return [f for f in dict.fromkeys(requested) if f in TILE_FIELDS]
+
+
+def valid_tile(z, x, y):
+    return z <= MAX_ZOOM and x < 2 ** z and y < 2 ** z
+
+
+def render_tile(queryset, z, x, y, fields):
+    """Bytes del tile z/x/y (vacío si no hay spots) con una capa "spots"."""
+    inner = queryset.order_by().annotate(geom=RawGeometry("location")).values(*fields, "geom")
+    sql, params = inner.query.sql_with_params()
+    columns = "".join(
+        f", t.{f}::float8 AS {f}" if f in DECIMAL_FIELDS else f", t.{f}" for f in fields
+    )
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(f"""
+            SELECT ST_AsMVT(m.*, '{LAYER}', {EXTENT}, 'geom') FROM (
+                SELECT ST_AsMVTGeom(
+                    ST_Transform(t.geom, 3857), ST_TileEnvelope(%s, %s, %s), {EXTENT}, {BUFFER}
+                ) AS geom{columns}
+                FROM ({sql}) t
+                WHERE t.geom && ST_Transform(ST_TileEnvelope(%s, %s, %s, margin => %s), 4326)
+            ) m
+        """, [z, x, y, *params, z, x, y, BUFFER / EXTENT])
+        tile = cursor.fetchone()[0]
+    return bytes(tile) if tile else b""
@@ -1,12 +1,34 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 from .views import SpotViewSet
-from .health import health
+from . import async_views
+from .health import health, health_db, slow_query_log
+from .renderers import MVTRenderer
 
 router = DefaultRouter()
 router.register(r"spots", SpotViewSet, basename="spot")
 
+TILE_PATH = r"^spots/tiles/(?P<z>\d+)/(?P<x>\d+)/(?P<y>\d+)\.mvt$"
+
+# Mismas acciones de lectura, como vistas async (ver async_views.py).
+async_urlpatterns = [
+    path("spots/", async_views.spot_list, name="async-spot-list"),
+    re_path(r"^spots/(?P<spot_id>\d+)/$", async_views.spot_detail, name="async-spot-detail"),
+    path("spots/nearby/", async_views.nearby, name="async-spot-nearby"),
+    path("spots/within/", async_views.within, name="async-spot-within"),
+    path("spots/within-batch/", async_views.within_batch, name="async-spot-within-batch"),
+    path("spots/average-price-by-sector/", async_views.average_price_by_sector, name="async-spot-average-price"),
+    path("spots/top-rent/", async_views.top_rent, name="async-spot-top-rent"),
+    path("spots/price-statistics/", async_views.price_statistics, name="async-spot-price-statistics"),
+    path("spots/clusters/", async_views.clusters, name="async-spot-clusters"),
+    re_path(TILE_PATH, async_views.tile, name="async-spot-tiles"),
+]
+
 urlpatterns = [
     path("health/", health),
+    path("health/db/", health_db),
+    path("admin/slow-queries/", slow_query_log, name="slow-queries"),
+    re_path(TILE_PATH, SpotViewSet.as_view({"get": "tile"}, renderer_classes=[MVTRenderer]), name="spot-tiles"),
+    path("async/", include(async_urlpatterns)),
     path("", include(router.urls)),
 ]
@@ -1,36 +1,133 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer
 from rest_framework.response import Response
-from django.db.models import Avg
-from django.contrib.gis.geos import Point
-from django.contrib.gis.db.models.functions import Distance
-from django.contrib.gis.measure import D
+from functools import reduce
+from itertools import groupby
+from operator import itemgetter, or_
 
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db.models import Avg, Count, F, Q, Window
+from django.db.models.functions import RowNumber
+from django.http import FileResponse, HttpResponse, HttpResponseNotFound
+
+from spots import clusters, memindex, rollups, slow_queries, snapshot, stats
+from spots.cache import cache_response
+from spots.db import replicas
+from spots.db.prepared import prepared
 from spots.models import Spot
+from . import exports, fast, tiles
 from .serializers import (
     SpotListSerializer, SpotDetailSerializer,
-    NearbyParamsSerializer, SpotSerializer, WithinPolygonSerializer
+    ClustersParamsSerializer, NearbyParamsSerializer, SpotSerializer, WithinPolygonSerializer, WithinBatchSerializer
 )
-from .filters import apply_spot_filters
+from .filters import RANGE_FIELDS, apply_nearby, apply_spot_filters
+from .pagination import KeysetPagination
+from .renderers import ArrowRenderer, CSVRenderer, GeoJSONRenderer, MVTRenderer, NDJSONRenderer, ParquetRenderer
 from drf_spectacular.utils import (
     extend_schema, OpenApiParameter, OpenApiExample, OpenApiTypes, OpenApiResponse
 )
 
+# Filtros del listado, compartidos por los endpoints que los respetan.
+FILTER_PARAMETERS = [
+    OpenApiParameter(name="sector", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False,
+                     description="Sector id(s), repetido o separado por comas"),
+    OpenApiParameter(name="type", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False,
+                     description="Type id(s), repetido o separado por comas"),
+    OpenApiParameter(name="modality", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                     description="rent, sale o rent_sale; repetido o separado por comas"),
+    OpenApiParameter(name="municipality", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                     description="Nombre(s) de municipio, repetido o separado por comas"),
+    OpenApiParameter(name="state", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+    OpenApiParameter(name="region", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+    OpenApiParameter(name="corridor", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+] + [
+    OpenApiParameter(
+        name=f"{field}_{end}", location=OpenApiParameter.QUERY, required=False,
+        type=OpenApiTypes.DATETIME if field == "created_date" else OpenApiTypes.DECIMAL,
+        description=f"{field} {'mínimo' if end == 'min' else 'máximo'} (inclusivo)",
+    )
+    for field in RANGE_FIELDS for end in ("min", "max")
+]
+
+# Agrupaciones de top-rent?group_by=... -> columna de Spot.
+TOP_RENT_GROUPS = {"sector": "sector_id", "municipality": "municipality_id", "region": "region_id"}
+
+
 class SpotViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = (
         Spot.objects
+        .filter(removed_at__isnull=True)
         .select_related("settlement__municipality__state", "region", "corridor")
         .order_by("spot_id")
     )
     serializer_class = SpotSerializer
     lookup_field = "spot_id"
     lookup_value_regex = r"\d+"
-    
+    keyset_ordering = {"nearby": ("distance", "id")}
+
+    def dispatch(self, request, *args, **kwargs):
+        # Las consultas lentas se guardan con la acción y los filtros que las produjeron.
+        action = self.action_map.get(request.method.lower())
+        filters = {key: values if len(values) > 1 else values[0] for key, values in request.GET.lists()}
+        # Todas las acciones son de lectura: el request entero lee de una réplica elegible.
+        with replicas.reading_from(replicas.alias_for(request)), slow_queries.tagged(
+            source="api", action=action, method=request.method, path=request.path, filters=filters,
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator") and KeysetPagination.is_requested(self.request):
+            self._paginator = KeysetPagination(ordering=self.keyset_ordering.get(self.action, ("spot_id",)))
+        return super().paginator
+
+    def use_memory_index(self):
+        return (
+            memindex.enabled()
+            and not KeysetPagination.is_requested(self.request)
+            and memindex.supports(self.request.query_params)
+        )
+
+    def memory_response(self, ids):
+        """Pagina la lista de ids del índice en memoria y lee de Postgres sólo esa página."""
+        ids = ids.tolist()
+        page = self.paginate_queryset(ids)
+        chosen = page if page is not None else ids
+        if fast.enabled(self.request):
+            rows = {row["id"]: row for row in fast.rows(self.queryset.filter(id__in=chosen))}
+            found = [rows[i] for i in chosen if i in rows]
+            return fast.paginated_response(self, found) if page is not None else fast.list_response(found)
+        rows = self.queryset.in_bulk(chosen)
+        ser = self.get_serializer([rows[i] for i in chosen if i in rows], many=True)
+        return self.get_paginated_response(ser.data) if page is not None else Response(ser.data)
+
+    def list_response(self, qs):
+        """Pagina y serializa `qs`; en modo rápido lee sólo las columnas del listado."""
+        if fast.enabled(self.request):
+            qs = fast.rows(qs)
+            page = self.paginate_queryset(qs)
+            return fast.paginated_response(self, page) if page is not None else fast.list_response(qs)
+        page = self.paginate_queryset(qs)
+        ser = self.get_serializer(page if page is not None else qs, many=True)
+        return self.get_paginated_response(ser.data) if page is not None else Response(ser.data)
+
+    @extend_schema(parameters=FILTER_PARAMETERS)
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.filter_queryset(self.get_queryset()))
+
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     def get_serializer_class(self):
         return SpotDetailSerializer if self.action == "retrieve" else SpotListSerializer
 
     def get_queryset(self):
-        qs = super().get_queryset()
+        # Fijado al alias del request: las exportaciones se leen después de dispatch().
+        qs = super().get_queryset().using(replicas.current())
         return apply_spot_filters(qs, self.request.query_params)
 
     @extend_schema(
@@ -40,9 +137,7 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
             OpenApiParameter(name="lng", type=OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=True),
             OpenApiParameter(name="radius", type=OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=False,
                              description="Radio en metros (default 1000)"),
-            OpenApiParameter(name="sector", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
-            OpenApiParameter(name="type", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
-            OpenApiParameter(name="municipality", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+            *FILTER_PARAMETERS,
         ],
         responses={200: SpotSerializer(many=True)},
         examples=[
@@ -56,6 +151,8 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
         ],
     )
     @action(detail=False, methods=["get"], url_path="nearby")
+    @cache_response
+    @prepared
     def nearby(self, request):
         params = NearbyParamsSerializer(data=request.query_params)
         params.is_valid(raise_exception=True)
@@ -63,20 +160,14 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
         lng = params.validated_data["lng"]
         radius = params.validated_data["radius"]
 
-        p = Point(lng, lat, srid=4326)
-        qs = (
-            self.get_queryset()
-            .annotate(distance=Distance("location", p))
-            .filter(location__distance_lte=(p, D(m=radius)))
-            .order_by("distance", "id")
-        )
+        if self.use_memory_index():
+            ids, _ = memindex.get_index().nearby(lat, lng, radius, request.query_params)
+            return self.memory_response(ids)
 
-        page = self.paginate_queryset(qs)
-        ser = self.get_serializer(page if page is not None else qs, many=True)
-        return self.get_paginated_response(ser.data) if page is not None else Response(ser.data)
+        return self.list_response(apply_nearby(self.get_queryset(), lat, lng, radius))
 
     @extend_schema(
-        description="Spots dentro de un polígono GeoJSON (SRID=4326).",
+        description="Spots dentro de un Polygon o MultiPolygon GeoJSON, con huecos (SRID=4326).",
         request={
             "application/json": {
                 "type": "object",
@@ -98,34 +189,95 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
         responses={200: SpotSerializer(many=True)},
     )
     @action(detail=False, methods=["post"], url_path="within")
+    @cache_response
     def within(self, request):
         s = WithinPolygonSerializer(data=request.data)
         s.is_valid(raise_exception=True)
         polygon = s.validated_data["polygon"]
 
-        qs = self.get_queryset().filter(location__within=polygon)
-        page = self.paginate_queryset(qs)
-        ser = self.get_serializer(page if page is not None else qs, many=True)
-        return self.get_paginated_response(ser.data) if page is not None else Response(ser.data)
+        if self.use_memory_index():
+            ids = memindex.get_index().within(memindex.polygon_rings(polygon), request.query_params)
+            return self.memory_response(ids)
+
+        return self.list_response(self.get_queryset().filter(location__within=polygon))
+
+    @extend_schema(
+        description=(
+            "Conteo (o spot_ids) por polígono para un lote de Polygon/MultiPolygon GeoJSON (SRID=4326), "
+            "en una sola consulta. Respeta filtros de la lista."
+        ),
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {
+                    "polygons": {
+                        "type": "array",
+                        "maxItems": WithinBatchSerializer.MAX_POLYGONS,
+                        "items": {"type": "object"},
+                    },
+                    "mode": {"type": "string", "enum": ["count", "ids"], "default": "count"},
+                },
+                "required": ["polygons"],
+            }
+        },
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="within-batch")
+    @cache_response
+    def within_batch(self, request):
+        s = WithinBatchSerializer(data=request.data)
+        s.is_valid(raise_exception=True)
+        polygons = s.validated_data["polygons"]
+        with_ids = s.validated_data["mode"] == "ids"
+
+        if self.use_memory_index():
+            per_polygon = memindex.get_index().within_batch(polygons, request.query_params)
+            counts = [len(ids) for ids in per_polygon]
+            ids = [ids.tolist() for ids in per_polygon]
+        else:
+            conditions = [Q(location__within=polygon) for polygon in polygons]
+            aggregates = {}
+            for i, condition in enumerate(conditions):
+                aggregates[f"count_{i}"] = Count("id", filter=condition)
+                if with_ids:
+                    aggregates[f"ids_{i}"] = ArrayAgg("spot_id", filter=condition, ordering="spot_id", default=[])
+            row = self.get_queryset().filter(reduce(or_, conditions)).aggregate(**aggregates)
+            counts = [row[f"count_{i}"] for i in range(len(polygons))]
+            ids = [row.get(f"ids_{i}") for i in range(len(polygons))]
+
+        results = []
+        for i, count in enumerate(counts):
+            item = {"index": i, "count": count}
+            if with_ids:
+                item["spot_ids"] = ids[i]
+            results.append(item)
+        return Response({"results": results})
 
     @extend_schema(
-        description="Promedio de `price_total_rent_mxn` por sector. Respeta filtros de la lista.",
+        description=(
+            "Promedio de `price_total_rent_mxn` por sector. Respeta filtros de la lista. "
+            "Se responde desde el rollup precalculado por load_data cuando los filtros lo permiten."
+        ),
         responses={
             200: OpenApiTypes.OBJECT,
         },
     )
     @action(detail=False, methods=["get"], url_path="average-price-by-sector")
+    @cache_response
+    @prepared
     def average_price_by_sector(self, request):
-        qs = (
-            self.get_queryset()
-            .exclude(price_total_rent_mxn__isnull=True)
-        )
+        data = rollups.average_price_by_sector(request.query_params)
+        if data is None:
+            qs = (
+                self.get_queryset()
+                .exclude(price_total_rent_mxn__isnull=True)
+            )
 
-        data = (
-            qs.values("sector_id")
-              .annotate(average_price_total_rent_mxn=Avg("price_total_rent_mxn"))
-              .order_by("sector_id")
-        )
+            data = (
+                qs.values("sector_id")
+                  .annotate(average_price_total_rent_mxn=Avg("price_total_rent_mxn"))
+                  .order_by("sector_id")
+            )
         sector_labels = dict(Spot.Sector.choices)
         results = [
             {
@@ -138,17 +290,105 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
         return Response(results)
     
     @extend_schema(
-        description="Ranking por `price_total_rent_mxn` descendente. Respeta filtros de la lista.",
+        description=(
+            "Vector tile (Mapbox Vector Tile) z/x/y con una capa `spots` de puntos, armado por PostGIS con "
+            "ST_AsMVT. Respeta filtros de la lista; `fields` elige los atributos de cada feature. Se cachea "
+            "por versión del dataset. Ruta: `/api/spots/tiles/{z}/{x}/{y}.mvt`."
+        ),
+        parameters=[
+            OpenApiParameter(name="fields", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                             description=f"Atributos separados por comas, de: {', '.join(tiles.TILE_FIELDS)}"),
+            *FILTER_PARAMETERS,
+        ],
+        responses={(200, MVTRenderer.media_type): OpenApiTypes.BINARY},
+    )
+    @cache_response
+    def tile(self, request, z, x, y):
+        z, x, y = int(z), int(x), int(y)
+        if not tiles.valid_tile(z, x, y):
+            return HttpResponseNotFound("Tile fuera de rango para el zoom.")
+        tile = tiles.render_tile(self.get_queryset(), z, x, y, tiles.tile_fields(request.query_params))
+        return HttpResponse(tile, content_type=MVTRenderer.media_type)
+
+    @extend_schema(
+        description=(
+            "Clusters para mapas: conteo, centroide y precio de renta promedio por celda de una grilla regular "
+            "de grados, para las celdas que tocan la bbox. Con `zoom` la celda mide 360 / 2^(zoom + 2) grados; "
+            "`cell` fija el tamaño a mano. Respeta filtros de la lista."
+        ),
+        parameters=[
+            OpenApiParameter(name="bbox", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=True,
+                             description="min_lng,min_lat,max_lng,max_lat"),
+            OpenApiParameter(name="zoom", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
+            OpenApiParameter(name="cell", type=OpenApiTypes.FLOAT, location=OpenApiParameter.QUERY, required=False,
+                             description="Tamaño de celda en grados (en lugar de zoom)"),
+            *FILTER_PARAMETERS,
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="clusters")
+    @cache_response
+    def clusters(self, request):
+        params = ClustersParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        bbox = params.validated_data["bbox"]
+        zoom = params.validated_data.get("zoom")
+        cell = clusters.cell_size(zoom) if zoom is not None else params.validated_data["cell"]
+
+        cells = clusters.grid_cells(request.query_params, bbox, zoom) if zoom is not None else None
+        if cells is None:
+            cells = clusters.live_cells(self.get_queryset(), bbox, cell)
+        return Response({"zoom": zoom, "cell": cell, "cells": cells})
+
+    @extend_schema(
+        description=(
+            "Distribución de `price_total_rent_mxn`, `price_sqm_rent_mxn` y `area_sqm`: conteo, mínimo, máximo, "
+            "media, percentiles 25/50/75/90 e histograma de `buckets` intervalos iguales entre mínimo y máximo, "
+            "en total o por grupo. Respeta filtros de la lista."
+        ),
+        parameters=[
+            OpenApiParameter(name="group_by", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                             enum=list(stats.GROUPS)),
+            OpenApiParameter(name="buckets", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False,
+                             description=f"Intervalos del histograma (1..{stats.MAX_BUCKETS}). Default: {stats.DEFAULT_BUCKETS}"),
+            *FILTER_PARAMETERS,
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="price-statistics")
+    @cache_response
+    def price_statistics(self, request):
+        group_by = request.query_params.get("group_by") or None
+        if group_by is not None and group_by not in stats.GROUPS:
+            raise ValidationError({"group_by": [f"Debe ser uno de: {', '.join(stats.GROUPS)}."]})
+        try:
+            buckets = int(request.query_params.get("buckets", stats.DEFAULT_BUCKETS))
+        except (TypeError, ValueError):
+            buckets = stats.DEFAULT_BUCKETS
+        buckets = max(1, min(buckets, stats.MAX_BUCKETS))
+
+        data = stats.precomputed(request.query_params, group_by, buckets)
+        if data is None:
+            data = stats.compute(self.get_queryset(), group_by, buckets)
+        return Response(data)
+
+    @extend_schema(
+        description=(
+            "Ranking por `price_total_rent_mxn` descendente. Respeta filtros de la lista. Con `group_by` devuelve "
+            "el top `limit` de cada sector, municipio o región: `[{group_by, key, label, results}]`."
+        ),
         parameters=[
             OpenApiParameter(name="limit", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False,
-                             description="Cantidad máxima (1..100). Default: 10"),
-            OpenApiParameter(name="sector", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
-            OpenApiParameter(name="type", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY, required=False),
-            OpenApiParameter(name="municipality", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False),
+                             description="Cantidad máxima (1..100), por grupo con group_by. Default: 10"),
+            OpenApiParameter(name="group_by", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=False,
+                             enum=list(TOP_RENT_GROUPS)),
+            *FILTER_PARAMETERS,
         ],
         responses={200: SpotSerializer(many=True)},
     )
     @action(detail=False, methods=["get"], url_path="top-rent")
+    @cache_response
+    @prepared
     def top_rent(self, request):
         limit = request.query_params.get("limit", "10")
         try:
@@ -161,7 +401,113 @@ class SpotViewSet(viewsets.ReadOnlyModelViewSet):
             self.get_queryset()
             .exclude(price_total_rent_mxn__isnull=True)
             .order_by("-price_total_rent_mxn", "spot_id")
-        )[:limit]
+        )
+        group_by = request.query_params.get("group_by")
+        if group_by:
+            if group_by not in TOP_RENT_GROUPS:
+                raise ValidationError({"group_by": [f"Debe ser uno de: {', '.join(TOP_RENT_GROUPS)}."]})
+            return self.top_rent_groups(request, qs, group_by, limit)
+
+        if fast.enabled(request):
+            return fast.list_response(fast.rows(qs)[:limit])
 
-        ser = self.get_serializer(qs, many=True)
+        ser = self.get_serializer(qs[:limit], many=True)
         return Response(ser.data)
+
+    def top_rent_groups(self, request, qs, group_by, limit):
+        """
+        Top `limit` de cada grupo en una sola consulta: row_number() particionado
+        por la columna del grupo, en el orden de los índices spot_*_rent_idx.
+        """
+        column = TOP_RENT_GROUPS[group_by]
+        ranked = (
+            qs.annotate(rank=Window(
+                RowNumber(), partition_by=[F(column)],
+                order_by=[F("price_total_rent_mxn").desc(), F("spot_id").asc()],
+            ))
+            .filter(rank__lte=limit)
+            .order_by(F(column).asc(nulls_last=True), "rank")
+        )
+        if fast.enabled(request):
+            rows = list(fast.rows(ranked, column))
+            key = itemgetter(column)
+        else:
+            rows = list(ranked)
+            key = lambda spot: getattr(spot, column)  # noqa: E731
+
+        groups = [(k, list(members)) for k, members in groupby(rows, key=key)]
+        labels = stats.group_labels(group_by, [k for k, _ in groups])
+        if fast.enabled(request):
+            return fast.grouped_response(
+                ({"group_by": group_by, "key": k, "label": labels.get(k)}, members) for k, members in groups
+            )
+        return Response([
+            {
+                "group_by": group_by, "key": k, "label": labels.get(k),
+                "results": self.get_serializer(members, many=True).data,
+            }
+            for k, members in groups
+        ])
+
+    @extend_schema(
+        description=(
+            "Exporta todos los spots que cumplen los filtros de la lista como FeatureCollection GeoJSON. "
+            "PostGIS arma cada Feature y la respuesta se transmite por partes."
+        ),
+        parameters=[
+            *FILTER_PARAMETERS,
+        ],
+        responses={(200, "application/geo+json"): OpenApiTypes.OBJECT},
+    )
+    @action(
+        detail=False, methods=["get"], url_path="export/geojson",
+        renderer_classes=[GeoJSONRenderer, JSONRenderer],
+    )
+    def export_geojson(self, request):
+        return exports.geojson_response(self.get_queryset())
+
+    @extend_schema(
+        description=(
+            "Exporta todos los spots que cumplen los filtros de la lista como NDJSON (un objeto por línea) "
+            "o CSV, con las entidades por nombre. Se lee con un cursor del lado del servidor y se transmite por partes."
+        ),
+        parameters=[
+            OpenApiParameter(name="output", type=OpenApiTypes.STR, location=OpenApiParameter.PATH,
+                             enum=["ndjson", "csv"]),
+            *FILTER_PARAMETERS,
+        ],
+        responses={(200, "application/x-ndjson"): OpenApiTypes.STR, (200, "text/csv"): OpenApiTypes.STR},
+    )
+    @action(
+        detail=False, methods=["get"], url_path=r"export/(?P<output>ndjson|csv)",
+        renderer_classes=[NDJSONRenderer, CSVRenderer, JSONRenderer],
+    )
+    def export(self, request, output):
+        return exports.stream_response(output, self.get_queryset())
+
+    @extend_schema(
+        description=(
+            "Snapshot columnar de todos los spots activos (Parquet o Arrow IPC), con los nombres de entidades "
+            "como columnas de diccionario y lat/lng como float. Se genera una vez por versión del dataset; "
+            "no aplica filtros."
+        ),
+        parameters=[
+            OpenApiParameter(name="fmt", type=OpenApiTypes.STR, location=OpenApiParameter.PATH,
+                             enum=list(snapshot.FORMATS)),
+        ],
+        responses={(200, "application/vnd.apache.parquet"): OpenApiTypes.BINARY,
+                   (200, "application/vnd.apache.arrow.file"): OpenApiTypes.BINARY,
+                   503: OpenApiResponse(description="Todavía no se corrió load_data")},
+    )
+    @action(
+        detail=False, methods=["get"], url_path=r"export/(?P<fmt>parquet|arrow)",
+        renderer_classes=[ParquetRenderer, ArrowRenderer, JSONRenderer],
+    )
+    def export_snapshot(self, request, fmt):
+        path = snapshot.current_snapshot(fmt)
+        if path is None:
+            return HttpResponse("Todavía no hay una versión del dataset: corré load_data.", status=503)
+        content_type = ParquetRenderer.media_type if fmt == "parquet" else ArrowRenderer.media_type
+        return FileResponse(
+            path.open("rb"), as_attachment=True, filename=f"spots{snapshot.FORMATS[fmt]}", content_type=content_type
+        )
@@ -0,0 +1,118 @@
+import functools
+import hashlib
+import json
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import router
+from django.db.models import F
+from django.dispatch import receiver
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import parse_etags
+
+from spots.models import DatasetVersion
+from spots.signals import spots_loaded
+
+KEY_PREFIX = "spots:resp"
+
+_memo = {}
+
+
+def bump_dataset_version():
+    """Nueva versión del dataset; invalida de una vez todas las respuestas cacheadas."""
+    token = uuid.uuid4().hex[:12]
+    updated = DatasetVersion.objects.filter(pk=1).update(
+        version=F("version") + 1, token=token, loaded_at=timezone.now()
+    )
+    if not updated:
+        DatasetVersion.objects.create(pk=1, version=1, token=token, loaded_at=timezone.now())
+    _memo.clear()
+    return DatasetVersion.objects.get(pk=1)
+
+
+def dataset_version():
+    """
+    "<versión>-<token>" del dataset, o None si nunca se corrió load_data.
+    Se lee de la base del request (primario o réplica) y se memoiza por base
+    en el proceso durante SPOTS_DATASET_VERSION_TTL segundos.
+    """
+    ttl = getattr(settings, "SPOTS_DATASET_VERSION_TTL", 5)
+    alias = router.db_for_read(DatasetVersion)
+    now = time.monotonic()
+    memo = _memo.get(alias)
+    if memo is not None and now - memo[1] < ttl:
+        return memo[0]
+    row = DatasetVersion.objects.using(alias).filter(pk=1).values_list("version", "token").first()
+    version = f"{row[0]}-{row[1]}" if row else None
+    _memo[alias] = (version, now)
+    return version
+
+
+@receiver(spots_loaded)
+def forget_dataset_version(**kwargs):
+    _memo.clear()
+
+
+def request_key(view, request, kwargs):
+    """Ruta + acción + kwargs de la URL + query params ordenados + cuerpo JSON canónico."""
+    params = sorted((k, v) for k in request.query_params for v in request.query_params.getlist(k))
+    parts = {
+        # Con la ruta: los links de paginación de /api/spots/ y /api/async/spots/ son distintos.
+        "origin": request.build_absolute_uri(request.path),
+        "action": view.action,
+        "kwargs": sorted(kwargs.items()),
+        "params": params,
+        "format": getattr(request.accepted_renderer, "format", None),
+    }
+    if request.method == "POST":
+        parts["body"] = request.data
+    raw = json.dumps(parts, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def cache_response(method):
+    """
+    Cachea la respuesta renderizada de una acción de solo lectura bajo la
+    versión del dataset. En GET responde 304 si If-None-Match coincide con
+    el ETag, sin ejecutar la vista.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        version = dataset_version() if getattr(settings, "SPOTS_RESPONSE_CACHE", True) else None
+        if version is None:
+            return method(self, request, *args, **kwargs)
+
+        digest = request_key(self, request, kwargs)
+        etag = f'"{version}-{digest[:20]}"'
+        conditional = request.method in ("GET", "HEAD")
+        if conditional and etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+            response["ETag"] = etag
+            response["X-Cache"] = "HIT"
+            return response
+
+        backend = caches[getattr(settings, "SPOTS_CACHE_ALIAS", "default")]
+        key = f"{KEY_PREFIX}:{version}:{digest}"
+        cached = backend.get(key)
+        if cached is not None:
+            content, content_type = cached
+            response = HttpResponse(content, content_type=content_type)
+            response["X-Cache"] = "HIT"
+        else:
+            response = method(self, request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response = self.finalize_response(request, response, *args, **kwargs)
+            if hasattr(response, "render"):
+                response.render()
+            backend.set(key, (response.content, response["Content-Type"]))
+            response["X-Cache"] = "MISS"
+        if conditional:
+            response["ETag"] = etag
+        return response
+
+    return wrapper
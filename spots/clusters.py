@@ -0,0 +1,135 @@
+"""
+Agregación de spots en una grilla regular de grados para mapas: conteo,
+centroide y precio promedio por celda. La celda (cx, cy) de un punto es
+(floor(lng / cell), floor(lat / cell)); con un zoom el tamaño es
+360 / 2^(zoom + 2), cuatro celdas por tile de ancho.
+
+Hasta SPOTS_GRID_MAX_ZOOM las celdas se precalculan en SpotGridCell por
+(sector, tipo), así una vista alejada cuesta O(celdas) y no O(spots).
+"""
+import math
+
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db import connection
+from django.db.models import Count, F, FloatField, Func, IntegerField, Sum
+from django.db.models.functions import Cast, Floor
+
+from spots.api.filters import FILTER_PARAMS, int_values
+from spots.models import Spot, SpotGridCell
+
+GRID_FILTERS = {"sector", "type"}
+
+
+def cell_size(zoom):
+    return 360.0 / 2 ** (zoom + 2)
+
+
+def max_zoom():
+    return getattr(settings, "SPOTS_GRID_MAX_ZOOM", 10)
+
+
+def cell_range(bbox, cell):
+    """Celdas (cx0, cy0, cx1, cy1) que tocan la bbox (min_lng, min_lat, max_lng, max_lat)."""
+    min_lng, min_lat, max_lng, max_lat = bbox
+    return (
+        math.floor(min_lng / cell), math.floor(min_lat / cell),
+        math.floor(max_lng / cell), math.floor(max_lat / cell),
+    )
+
+
+def _cell(row):
+    count = row["count"]
+    return {
+        "cx": row["cx"],
+        "cy": row["cy"],
+        "count": count,
+        "lng": round(row["sum_x"] / count, 6),
+        "lat": round(row["sum_y"] / count, 6),
+        "avg_price_total_rent_mxn": (
+            round(float(row["price_sum"] / row["price_count"]), 2) if row["price_count"] else None
+        ),
+    }
+
+
+def live_cells(queryset, bbox, cell):
+    """
+    Celdas completas que tocan la bbox, agregadas sobre el queryset filtrado.
+    La bbox se extiende a los bordes de las celdas y se filtra con && sobre el
+    índice GiST de location.
+    """
+    cx0, cy0, cx1, cy1 = cell_range(bbox, cell)
+    envelope = Polygon.from_bbox((cx0 * cell, cy0 * cell, (cx1 + 1) * cell, (cy1 + 1) * cell))
+    envelope.srid = 4326
+    rows = (
+        queryset.order_by()
+        .filter(location__bboverlaps=envelope)
+        .annotate(
+            x=Func("location", function="ST_X", output_field=FloatField()),
+            y=Func("location", function="ST_Y", output_field=FloatField()),
+        )
+        .annotate(
+            cx=Cast(Floor(F("x") / cell), IntegerField()),
+            cy=Cast(Floor(F("y") / cell), IntegerField()),
+        )
+        .filter(cx__range=(cx0, cx1), cy__range=(cy0, cy1))
+        .values("cx", "cy")
+        .annotate(
+            count=Count("id"), sum_x=Sum("x"), sum_y=Sum("y"),
+            price_count=Count("price_total_rent_mxn"), price_sum=Sum("price_total_rent_mxn"),
+        )
+        .order_by("cy", "cx")
+    )
+    return [_cell(row) for row in rows]
+
+
+def covers(params, zoom):
+    active = {p for p in FILTER_PARAMS if params.get(p)}
+    return zoom is not None and zoom <= max_zoom() and active <= GRID_FILTERS
+
+
+def grid_cells(params, bbox, zoom):
+    """Las celdas desde SpotGridCell, o None si la grilla no cubre el pedido o no se calculó."""
+    if not covers(params, zoom) or not SpotGridCell.objects.filter(level=zoom).exists():
+        return None
+    cx0, cy0, cx1, cy1 = cell_range(bbox, cell_size(zoom))
+    qs = SpotGridCell.objects.filter(level=zoom, cx__range=(cx0, cx1), cy__range=(cy0, cy1))
+    sectors = int_values(params, "sector")
+    if sectors:
+        qs = qs.filter(sector_id__in=sectors)
+    types = int_values(params, "type")
+    if types:
+        qs = qs.filter(type_id__in=types)
+    rows = (
+        qs.values("cx", "cy")
+        .annotate(
+            count=Sum("spot_count"), sum_x=Sum("sum_x"), sum_y=Sum("sum_y"),
+            price_count=Sum("price_count"), price_sum=Sum("price_sum"),
+        )
+        .order_by("cy", "cx")
+    )
+    return [_cell(row) for row in rows]
+
+
+def refresh_grid():
+    """Recalcula SpotGridCell para los zooms 0..SPOTS_GRID_MAX_ZOOM; devuelve la cantidad de filas."""
+    table = SpotGridCell._meta.db_table
+    levels = ", ".join(["(%s, %s::float8)"] * (max_zoom() + 1))
+    params = [v for zoom in range(max_zoom() + 1) for v in (zoom, cell_size(zoom))]
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table}
+                (level, cx, cy, sector_id, type_id, spot_count, sum_x, sum_y, price_count, price_sum)
+            SELECT l.level,
+                   floor(ST_X(s.location) / l.cell)::integer,
+                   floor(ST_Y(s.location) / l.cell)::integer,
+                   s.sector_id, s.type_id, count(*),
+                   sum(ST_X(s.location)), sum(ST_Y(s.location)),
+                   count(s.price_total_rent_mxn), sum(s.price_total_rent_mxn)
+            FROM {Spot._meta.db_table} s
+            CROSS JOIN (VALUES {levels}) AS l(level, cell)
+            WHERE s.removed_at IS NULL
+            GROUP BY 1, 2, 3, 4, 5
+        """, params)
+        return cursor.rowcount
@@ -0,0 +1,84 @@
+"""
+Backend PostGIS con pool de conexiones en el proceso y sentencias preparadas
+opcionales, configurados en OPTIONS:
+
+    "pool": {"max_size": 10, "timeout": 5, "max_lifetime": 3600, "check_idle": 30}
+    "prepared_statements": True
+    "max_prepared_statements": 100
+
+Sin esas claves se comporta igual que django.contrib.gis.db.backends.postgis,
+salvo que cada consulta pasa por spots.metrics.record_query y
+spots.slow_queries.capture_slow.
+Con pool, CONN_MAX_AGE tiene que ser 0: al final de cada request Django
+cierra la conexión y acá vuelve al pool.
+"""
+import functools
+
+from django.contrib.gis.db.backends.postgis.base import DatabaseWrapper as PostGISDatabaseWrapper
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.postgresql.creation import DatabaseCreation as PostgresDatabaseCreation
+from django.db.backends.postgresql.psycopg_any import IsolationLevel
+
+from spots.db.pool import ConnectionPool, close_pools, get_pool
+from spots.db.prepared import PreparingConnection, PreparingCursor
+from spots.metrics import record_query
+from spots.slow_queries import capture_slow
+
+SPOTS_OPTIONS = ("pool", "prepared_statements", "max_prepared_statements")
+
+
+class DatabaseCreation(PostgresDatabaseCreation):
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Las conexiones ociosas del pool impedirían el DROP DATABASE.
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(PostGISDatabaseWrapper):
+    creation_class = DatabaseCreation
+    _pool = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.execute_wrappers.extend((record_query, capture_slow))
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        for key in SPOTS_OPTIONS:
+            params.pop(key, None)
+        if self.settings_dict["OPTIONS"].get("prepared_statements"):
+            params["connection_factory"] = PreparingConnection
+            params["cursor_factory"] = PreparingCursor
+        return params
+
+    def get_pool(self, conn_params):
+        options = self.settings_dict["OPTIONS"].get("pool")
+        if not options:
+            return None
+        if self.settings_dict["CONN_MAX_AGE"] != 0:
+            raise ImproperlyConfigured("OPTIONS['pool'] requiere CONN_MAX_AGE = 0.")
+        key = (self.alias, *sorted((k, repr(v)) for k, v in conn_params.items()))
+        connect = functools.partial(super().get_new_connection, conn_params)
+        return get_pool(key, lambda: ConnectionPool(connect, **({} if options is True else options)))
+
+    def get_new_connection(self, conn_params):
+        self._pool = self.get_pool(conn_params)
+        if self._pool is None:
+            connection = super().get_new_connection(conn_params)
+        else:
+            # Lo que super().get_new_connection deja en el wrapper, para conexiones reusadas.
+            self.isolation_level = IsolationLevel(
+                self.settings_dict["OPTIONS"].get("isolation_level", IsolationLevel.READ_COMMITTED)
+            )
+            connection = self._pool.acquire()
+        if isinstance(connection, PreparingConnection):
+            connection.max_prepared = self.settings_dict["OPTIONS"].get(
+                "max_prepared_statements", PreparingConnection.max_prepared
+            )
+        return connection
+
+    def _close(self):
+        if self._pool is None or self.connection is None:
+            return super()._close()
+        pool, self._pool = self._pool, None
+        pool.release(self.connection, discard=self.errors_occurred)
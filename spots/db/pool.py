@@ -0,0 +1,179 @@
+"""
+Pool de conexiones psycopg2 en el proceso, compartido por todos los hilos
+(workers con threads y el pool de las vistas async). Django "cierra" la
+conexión al final de cada request y el backend la devuelve acá en vez de
+cerrarla: el siguiente request no paga conexión, TLS ni autenticación.
+
+Los pools viven en un registro por proceso (uno por alias y parámetros de
+conexión); cada uno lleva contadores de uso y de espera (ver `pool_stats()`).
+"""
+import threading
+import time
+
+from django.db import DatabaseError
+from psycopg2 import Error as PsycopgError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_UNKNOWN
+
+
+class PoolTimeout(DatabaseError):
+    pass
+
+
+class ConnectionPool:
+    """
+    Hasta `max_size` conexiones; `acquire` espera hasta `timeout` segundos
+    a que se libere una. Las conexiones con más de `max_lifetime` segundos se
+    cierran al devolverlas, y las que estuvieron ociosas más de `check_idle`
+    se prueban con SELECT 1 antes de entregarlas.
+    """
+
+    def __init__(self, connect, max_size=10, timeout=5.0, max_lifetime=3600.0, check_idle=30.0):
+        self.connect = connect
+        self.max_size = max_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.check_idle = check_idle
+        self._cond = threading.Condition()
+        self._idle = []  # (conexión, devuelta en)
+        self._born = {}
+        self._size = 0
+        self._waiting = 0
+        self._counters = dict.fromkeys(
+            ("connects", "acquired", "waits", "timeouts", "discarded"), 0
+        )
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    def acquire(self):
+        started = time.monotonic()
+        deadline = started + self.timeout
+        waited = False
+        with self._cond:
+            while True:
+                conn = self._take_idle()
+                if conn is not None:
+                    break
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise PoolTimeout(f"Sin conexiones libres en el pool tras {self.timeout}s.")
+                waited = True
+                self._waiting += 1
+                self._cond.wait(remaining)
+                self._waiting -= 1
+
+        if conn is None:
+            try:
+                conn = self.connect()
+            except BaseException:
+                with self._cond:
+                    self._size -= 1
+                    self._cond.notify()
+                raise
+            with self._cond:
+                self._born[conn] = time.monotonic()
+                self._counters["connects"] += 1
+
+        elapsed = time.monotonic() - started
+        with self._cond:
+            self._counters["acquired"] += 1
+            if waited:
+                self._counters["waits"] += 1
+            self._wait_total += elapsed
+            self._wait_max = max(self._wait_max, elapsed)
+        return conn
+
+    def _take_idle(self):
+        """Una conexión ociosa sana, o None; llamar con el lock tomado."""
+        while self._idle:
+            conn, since = self._idle.pop()
+            if conn.closed or (time.monotonic() - since > self.check_idle and not self._ping(conn)):
+                self._drop(conn)
+                continue
+            return conn
+        return None
+
+    @staticmethod
+    def _ping(conn):
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except PsycopgError:
+            return False
+
+    def release(self, conn, discard=False):
+        if not discard and not conn.closed:
+            status = conn.info.transaction_status
+            if status == TRANSACTION_STATUS_UNKNOWN:
+                discard = True
+            elif status != TRANSACTION_STATUS_IDLE:
+                try:
+                    conn.rollback()
+                except PsycopgError:
+                    discard = True
+        with self._cond:
+            expired = time.monotonic() - self._born.get(conn, 0) > self.max_lifetime
+            if discard or conn.closed or expired:
+                self._drop(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _drop(self, conn):
+        self._born.pop(conn, None)
+        self._size -= 1
+        self._counters["discarded"] += 1
+        try:
+            conn.close()
+        except PsycopgError:
+            pass
+
+    def close(self):
+        with self._cond:
+            while self._idle:
+                self._drop(self._idle.pop()[0])
+
+    def stats(self):
+        with self._cond:
+            return {
+                "max_size": self.max_size,
+                "size": self._size,
+                "in_use": self._size - len(self._idle),
+                "idle": len(self._idle),
+                "waiting": self._waiting,
+                **self._counters,
+                "wait_seconds_total": round(self._wait_total, 6),
+                "wait_seconds_max": round(self._wait_max, 6),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(key, create):
+    """El pool registrado bajo `key`, creándolo con `create()` la primera vez."""
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = create()
+        return pool
+
+
+def close_pools():
+    """Cierra las conexiones ociosas de todos los pools (p.ej. antes de borrar la base de tests)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def pool_stats():
+    """Estadísticas de cada pool del proceso, por alias de base."""
+    with _pools_lock:
+        pools = list(_pools.items())
+    return [{"alias": key[0], **pool.stats()} for key, pool in pools]
@@ -0,0 +1,141 @@
+"""
+Sentencias preparadas del lado del servidor (PREPARE/EXECUTE) para consultas
+de forma fija. Dentro de `prepared_statements()` cada SELECT del ORM (con o
+sin parámetros) se prepara una vez por conexión, con nombre derivado del
+texto SQL, y las siguientes ejecuciones sólo mandan los parámetros: Postgres
+se ahorra el parseo y la planificación. Fuera del bloque las consultas van
+como siempre.
+
+Sólo tiene efecto con el backend spots.db.backends.postgis y
+OPTIONS["prepared_statements"]; no usar detrás de un PgBouncer en modo
+transacción (las sentencias preparadas son de la sesión).
+"""
+import contextvars
+import functools
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from django.db.backends.postgresql.base import Cursor
+from psycopg2 import Error as PsycopgError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, connection as PsycopgConnection
+
+_active = contextvars.ContextVar("spots_prepared_statements", default=False)
+_placeholder = re.compile(r"%%|%s")
+_lock = threading.Lock()
+_counters = dict.fromkeys(("prepared", "executed", "failed", "deallocated"), 0)
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def stats():
+    with _lock:
+        return dict(_counters)
+
+
+@contextmanager
+def prepared_statements():
+    token = _active.set(True)
+    try:
+        yield
+    finally:
+        _active.reset(token)
+
+
+def prepared(method):
+    """Decorador de acciones: las consultas de la vista van como sentencias preparadas."""
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with prepared_statements():
+            return method(*args, **kwargs)
+
+    return wrapper
+
+
+def statement_name(sql):
+    return "spots_" + hashlib.sha1(sql.encode("utf-8")).hexdigest()[:20]
+
+
+def numbered(sql):
+    """SQL con placeholders %s de psycopg2 -> $1, $2, ... (y %% -> %) para PREPARE."""
+    position = 0
+
+    def replace(match):
+        nonlocal position
+        if match.group() == "%%":
+            return "%"
+        position += 1
+        return f"${position}"
+
+    return _placeholder.sub(replace, sql), position
+
+
+class PreparingConnection(PsycopgConnection):
+    """Conexión psycopg2 con el registro de las sentencias preparadas en la sesión."""
+
+    max_prepared = 100
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = OrderedDict()
+        self.unpreparable = set()
+
+
+class PreparingCursor(Cursor):
+    def execute(self, sql, params=None):
+        conn = self.connection
+        if (
+            not _active.get()
+            or self.name
+            or not isinstance(params, (list, tuple))
+            or not isinstance(conn, PreparingConnection)
+            or sql.lstrip()[:6].upper() != "SELECT"
+            or sql in conn.unpreparable
+        ):
+            return super().execute(sql, params)
+
+        name = conn.prepared.get(sql)
+        if name is None:
+            name = self._prepare(conn, sql, len(params))
+            if name is None:
+                return super().execute(sql, params)
+        else:
+            conn.prepared.move_to_end(sql)
+        _count("executed")
+        if not params:
+            return super().execute(f"EXECUTE {name}", params)
+        return super().execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+
+    def _prepare(self, conn, sql, n_params):
+        text, count = numbered(sql)
+        if count != n_params:
+            conn.unpreparable.add(sql)
+            return None
+        name = statement_name(sql)
+        # En una transacción un PREPARE fallido la abortaría: se aísla con un savepoint.
+        in_transaction = conn.info.transaction_status != TRANSACTION_STATUS_IDLE
+        try:
+            if in_transaction:
+                super().execute("SAVEPOINT spots_prepare")
+            super().execute(f"PREPARE {name} AS {text}")
+            if in_transaction:
+                super().execute("RELEASE SAVEPOINT spots_prepare")
+        except PsycopgError:
+            if in_transaction:
+                super().execute("ROLLBACK TO SAVEPOINT spots_prepare")
+            conn.unpreparable.add(sql)
+            _count("failed")
+            return None
+        conn.prepared[sql] = name
+        _count("prepared")
+        while len(conn.prepared) > conn.max_prepared:
+            _, oldest = conn.prepared.popitem(last=False)
+            super().execute(f"DEALLOCATE {oldest}")
+            _count("deallocated")
+        return name
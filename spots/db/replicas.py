@@ -0,0 +1,130 @@
+"""
+Réplicas de lectura. SpotViewSet elige un alias por request (`alias_for`) y
+lo fija con `reading_from()`; ReplicaRouter manda a ese alias todas las
+lecturas del request, así un request no mezcla réplicas. Fuera de eso
+(load_data, admin, escrituras) todo va al primario.
+
+Una réplica es elegible si responde y su lag es de a lo sumo
+SPOTS_REPLICA_MAX_LAG segundos; cada proceso la mide cada
+SPOTS_REPLICA_CHECK_INTERVAL segundos. Sin réplicas elegibles, o con el
+encabezado `X-Read-From: primary` (p.ej. justo después de una carga), se lee
+del primario.
+"""
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+PRIMARY = DEFAULT_DB_ALIAS
+PRIMARY_HEADER = "X-Read-From"
+
+# Lag en segundos: 0 si no es standby o si ya aplicó todo lo recibido.
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+          OR pg_last_wal_receive_lsn() IS NOT DISTINCT FROM pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_reading_from = contextvars.ContextVar("spots_read_alias", default=None)
+_lock = threading.Lock()
+_status = {}  # alias -> (medido en, sana, lag)
+
+
+def replicas():
+    return list(getattr(settings, "SPOTS_READ_REPLICAS", []))
+
+
+def probe(alias):
+    """(sana, lag en segundos) de una réplica, consultándola."""
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(LAG_SQL)
+            return True, float(cursor.fetchone()[0])
+    except DatabaseError:
+        connections[alias].close()
+        return False, None
+
+
+def status(alias):
+    """(sana, lag) memoizado durante SPOTS_REPLICA_CHECK_INTERVAL segundos."""
+    interval = getattr(settings, "SPOTS_REPLICA_CHECK_INTERVAL", 5)
+    now = time.monotonic()
+    with _lock:
+        cached = _status.get(alias)
+    if cached is not None and now - cached[0] < interval:
+        return cached[1:]
+    healthy, lag = probe(alias)
+    with _lock:
+        _status[alias] = (now, healthy, lag)
+    return healthy, lag
+
+
+def forget_status():
+    with _lock:
+        _status.clear()
+
+
+def choose():
+    """Una réplica elegible al azar, o el primario."""
+    max_lag = getattr(settings, "SPOTS_REPLICA_MAX_LAG", 30)
+    eligible = []
+    for alias in replicas():
+        healthy, lag = status(alias)
+        if healthy and lag <= max_lag:
+            eligible.append(alias)
+    return random.choice(eligible) if eligible else PRIMARY
+
+
+def alias_for(request):
+    if request.headers.get(PRIMARY_HEADER, "").lower() == "primary":
+        return PRIMARY
+    return choose()
+
+
+def current():
+    return _reading_from.get() or PRIMARY
+
+
+@contextmanager
+def reading_from(alias):
+    token = _reading_from.set(alias)
+    try:
+        yield
+    finally:
+        _reading_from.reset(token)
+
+
+def replica_stats():
+    """Último estado medido de cada réplica."""
+    now = time.monotonic()
+    with _lock:
+        known = dict(_status)
+    stats = []
+    for alias in replicas():
+        checked, healthy, lag = known.get(alias, (None, None, None))
+        stats.append({
+            "alias": alias,
+            "healthy": healthy,
+            "lag_seconds": lag,
+            "checked_seconds_ago": None if checked is None else round(now - checked, 3),
+        })
+    return stats
+
+
+class ReplicaRouter:
+    """Lecturas al alias fijado por reading_from(); sin él, y siempre para escrituras, el primario."""
+
+    def db_for_read(self, model, **hints):
+        return _reading_from.get()
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
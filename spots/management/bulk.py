@@ -0,0 +1,244 @@
+import csv
+import io
+
+from django.db import connection
+from django.utils import timezone
+
+from spots.models import Spot, State, Municipality, Settlement, Region, Corridor
+from spots.management.commands.utils import SPOT_FIELDS
+
+
+STAGE_TABLE = "spots_spot_stage"
+
+NUMERIC_FIELDS = {
+    "area_sqm", "price_sqm_rent_mxn", "price_total_rent_mxn",
+    "price_sqm_sale_mxn", "price_total_sale_mxn", "maintenance_cost_mxn",
+}
+
+NULL = r"\N"
+
+
+def _stage_type(field):
+    if field in NUMERIC_FIELDS:
+        return "numeric"
+    if field in ("sector_id", "type_id"):
+        return "integer"
+    if field == "created_date":
+        return "timestamptz"
+    return "text"
+
+
+STAGE_COLUMNS = (
+    ("line_no", "bigint"),
+    ("spot_id", "bigint"),
+    ("lat", "double precision"),
+    ("lng", "double precision"),
+    ("state", "text"),
+    ("municipality", "text"),
+    ("settlement", "text"),
+    ("region", "text"),
+    ("corridor", "text"),
+    ("content_hash", "text"),
+) + tuple((f, _stage_type(f)) for f in SPOT_FIELDS)
+
+
+class NameCanonicalizer:
+    """
+    Replica la semántica de los caches del modo fila a fila: la primera
+    variante de un nombre (sin distinguir mayúsculas) es la que se persiste.
+    """
+
+    def __init__(self):
+        self._seen = {}
+
+    def resolve(self, kind, key, name):
+        return self._seen.setdefault((kind, key), name)
+
+    def lookups(self, rec):
+        state = rec["state"] or None
+        municipality = settlement = None
+        if state:
+            skey = state.lower()
+            state = self.resolve("state", skey, state)
+            if rec["municipality"]:
+                mkey = (rec["municipality"].lower(), skey)
+                municipality = self.resolve("municipality", mkey, rec["municipality"])
+                if rec["settlement"]:
+                    settlement = self.resolve(
+                        "settlement", (rec["settlement"].lower(),) + mkey, rec["settlement"]
+                    )
+        region = rec["region"] or None
+        if region:
+            region = self.resolve("region", region.lower(), region)
+        corridor = rec["corridor"] or None
+        if corridor:
+            corridor = self.resolve("corridor", corridor.lower(), corridor)
+        return state, municipality, settlement, region, corridor
+
+
+def _csv_value(v):
+    if v is None:
+        return NULL
+    if hasattr(v, "isoformat"):
+        return v.isoformat()
+    return v
+
+
+class BulkLoader:
+    """
+    Carga set-based: vuelca las filas normalizadas a una tabla temporal con
+    COPY y resuelve entidades y spots con INSERT ... ON CONFLICT.
+
+    Con incremental=True sólo se escriben los spots nuevos o cuyo
+    content_hash cambió; con snapshot=True los spots activos que no vienen
+    en el archivo se marcan con removed_at.
+    """
+
+    def __init__(self, batch_size=50000, incremental=False, snapshot=False):
+        self.batch_size = batch_size
+        self.incremental = incremental
+        self.snapshot = snapshot
+        self.names = NameCanonicalizer()
+        self.staged = 0
+
+    def load(self, records):
+        with connection.cursor() as cursor:
+            self._create_stage(cursor)
+            self._copy(cursor, records)
+            cursor.execute(f"ANALYZE {STAGE_TABLE}")
+            self._upsert_lookups(cursor)
+            stats = self._upsert_spots(cursor)
+            stats["removed"] = self._mark_removed(cursor) if self.snapshot else 0
+        return stats
+
+    def _create_stage(self, cursor):
+        columns = ", ".join(f"{name} {type_}" for name, type_ in STAGE_COLUMNS)
+        cursor.execute(f"DROP TABLE IF EXISTS {STAGE_TABLE}")
+        cursor.execute(f"CREATE TEMP TABLE {STAGE_TABLE} ({columns}) ON COMMIT DROP")
+
+    def _copy(self, cursor, records):
+        sql = (
+            f"COPY {STAGE_TABLE} ({', '.join(name for name, _ in STAGE_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{NULL}')"
+        )
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        pending = 0
+        for rec in records:
+            self.staged += 1
+            writer.writerow(
+                (self.staged, rec["spot_id"], rec["lat"], rec["lng"])
+                + self.names.lookups(rec)
+                + (rec["content_hash"],)
+                + tuple(_csv_value(rec[f]) for f in SPOT_FIELDS)
+            )
+            pending += 1
+            if pending >= self.batch_size:
+                self._flush(cursor, sql, buf)
+                buf = io.StringIO()
+                writer = csv.writer(buf)
+                pending = 0
+        if pending:
+            self._flush(cursor, sql, buf)
+
+    def _flush(self, cursor, sql, buf):
+        buf.seek(0)
+        cursor.copy_expert(sql, buf)
+
+    def _upsert_lookups(self, cursor):
+        state = State._meta.db_table
+        muni = Municipality._meta.db_table
+        settlement = Settlement._meta.db_table
+        for model, column in ((State, "state"), (Region, "region"), (Corridor, "corridor")):
+            cursor.execute(f"""
+                INSERT INTO {model._meta.db_table} (name)
+                SELECT DISTINCT s.{column} FROM {STAGE_TABLE} s
+                WHERE s.{column} IS NOT NULL
+                ON CONFLICT (name) DO NOTHING
+            """)
+        cursor.execute(f"""
+            INSERT INTO {muni} (name, state_id)
+            SELECT DISTINCT s.municipality, st.id
+            FROM {STAGE_TABLE} s
+            JOIN {state} st ON st.name = s.state
+            WHERE s.municipality IS NOT NULL
+            ON CONFLICT (name, state_id) DO NOTHING
+        """)
+        cursor.execute(f"""
+            INSERT INTO {settlement} (name, municipality_id)
+            SELECT DISTINCT s.settlement, m.id
+            FROM {STAGE_TABLE} s
+            JOIN {state} st ON st.name = s.state
+            JOIN {muni} m ON m.name = s.municipality AND m.state_id = st.id
+            WHERE s.settlement IS NOT NULL
+            ON CONFLICT (name, municipality_id) DO NOTHING
+        """)
+
+    def _upsert_spots(self, cursor):
+        opts = Spot._meta
+        table = opts.db_table
+        columns = [opts.get_field(f).column for f in SPOT_FIELDS]
+        insert_columns = [
+            "spot_id",
+            opts.get_field("location").column,
+            opts.get_field("settlement").column,
+            opts.get_field("municipality").column,
+            opts.get_field("state").column,
+            opts.get_field("region").column,
+            opts.get_field("corridor").column,
+            "content_hash",
+            "removed_at",
+        ] + columns
+        select = [
+            "s.spot_id",
+            "ST_SetSRID(ST_MakePoint(s.lng, s.lat), 4326)",
+            "se.id",
+            # Como Spot.save(): municipio y estado sólo a través del asentamiento.
+            "CASE WHEN se.id IS NOT NULL THEN m.id END",
+            "CASE WHEN se.id IS NOT NULL THEN st.id END",
+            "r.id",
+            "c.id",
+            "s.content_hash",
+            "NULL::timestamptz",
+        ] + [f"s.{f}" for f in SPOT_FIELDS]
+        updates = ", ".join(f"{c} = EXCLUDED.{c}" for c in insert_columns if c != "spot_id")
+        changed = (
+            f"WHERE {table}.content_hash IS DISTINCT FROM EXCLUDED.content_hash "
+            f"OR {table}.removed_at IS NOT NULL"
+        ) if self.incremental else ""
+        cursor.execute(f"""
+            WITH upserted AS (
+                INSERT INTO {table} ({", ".join(insert_columns)})
+                SELECT DISTINCT ON (s.spot_id) {", ".join(select)}
+                FROM {STAGE_TABLE} s
+                LEFT JOIN {State._meta.db_table} st ON st.name = s.state
+                LEFT JOIN {Municipality._meta.db_table} m ON m.name = s.municipality AND m.state_id = st.id
+                LEFT JOIN {Settlement._meta.db_table} se ON se.name = s.settlement AND se.municipality_id = m.id
+                LEFT JOIN {Region._meta.db_table} r ON r.name = s.region
+                LEFT JOIN {Corridor._meta.db_table} c ON c.name = s.corridor
+                ORDER BY s.spot_id, s.line_no DESC
+                ON CONFLICT (spot_id) DO UPDATE SET {updates}
+                {changed}
+                RETURNING (xmax = 0) AS inserted
+            )
+            SELECT
+                count(*) FILTER (WHERE inserted),
+                count(*) FILTER (WHERE NOT inserted),
+                (SELECT count(DISTINCT spot_id) FROM {STAGE_TABLE})
+            FROM upserted
+        """)
+        inserted, updated, distinct = cursor.fetchone()
+        return {
+            "inserted": inserted,
+            "updated": updated,
+            "unchanged": distinct - inserted - updated,
+        }
+
+    def _mark_removed(self, cursor):
+        table = Spot._meta.db_table
+        cursor.execute(f"""
+            UPDATE {table} SET removed_at = %s
+            WHERE removed_at IS NULL
+              AND NOT EXISTS (SELECT 1 FROM {STAGE_TABLE} s WHERE s.spot_id = {table}.spot_id)
+        """, [timezone.now()])
+        return cursor.rowcount
@@ -0,0 +1,72 @@
+import random
+
+from django.contrib.gis.geos import Polygon
+from django.core.management.base import BaseCommand, CommandError
+
+from spots.api.filters import apply_nearby
+from spots.memindex import SpotMemoryIndex, haversine, polygon_rings
+from spots.models import Spot
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el índice espacial en memoria contra PostGIS con consultas aleatorias. "
+        "Ej: python manage.py check_memory_index --samples 200"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--samples", type=int, default=100)
+        parser.add_argument("--radius", type=float, default=2000, help="Radio máximo en metros (default 2000).")
+        parser.add_argument(
+            "--tolerance", type=float, default=0.005,
+            help="Tolerancia relativa en el borde del radio: esfera vs. esferoide (default 0.5%%).",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **opts):
+        rng = random.Random(opts["seed"])
+        queryset = Spot.objects.filter(removed_at__isnull=True)
+        index = SpotMemoryIndex.build(queryset)
+        if not len(index):
+            raise CommandError("No hay spots cargados.")
+
+        positions = {int(pk): n for n, pk in enumerate(index.ids)}
+        mismatches = 0
+        for _ in range(opts["samples"]):
+            i = rng.randrange(len(index))
+            lat, lng = float(index.lats[i]), float(index.lngs[i])
+            radius = rng.uniform(50, opts["radius"])
+
+            memory, _ = index.nearby(lat, lng, radius)
+            postgis = list(apply_nearby(queryset, lat, lng, radius).values_list("id", flat=True))
+            mismatches += self.compare_nearby(
+                index, positions, lat, lng, radius, memory.tolist(), postgis, opts["tolerance"]
+            )
+
+            half = radius / 111_320
+            polygon = Polygon.from_bbox((lng - half, lat - half, lng + half, lat + half))
+            polygon.srid = 4326
+            memory = index.within(polygon_rings(polygon))
+            postgis = list(queryset.filter(location__within=polygon).order_by("spot_id").values_list("id", flat=True))
+            if set(memory.tolist()) != set(postgis):
+                mismatches += 1
+                self.stderr.write(f"within bbox {polygon.extent}: memoria {len(memory)} vs PostGIS {len(postgis)}")
+
+        if mismatches:
+            raise CommandError(f"{mismatches} diferencias en {opts['samples']} muestras.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Índice en memoria consistente con PostGIS ({len(index)} spots, {opts['samples']} muestras)."
+        ))
+
+    def compare_nearby(self, index, positions, lat, lng, radius, memory, postgis, tolerance):
+        # Los puntos a menos de `tolerance` del borde pueden quedar de un lado
+        # u otro según el modelo de la Tierra; el resto debe coincidir.
+        differing = set(memory) ^ set(postgis)
+        real = [
+            i for i in differing
+            if abs(haversine(lat, lng, index.lats[positions[i]], index.lngs[positions[i]]) - radius) > radius * tolerance
+        ]
+        if real:
+            self.stderr.write(f"nearby ({lat}, {lng}, {radius:.0f}m): {len(real)} ids distintos")
+            return 1
+        return 0
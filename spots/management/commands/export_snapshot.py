@@ -0,0 +1,37 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from spots.snapshot import FORMATS, write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Escribe los spots activos como archivo columnar (Parquet o Arrow IPC). "
+        "Ej: python manage.py export_snapshot --output data/spots.parquet"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", default="data/snapshots/spots.parquet")
+        parser.add_argument(
+            "--format", choices=list(FORMATS), default=None,
+            help="parquet o arrow (default: según la extensión de --output).",
+        )
+        parser.add_argument(
+            "--row-group-size", type=int, default=100_000,
+            help="Filas por row group / record batch; acota la memoria (default 100000).",
+        )
+
+    def handle(self, *args, **opts):
+        path = Path(opts["output"])
+        fmt = opts["format"] or ("arrow" if path.suffix in (".arrow", ".feather") else "parquet")
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        started = time.perf_counter()
+        rows = write_snapshot(path, fmt, row_group_size=opts["row_group_size"])
+        elapsed = time.perf_counter() - started
+        size = path.stat().st_size / 1e6
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot {fmt} con {rows} spots en {path} ({size:.1f} MB, {elapsed:.2f}s)."
+        ))
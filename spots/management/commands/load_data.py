@@ -1,15 +1,25 @@
 import csv
+import time
 from pathlib import Path
 
 
 from django.core.management.base import BaseCommand
 from django.contrib.gis.geos import Point
 from django.db import transaction
+from django.utils import timezone
 
 from spots.models import (
     Spot, State, Municipality, Settlement, Region, Corridor
 )
-from spots.management.commands.utils import norm, to_float, to_dec, to_int, parse_date, map_modality
+from spots.management.bulk import BulkLoader
+from spots.management.parallel import ParallelReader, Timed
+from spots.management.commands.utils import SPOT_FIELDS, RowParser, norm
+from spots import slow_queries
+from spots.cache import bump_dataset_version
+from spots.clusters import refresh_grid
+from spots.rollups import refresh_price_rollups
+from spots.stats import refresh_statistics
+from spots.signals import spots_loaded
 
 
 class Command(BaseCommand):
@@ -17,14 +27,109 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("--csv", default="data/LK_SPOTS.csv")
+        parser.add_argument(
+            "--bulk", action="store_true",
+            help="Carga masiva: COPY a una tabla temporal y upserts set-based (INSERT ... ON CONFLICT).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=50000,
+            help="Filas por cada COPY en modo --bulk (default 50000).",
+        )
+        parser.add_argument(
+            "--workers", type=int, default=1,
+            help="Procesos para parsear el CSV en paralelo por rangos de bytes (default 1).",
+        )
+        parser.add_argument(
+            "--chunk-bytes", type=int, default=8 * 1024 * 1024,
+            help="Tamaño de cada rango de bytes con --workers (default 8 MiB).",
+        )
+        parser.add_argument(
+            "--incremental", action="store_true",
+            help="Sólo escribe spots nuevos o cuyo contenido cambió (según content_hash).",
+        )
+        parser.add_argument(
+            "--snapshot", action="store_true",
+            help="El CSV es un snapshot completo: los spots ausentes se dan de baja (removed_at).",
+        )
 
-    @transaction.atomic
     def handle(self, *args, **opts):
+        options = {key: opts[key] for key in ("csv", "bulk", "batch_size", "workers", "incremental", "snapshot")}
+        with slow_queries.tagged(source="load_data", action="load_data", options=options):
+            self.load(opts)
+
+    @transaction.atomic
+    def load(self, opts):
         path = Path(opts["csv"])
         if not path.exists():
             self.stderr.write(self.style.ERROR(f"No existe el archivo CSV: {path}"))
             return
 
+        started = time.perf_counter()
+        with path.open(encoding="utf-8-sig", newline="") as f:
+            reader = csv.DictReader(f)
+
+            required = [
+                "spot_id", "spot_latitude", "spot_longitude",
+                "spot_municipality", "spot_state", "spot_settlement",
+            ]
+            missing = [c for c in required if c not in reader.fieldnames]
+            if missing:
+                self.stderr.write(self.style.WARNING(
+                    f"Cuidado: faltan columnas esperadas: {missing}. "
+                    "Asegurate de usar encabezados snake_case como en el ejemplo."
+                ))
+
+            if opts["workers"] > 1:
+                source = ParallelReader(
+                    path, reader.fieldnames, workers=opts["workers"], chunk_bytes=opts["chunk_bytes"]
+                )
+            else:
+                source = (rec for rec in map(RowParser(), reader) if rec is not None)
+
+            records = Timed(source)
+            if opts["bulk"]:
+                loader = BulkLoader(
+                    batch_size=opts["batch_size"],
+                    incremental=opts["incremental"],
+                    snapshot=opts["snapshot"],
+                )
+                stats = loader.load(records)
+                count = loader.staged
+            else:
+                stats = self.load_rows(records, incremental=opts["incremental"], snapshot=opts["snapshot"])
+                count = stats.pop("rows")
+
+        stats["rollups"] = refresh_price_rollups()
+        stats["statistics"] = refresh_statistics()
+        stats["grid"] = refresh_grid()
+        stats["version"] = bump_dataset_version().version
+        transaction.on_commit(lambda: spots_loaded.send(sender=self.__class__, stats=stats))
+
+        elapsed = time.perf_counter() - started
+        rate = count / elapsed if elapsed else 0
+        written = stats["inserted"] + stats["updated"]
+        self.stdout.write(self.style.SUCCESS(
+            f"Cargados/actualizados {written} spots ({count} filas) en {elapsed:.2f}s ({rate:.0f} filas/s)."
+        ))
+        self.stdout.write(
+            f"Insertados: {stats['inserted']}, actualizados: {stats['updated']}, "
+            f"sin cambios: {stats['unchanged']}, dados de baja: {stats['removed']}."
+        )
+        self.stdout.write(
+            f"Rollup de precios por sector/tipo/municipio: {stats['rollups']} grupos. "
+            f"Estadísticas precalculadas: {stats['statistics']} agrupaciones. "
+            f"Grilla de clusters: {stats['grid']} celdas. "
+            f"Versión del dataset: v{stats['version']}."
+        )
+        stages = f"Etapas: lectura/parseo {records.seconds:.2f}s, escritura {elapsed - records.seconds:.2f}s"
+        if isinstance(source, ParallelReader):
+            stages += (
+                f" (esperando al pool de {opts['workers']} workers); "
+                f"parseo en workers {source.parse_seconds:.2f}s CPU en {source.chunks} chunks"
+            )
+        self.stdout.write(stages + ".")
+
+    def load_rows(self, records, incremental=False, snapshot=False):
         state_cache = {}
         muni_cache = {}
         settlement_cache = {}
@@ -83,62 +188,54 @@ class Command(BaseCommand):
             corridor_cache[key] = obj
             return obj
 
-        count = 0
-        with path.open(encoding="utf-8-sig", newline="") as f:
-            reader = csv.DictReader(f)
-
-            required = [
-                "spot_id", "spot_latitude", "spot_longitude",
-                "spot_municipality", "spot_state", "spot_settlement",
+        existing = {}
+        if incremental or snapshot:
+            existing = {
+                spot_id: (content_hash, removed_at is None)
+                for spot_id, content_hash, removed_at
+                in Spot.objects.values_list("spot_id", "content_hash", "removed_at").iterator()
+            }
+
+        stats = dict(rows=0, inserted=0, updated=0, unchanged=0, removed=0)
+        seen = set()
+        for rec in records:
+            stats["rows"] += 1
+            spot_id = rec["spot_id"]
+            if incremental and existing.get(spot_id) == (rec["content_hash"], True):
+                if spot_id not in seen:
+                    stats["unchanged"] += 1
+                seen.add(spot_id)
+                continue
+
+            state = get_state(rec["state"])
+            municipality = get_muni(rec["municipality"], state)
+            settlement = get_settlement(rec["settlement"], municipality)
+
+            defaults = {f: rec[f] for f in SPOT_FIELDS}
+            defaults.update(
+                location=Point(rec["lng"], rec["lat"], srid=4326),
+                settlement=settlement,
+                region=get_region(rec["region"]),
+                corridor=get_corridor(rec["corridor"]),
+                content_hash=rec["content_hash"],
+                removed_at=None,
+            )
+
+            _, created = Spot.objects.update_or_create(spot_id=spot_id, defaults=defaults)
+            if spot_id not in seen:
+                stats["inserted" if created else "updated"] += 1
+            seen.add(spot_id)
+            existing[spot_id] = (rec["content_hash"], True)
+
+        if snapshot:
+            missing = [
+                spot_id for spot_id, (_, active) in existing.items()
+                if active and spot_id not in seen
             ]
-            missing = [c for c in required if c not in reader.fieldnames]
-            if missing:
-                self.stderr.write(self.style.WARNING(
-                    f"Cuidado: faltan columnas esperadas: {missing}. "
-                    "Asegurate de usar encabezados snake_case como en el ejemplo."
-                ))
-
-            for row in reader:
-                spot_id = norm(row.get("spot_id"))
-                lat = to_float(row.get("spot_latitude"))
-                lng = to_float(row.get("spot_longitude"))
-
-                if not spot_id or lat is None or lng is None:
-                    continue
-
-                state = get_state(row.get("spot_state"))
-                municipality = get_muni(row.get("spot_municipality"), state)
-                settlement = get_settlement(row.get("spot_settlement"), municipality)
-
-                region = get_region(row.get("spot_region"))
-                corridor = get_corridor(row.get("spot_corridor"))
-
-                modality = map_modality(row.get("spot_modality"))
-                created = parse_date(row.get("spot_created_date"))
-
-                defaults = dict(
-                    title=norm(row.get("spot_title")),
-                    description=norm(row.get("spot_description")),
-                    address=norm(row.get("spot_address")),
-                    sector_id=to_int(row.get("spot_sector_id")),
-                    type_id=to_int(row.get("spot_type_id")),
-                    modality=modality,
-                    area_sqm=to_dec(row.get("spot_area_in_sqm")),
-                    price_sqm_rent_mxn=to_dec(row.get("spot_price_sqm_mxn_rent")),
-                    price_total_rent_mxn=to_dec(row.get("spot_price_total_mxn_rent")),
-                    price_sqm_sale_mxn=to_dec(row.get("spot_price_sqm_mxn_sale")),
-                    price_total_sale_mxn=to_dec(row.get("spot_price_total_mxn_sale")),
-                    maintenance_cost_mxn=to_dec(row.get("spot_maintenance_cost_mxn")),
-                    user_id=norm(row.get("uuiid") or row.get("user_id")),
-                    created_date=created,
-                    location=Point(lng, lat, srid=4326),
-
-                    settlement=settlement,
-                    region=region,
-                    corridor=corridor,
-                )
-
-                Spot.objects.update_or_create(spot_id=spot_id, defaults=defaults)
-                count += 1
+            now = timezone.now()
+            for i in range(0, len(missing), 10000):
+                stats["removed"] += Spot.objects.filter(
+                    spot_id__in=missing[i:i + 10000], removed_at__isnull=True
+                ).update(removed_at=now)
 
-        self.stdout.write(self.style.SUCCESS(f"Cargados/actualizados {count} spots."))
+        return stats
@@ -0,0 +1,45 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from spots import slow_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Muestra las consultas lentas capturadas de SpotViewSet y load_data, con sus planes. "
+        "Ej: python manage.py slow_queries --action nearby --limit 5"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Cantidad de consultas (default 20).")
+        parser.add_argument("--action", default=None, help="Sólo las de esta acción (p.ej. nearby, within, load_data).")
+        parser.add_argument("--json", action="store_true", help="Las entradas completas, una por línea.")
+        parser.add_argument("--clear", action="store_true", help="Vacía el buffer.")
+
+    def handle(self, *args, **opts):
+        if opts["clear"]:
+            slow_queries.clear()
+            self.stdout.write(self.style.SUCCESS("Buffer de consultas lentas vacío."))
+            return
+
+        found = slow_queries.entries(limit=opts["limit"], action=opts["action"])
+        if opts["json"]:
+            for entry in found:
+                self.stdout.write(json.dumps(entry, ensure_ascii=False, default=str))
+            return
+        if not found:
+            self.stdout.write("No hay consultas lentas capturadas.")
+            return
+
+        for entry in found:
+            tags = entry.get("filters") or entry.get("options") or {}
+            header = [
+                f"#{entry['seq']}", entry["captured_at"], f"{entry.get('source')}/{entry.get('action')}",
+                f"{entry['duration_ms']:.0f} ms en {entry['alias']}", entry.get("method"), entry.get("path"),
+                json.dumps(tags, ensure_ascii=False),
+            ]
+            self.stdout.write(self.style.WARNING(" ".join(part for part in header if part)))
+            self.stdout.write(entry["query"])
+            self.stdout.write(entry["plan"] or "(sin plan: no entró en la muestra de EXPLAIN)")
+            self.stdout.write("")
@@ -1,5 +1,7 @@
+import hashlib
 from decimal import Decimal, InvalidOperation
 from datetime import datetime
+from functools import lru_cache
 
 from spots.models import (
     Spot
@@ -32,6 +34,8 @@ def to_int(v):
     except Exception:
         return None
 
+DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%d-%m-%Y")
+
 def parse_date(v):
     """
     Soporta formatos como:
@@ -44,7 +48,7 @@ def parse_date(v):
     s = norm(v)
     if not s:
         return None
-    for fmt in ("%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%dT%H:%M:%S%z", "%Y-%m-%dT%H:%M:%S", "%d-%m-%Y"):
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(s, fmt)
         except Exception:
@@ -57,4 +61,135 @@ def map_modality(raw):
         return Spot.Modality.RENT_SALE
     if s in ("sale", "venta"):
         return Spot.Modality.SALE
-    return Spot.Modality.RENT
\ No newline at end of file
+    return Spot.Modality.RENT
+
+SPOT_FIELDS = (
+    "title", "description", "address",
+    "sector_id", "type_id", "modality",
+    "area_sqm", "price_sqm_rent_mxn", "price_total_rent_mxn",
+    "price_sqm_sale_mxn", "price_total_sale_mxn", "maintenance_cost_mxn",
+    "user_id", "created_date",
+)
+
+HASH_FIELDS = (
+    "lat", "lng", "state", "municipality", "settlement", "region", "corridor",
+) + SPOT_FIELDS
+
+def content_hash(rec):
+    raw = "\x1f".join("" if rec[f] is None else str(rec[f]) for f in HASH_FIELDS)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+CACHE_SIZE = 4096
+
+
+def _memoize(fn, cache_size):
+    return lru_cache(maxsize=cache_size)(fn) if cache_size else fn
+
+
+class DateColumn:
+    """
+    Parser de fechas para una columna. El primer formato que acierta queda
+    fijo y se prueba primero; la lista completa sólo se recorre ante un fallo.
+    """
+
+    def __init__(self, formats=DATE_FORMATS, cache_size=CACHE_SIZE):
+        self.formats = formats
+        self.fmt = None
+        self.parse = _memoize(self._parse, cache_size)
+
+    def _parse(self, v):
+        s = norm(v)
+        if not s:
+            return None
+        if self.fmt is not None:
+            try:
+                return datetime.strptime(s, self.fmt)
+            except ValueError:
+                pass
+        for fmt in self.formats:
+            if fmt == self.fmt:
+                continue
+            try:
+                value = datetime.strptime(s, fmt)
+            except ValueError:
+                continue
+            if self.fmt is None:
+                self.fmt = fmt
+            return value
+        return None
+
+
+def _fast_dec(v):
+    if not v:
+        return None
+    try:
+        return Decimal(v)
+    except InvalidOperation:
+        return to_dec(v)
+
+
+def _fast_float(v):
+    if not v:
+        return None
+    try:
+        return float(v)
+    except ValueError:
+        return to_float(v)
+
+
+class RowParser:
+    """
+    Normaliza filas del CSV con parsers por columna. Los valores crudos
+    repetidos (precios, sectores, fechas) se memoizan con caches acotados.
+    Devuelve un dict con los nombres de las entidades relacionadas y los
+    campos del Spot, o None si la fila no tiene spot_id o coordenadas válidas.
+    """
+
+    DECIMAL_COLUMNS = (
+        ("area_sqm", "spot_area_in_sqm"),
+        ("price_sqm_rent_mxn", "spot_price_sqm_mxn_rent"),
+        ("price_total_rent_mxn", "spot_price_total_mxn_rent"),
+        ("price_sqm_sale_mxn", "spot_price_sqm_mxn_sale"),
+        ("price_total_sale_mxn", "spot_price_total_mxn_sale"),
+        ("maintenance_cost_mxn", "spot_maintenance_cost_mxn"),
+    )
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.decimals = tuple(
+            (field, column, _memoize(_fast_dec, cache_size))
+            for field, column in self.DECIMAL_COLUMNS
+        )
+        self.to_int = _memoize(to_int, cache_size)
+        self.modality = _memoize(map_modality, cache_size)
+        self.date = DateColumn(cache_size=cache_size)
+
+    def __call__(self, row):
+        get = row.get
+        spot_id = to_int(norm(get("spot_id")))
+        lat = _fast_float(get("spot_latitude"))
+        lng = _fast_float(get("spot_longitude"))
+        if spot_id is None or lat is None or lng is None:
+            return None
+
+        rec = dict(
+            spot_id=spot_id,
+            lat=lat,
+            lng=lng,
+            state=norm(get("spot_state")),
+            municipality=norm(get("spot_municipality")),
+            settlement=norm(get("spot_settlement")),
+            region=norm(get("spot_region")),
+            corridor=norm(get("spot_corridor")),
+            title=norm(get("spot_title")),
+            description=norm(get("spot_description")),
+            address=norm(get("spot_address")),
+            sector_id=self.to_int(get("spot_sector_id")),
+            type_id=self.to_int(get("spot_type_id")),
+            modality=self.modality(get("spot_modality")),
+            user_id=norm(get("uuiid") or get("user_id")),
+            created_date=self.date.parse(get("spot_created_date")),
+        )
+        for field, column, parse in self.decimals:
+            rec[field] = parse(get(column))
+        rec["content_hash"] = content_hash(rec)
+        return rec
@@ -0,0 +1,111 @@
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from spots.management.commands.utils import RowParser
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def chunk_ranges(path, chunk_bytes):
+    """
+    Divide el cuerpo del CSV (sin el encabezado) en rangos de bytes
+    [start, end). Cada rango se ajusta a fin de línea al leerse.
+    """
+    with open(path, "rb") as f:
+        f.readline()
+        data_start = f.tell()
+    size = os.path.getsize(path)
+    ranges = []
+    start = data_start
+    while start < size:
+        end = min(start + chunk_bytes, size)
+        ranges.append((start, end))
+        start = end
+    return data_start, ranges
+
+
+def parse_chunk(path, fieldnames, data_start, start, end):
+    """
+    Parsea las líneas que comienzan dentro de [start, end). Devuelve las
+    filas normalizadas y los segundos de CPU usados.
+    """
+    started = time.process_time()
+    lines = []
+    with open(path, "rb") as f:
+        if start > data_start:
+            f.seek(start - 1)
+            f.readline()
+        else:
+            f.seek(start)
+        while f.tell() < end:
+            line = f.readline()
+            if not line:
+                break
+            lines.append(line.decode("utf-8"))
+
+    reader = csv.DictReader(lines, fieldnames=fieldnames)
+    records = [rec for rec in map(RowParser(), reader) if rec is not None]
+    return records, time.process_time() - started
+
+
+class ParallelReader:
+    """
+    Parsea el CSV en un pool de procesos por rangos de bytes y entrega las
+    filas en el orden del archivo a un único escritor. Mantiene como máximo
+    2 * workers chunks en vuelo para acotar la memoria.
+
+    No soporta campos entre comillas con saltos de línea embebidos.
+    """
+
+    def __init__(self, path, fieldnames, workers, chunk_bytes=8 * 1024 * 1024):
+        self.path = str(path)
+        self.fieldnames = fieldnames
+        self.workers = workers
+        self.chunk_bytes = chunk_bytes
+        self.parse_seconds = 0.0
+        self.chunks = 0
+
+    def __iter__(self):
+        data_start, ranges = chunk_ranges(self.path, self.chunk_bytes)
+        pending = deque()
+        tasks = iter(ranges)
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker) as pool:
+            def submit():
+                task = next(tasks, None)
+                if task is not None:
+                    pending.append(pool.submit(
+                        parse_chunk, self.path, self.fieldnames, data_start, *task
+                    ))
+
+            for _ in range(self.workers * 2):
+                submit()
+            while pending:
+                records, seconds = pending.popleft().result()
+                submit()
+                self.parse_seconds += seconds
+                self.chunks += 1
+                yield from records
+
+
+class Timed:
+    """Acumula el tiempo que el consumidor pasa esperando al iterable."""
+
+    def __init__(self, iterable):
+        self._it = iter(iterable)
+        self.seconds = 0.0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            return next(self._it)
+        finally:
+            self.seconds += time.perf_counter() - started
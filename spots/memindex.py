@@ -0,0 +1,222 @@
+import math
+import threading
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db.models import FloatField, Func
+from django.dispatch import receiver
+
+from spots.api.filters import FILTER_PARAMS, filter_values, int_values
+from spots.cache import dataset_version
+from spots.models import Municipality, Spot
+from spots.signals import spots_loaded
+
+EARTH_RADIUS_M = 6371008.8
+
+# Filtros de apply_spot_filters que el índice resuelve en memoria; con
+# cualquier otro filtro activo la consulta vuelve a PostGIS.
+SUPPORTED_FILTERS = {"sector", "type", "municipality"}
+
+
+def haversine(lat, lng, lats, lngs):
+    """Distancia en metros de (lat, lng) a cada punto de los arrays."""
+    lat1 = math.radians(lat)
+    lat2 = np.radians(lats)
+    dlat = lat2 - lat1
+    dlng = np.radians(lngs - lng)
+    a = np.sin(dlat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+def points_in_rings(xs, ys, rings):
+    """
+    Regla par-impar sobre todos los anillos de un polígono (exterior y
+    huecos): un punto dentro de un hueco cruza dos anillos y queda fuera.
+    """
+    inside = np.zeros(len(xs), dtype=bool)
+    for ring in rings:
+        ring = np.asarray(ring, dtype=np.float64)
+        x1, y1 = ring[:-1, 0], ring[:-1, 1]
+        x2, y2 = ring[1:, 0], ring[1:, 1]
+        for ax, ay, bx, by in zip(x1, y1, x2, y2):
+            if ay == by:
+                continue
+            crosses = (ay > ys) != (by > ys)
+            x_at = ax + (ys - ay) * (bx - ax) / (by - ay)
+            inside ^= crosses & (xs < x_at)
+    return inside
+
+
+def polygon_rings(geom):
+    """Polygon o MultiPolygon GEOS -> lista de polígonos como listas de anillos."""
+    polygons = [geom] if geom.geom_type == "Polygon" else list(geom)
+    return [[ring.coords for ring in polygon] for polygon in polygons]
+
+
+class SpotMemoryIndex:
+    """
+    Grilla empaquetada sobre arrays NumPy: los puntos se ordenan por celda
+    (fila-mayor) y cada fila de celdas de una bbox es un rango contiguo que
+    se resuelve con searchsorted.
+    """
+
+    def __init__(self, ids, spot_ids, lngs, lats, sectors, types, municipalities, municipality_names, cell_deg=0.05):
+        self.cell = cell_deg
+        self.municipality_names = municipality_names
+        cx = np.floor(lngs / cell_deg).astype(np.int64)
+        cy = np.floor(lats / cell_deg).astype(np.int64)
+        self.cx0 = int(cx.min()) if len(cx) else 0
+        self.cy0 = int(cy.min()) if len(cy) else 0
+        self.ncols = int(cx.max()) - self.cx0 + 1 if len(cx) else 1
+        self.nrows = int(cy.max()) - self.cy0 + 1 if len(cy) else 1
+        keys = (cy - self.cy0) * self.ncols + (cx - self.cx0)
+        order = np.argsort(keys, kind="stable")
+
+        self.keys = keys[order]
+        self.ids = ids[order]
+        self.spot_ids = spot_ids[order]
+        self.lngs = lngs[order]
+        self.lats = lats[order]
+        self.sectors = sectors[order]
+        self.types = types[order]
+        self.municipalities = municipalities[order]
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, queryset=None, cell_deg=0.05):
+        queryset = queryset if queryset is not None else Spot.objects.filter(removed_at__isnull=True)
+        rows = list(
+            queryset.order_by()
+            .annotate(
+                x=Func("location", function="ST_X", output_field=FloatField()),
+                y=Func("location", function="ST_Y", output_field=FloatField()),
+            )
+            .values_list("id", "spot_id", "x", "y", "sector_id", "type_id", "municipality_id")
+        )
+        cols = list(zip(*rows)) if rows else [()] * 7
+        as_int = lambda values: np.array([-1 if v is None else v for v in values], dtype=np.int64)  # noqa: E731
+
+        names = {}
+        for muni_id, name in Municipality.objects.values_list("id", "name"):
+            names.setdefault(name.strip().lower(), []).append(muni_id)
+
+        return cls(
+            ids=np.array(cols[0], dtype=np.int64),
+            spot_ids=np.array(cols[1], dtype=np.int64),
+            lngs=np.array(cols[2], dtype=np.float64),
+            lats=np.array(cols[3], dtype=np.float64),
+            sectors=as_int(cols[4]),
+            types=as_int(cols[5]),
+            municipalities=as_int(cols[6]),
+            municipality_names={k: np.array(v, dtype=np.int64) for k, v in names.items()},
+            cell_deg=cell_deg,
+        )
+
+    def _bbox_candidates(self, min_lng, min_lat, max_lng, max_lat):
+        x0 = max(math.floor(min_lng / self.cell) - self.cx0, 0)
+        x1 = min(math.floor(max_lng / self.cell) - self.cx0, self.ncols - 1)
+        y0 = max(math.floor(min_lat / self.cell) - self.cy0, 0)
+        y1 = min(math.floor(max_lat / self.cell) - self.cy0, self.nrows - 1)
+        if x0 > x1 or y0 > y1 or not len(self.keys):
+            return np.empty(0, dtype=np.int64)
+        starts = np.arange(y0, y1 + 1) * self.ncols
+        lo = np.searchsorted(self.keys, starts + x0, side="left")
+        hi = np.searchsorted(self.keys, starts + x1, side="right")
+        return np.concatenate([np.arange(a, b) for a, b in zip(lo, hi)])
+
+    def _filter(self, idx, params):
+        sectors = int_values(params, "sector")
+        if sectors:
+            idx = idx[np.isin(self.sectors[idx], sectors)]
+        types = int_values(params, "type")
+        if types:
+            idx = idx[np.isin(self.types[idx], types)]
+        municipalities = filter_values(params, "municipality")
+        if municipalities:
+            none = np.empty(0, dtype=np.int64)
+            allowed = np.concatenate([self.municipality_names.get(name.lower(), none) for name in municipalities])
+            idx = idx[np.isin(self.municipalities[idx], allowed)]
+        return idx
+
+    def nearby(self, lat, lng, radius, params=None):
+        """Ids de Spot a <= radius metros, ordenados por (distancia, id)."""
+        dlat = math.degrees(radius / EARTH_RADIUS_M) * 1.001
+        coslat = math.cos(math.radians(min(abs(lat) + dlat, 90.0)))
+        dlng = 180.0 if coslat < 1e-9 else min(dlat / coslat, 180.0)
+        idx = self._bbox_candidates(lng - dlng, lat - dlat, lng + dlng, lat + dlat)
+        idx = self._filter(idx, params or {})
+        dist = haversine(lat, lng, self.lats[idx], self.lngs[idx])
+        keep = dist <= radius
+        idx, dist = idx[keep], dist[keep]
+        order = np.lexsort((self.ids[idx], dist))
+        return self.ids[idx][order], dist[order]
+
+    def within_positions(self, polygons, params=None):
+        """
+        Posiciones (en los arrays del índice) de los puntos dentro de alguno
+        de los polígonos, cada uno como lista de anillos [[(lng, lat), ...], ...].
+        """
+        hits = []
+        for rings in polygons:
+            shell = np.asarray(rings[0], dtype=np.float64)
+            idx = self._bbox_candidates(shell[:, 0].min(), shell[:, 1].min(), shell[:, 0].max(), shell[:, 1].max())
+            idx = self._filter(idx, params or {})
+            inside = points_in_rings(self.lngs[idx], self.lats[idx], rings)
+            hits.append(idx[inside])
+        return np.unique(np.concatenate(hits)) if hits else np.empty(0, dtype=np.int64)
+
+    def within(self, polygons, params=None):
+        """Ids de Spot dentro de los polígonos, en el orden del listado (spot_id)."""
+        idx = self.within_positions(polygons, params)
+        return self.ids[idx][np.argsort(self.spot_ids[idx], kind="stable")]
+
+    def within_batch(self, geometries, params=None):
+        """spot_ids ordenados dentro de cada geometría, una lista por geometría."""
+        return [np.sort(self.spot_ids[self.within_positions(polygon_rings(g), params)]) for g in geometries]
+
+
+_index = None
+_built_at = 0.0
+_version = None
+_lock = threading.Lock()
+
+
+def enabled():
+    return getattr(settings, "SPOTS_MEMORY_INDEX", False)
+
+
+def supports(params):
+    active = {p for p in FILTER_PARAMS if params.get(p)}
+    return active <= SUPPORTED_FILTERS
+
+
+def _stale(ttl, version):
+    return _index is None or time.monotonic() - _built_at >= ttl or version != _version
+
+
+def get_index():
+    """
+    Índice del proceso; se reconstruye cuando cambia la versión del dataset
+    (también en otros procesos), tras la señal de carga o al vencer el TTL.
+    """
+    global _index, _built_at, _version
+    ttl = getattr(settings, "SPOTS_MEMORY_INDEX_TTL", 300)
+    version = dataset_version()
+    if not _stale(ttl, version):
+        return _index
+    with _lock:
+        if _stale(ttl, version):
+            _index = SpotMemoryIndex.build(cell_deg=getattr(settings, "SPOTS_MEMORY_INDEX_CELL_DEG", 0.05))
+            _built_at = time.monotonic()
+            _version = version
+    return _index
+
+
+@receiver(spots_loaded)
+def invalidate(**kwargs):
+    global _index
+    with _lock:
+        _index = None
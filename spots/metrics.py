@@ -0,0 +1,185 @@
+"""
+Métricas de SpotViewSet en el proceso, en formato de texto de Prometheus:
+latencia, cantidad y tiempo de consultas, tamaño de respuesta y HIT/MISS del
+cache por acción, más el estado de pools, sentencias preparadas y réplicas.
+
+Los contadores viven en memoria de cada proceso (cada worker de gunicorn
+expone los suyos). Las consultas se cuentan con un execute_wrapper que el
+backend instala en todas sus conexiones; el acumulador del request viaja en
+un contextvar, así también se cuentan las que corren en otros hilos (vistas
+async y vistas sync bajo ASGI).
+"""
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+from spots.db import pool, prepared, replicas
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+SIZE_BUCKETS = (1_000, 10_000, 100_000, 1_000_000, 10_000_000, 100_000_000)
+
+_current = contextvars.ContextVar("spots_request_queries", default=None)
+
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+
+def record_query(execute, sql, params, many, context):
+    """execute_wrapper que instala el backend en cada conexión; sin request en curso no mide nada."""
+    stats = _current.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - started
+
+
+@contextmanager
+def collecting():
+    """Acumulador nuevo para las consultas de este contexto (un request)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def _labels(names, values):
+    return ",".join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help, labels=()):
+        self.name = name
+        self.help = help
+        self.labelnames = labels
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            yield self.name, _labels(self.labelnames, labels), value
+
+
+class Histogram(Counter):
+    kind = "histogram"
+
+    def __init__(self, name, help, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *labels):
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][i] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def value(self, *labels):
+        """(suma, cantidad) de observaciones."""
+        with self._lock:
+            series = self._values.get(labels)
+            return (series[1], series[2]) if series else (0.0, 0)
+
+    def samples(self):
+        with self._lock:
+            items = sorted((labels, ([*counts], total, n)) for labels, (counts, total, n) in self._values.items())
+        for labels, (counts, total, n) in items:
+            base = _labels(self.labelnames, labels)
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f"{self.name}_bucket", f'{base}{sep}le="{bound}"', cumulative
+            yield f"{self.name}_bucket", f'{base}{sep}le="+Inf"', n
+            yield f"{self.name}_sum", base, total
+            yield f"{self.name}_count", base, n
+
+
+ACTION_LABELS = ("action", "method", "status")
+
+REQUESTS = Histogram("spots_request_duration_seconds", "Latencia de SpotViewSet por acción", ACTION_LABELS)
+QUERIES = Histogram(
+    "spots_request_db_queries", "Consultas SQL por request", ACTION_LABELS, buckets=QUERY_BUCKETS
+)
+DB_TIME = Histogram("spots_request_db_seconds", "Tiempo en la base por request", ACTION_LABELS)
+RESPONSE_SIZE = Histogram(
+    "spots_response_size_bytes", "Tamaño del cuerpo de la respuesta", ("action",), buckets=SIZE_BUCKETS
+)
+CACHE = Counter("spots_response_cache_total", "Respuestas por resultado del cache (HIT/MISS)", ("action", "result"))
+OVER_BUDGET = Counter(
+    "spots_request_over_budget_total", "Requests sobre el presupuesto de consultas o tiempo", ("action", "budget")
+)
+
+REGISTRY = (REQUESTS, QUERIES, DB_TIME, RESPONSE_SIZE, CACHE, OVER_BUDGET)
+
+
+POOL_COUNTERS = ("connects", "acquired", "waits", "timeouts", "discarded")
+
+
+def _db_samples():
+    """(nombre, tipo, labels, valor) del estado de pools, sentencias preparadas y réplicas."""
+    for stats in pool.pool_stats():
+        alias = f'alias="{stats.pop("alias")}"'
+        for key, value in stats.items():
+            if key in POOL_COUNTERS:
+                yield f"spots_db_pool_{key}_total", "counter", alias, value
+            elif key == "wait_seconds_total":
+                yield "spots_db_pool_wait_seconds_total", "counter", alias, value
+            else:
+                yield f"spots_db_pool_{key}", "gauge", alias, value
+    for event, value in prepared.stats().items():
+        yield "spots_db_prepared_statements_total", "counter", f'event="{event}"', value
+    for stats in replicas.replica_stats():
+        alias = f'alias="{stats["alias"]}"'
+        yield "spots_db_replica_healthy", "gauge", alias, int(bool(stats["healthy"]))
+        if stats["lag_seconds"] is not None:
+            yield "spots_db_replica_lag_seconds", "gauge", alias, stats["lag_seconds"]
+
+
+def _line(name, labels, value):
+    return f"{name}{{{labels}}} {value}" if labels else f"{name} {value}"
+
+
+def render():
+    """Todas las métricas en el formato de texto de Prometheus (0.0.4)."""
+    lines = []
+    for metric in REGISTRY:
+        lines.append(f"# HELP {metric.name} {metric.help}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(_line(*sample) for sample in metric.samples())
+    seen = set()
+    for name, kind, labels, value in sorted(_db_samples(), key=lambda sample: sample[0]):
+        if name not in seen:
+            seen.add(name)
+            lines.append(f"# TYPE {name} {kind}")
+        lines.append(_line(name, labels, value))
+    return "\n".join(lines) + "\n"
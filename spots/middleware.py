@@ -0,0 +1,100 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from spots import metrics
+
+logger = logging.getLogger(__name__)
+
+
+def spot_action(request):
+    """Nombre de la acción de SpotViewSet que atendió el request, o None si fue otra vista."""
+    from spots.api.views import SpotViewSet
+
+    match = getattr(request, "resolver_match", None)
+    func = getattr(match, "func", None)
+    cls = getattr(func, "cls", None)
+    if not (isinstance(cls, type) and issubclass(cls, SpotViewSet)):
+        return None
+    return (getattr(func, "actions", None) or {}).get(request.method.lower())
+
+
+class MetricsMiddleware:
+    """
+    Latencia, consultas, tiempo en la base, tamaño de respuesta y HIT/MISS
+    del cache de cada acción de SpotViewSet (ver spots/metrics.py). Avisa por
+    log cuando un request pasa SPOTS_METRICS_QUERY_BUDGET consultas o
+    SPOTS_METRICS_TIME_BUDGET_MS milisegundos. Sirve bajo WSGI y ASGI.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SPOTS_METRICS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        started = time.perf_counter()
+        with metrics.collecting() as queries:
+            response = self.get_response(request)
+        self.observe(request, response, queries, time.perf_counter() - started)
+        return response
+
+    async def __acall__(self, request):
+        started = time.perf_counter()
+        with metrics.collecting() as queries:
+            response = await self.get_response(request)
+        self.observe(request, response, queries, time.perf_counter() - started)
+        return response
+
+    def observe(self, request, response, queries, elapsed):
+        action = spot_action(request)
+        if action is None:
+            return
+        labels = (action, request.method, response.status_code)
+        metrics.REQUESTS.observe(elapsed, *labels)
+        metrics.QUERIES.observe(queries.count, *labels)
+        metrics.DB_TIME.observe(queries.seconds, *labels)
+
+        result = response.get("X-Cache")
+        if result:
+            metrics.CACHE.inc(action, result)
+
+        if not response.streaming:
+            metrics.RESPONSE_SIZE.observe(len(response.content), action)
+        elif not response.is_async:
+            response.streaming_content = self.measured(response.streaming_content, action)
+
+        over = [
+            budget for budget, exceeded in (
+                ("queries", queries.count > getattr(settings, "SPOTS_METRICS_QUERY_BUDGET", 20)),
+                ("time", elapsed * 1000 > getattr(settings, "SPOTS_METRICS_TIME_BUDGET_MS", 1000)),
+            ) if exceeded
+        ]
+        for budget in over:
+            metrics.OVER_BUDGET.inc(action, budget)
+        if over:
+            logger.warning(
+                "%s %s (%s) sobre el presupuesto: %d consultas, %.0f ms en la base, %.0f ms en total",
+                request.method, request.get_full_path(), action, queries.count,
+                queries.seconds * 1000, elapsed * 1000,
+            )
+
+    @staticmethod
+    def measured(chunks, action):
+        """Las exportaciones se miden al terminar de enviarse."""
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            yield chunk
+        metrics.RESPONSE_SIZE.observe(size, action)
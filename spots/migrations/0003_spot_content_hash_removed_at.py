@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-18 14:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0002_alter_spot_spot_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spot',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='spot',
+            name='removed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-18 15:10
+
+import django.contrib.gis.db.models.fields
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0003_spot_content_hash_removed_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='spot',
+            name='spot_point_idx',
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=django.contrib.postgres.indexes.GistIndex(django.db.models.functions.comparison.Cast('location', django.contrib.gis.db.models.fields.PointField(geography=True, srid=4326)), name='spot_location_geog_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0004_spot_location_geog_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpotPriceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sector_id', models.IntegerField(blank=True, null=True)),
+                ('type_id', models.IntegerField(blank=True, null=True)),
+                ('price_count', models.BigIntegerField()),
+                ('price_sum', models.DecimalField(decimal_places=2, max_digits=24)),
+                ('municipality', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='spots.municipality')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['sector_id', 'type_id'], name='rollup_sector_type_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0005_spotpricerollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DatasetVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+                ('token', models.CharField(blank=True, max_length=32)),
+                ('loaded_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.0.6 on 2026-10-18 19:20
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+BACKFILL = """
+    UPDATE spots_spot s
+    SET municipality_id = m.id, state_id = m.state_id
+    FROM spots_settlement se
+    JOIN spots_municipality m ON m.id = se.municipality_id
+    WHERE se.id = s.settlement_id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0006_datasetversion'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='spot',
+            name='municipality',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='spots', to='spots.municipality'),
+        ),
+        migrations.AddField(
+            model_name='spot',
+            name='state',
+            field=models.ForeignKey(blank=True, db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='spots', to='spots.state'),
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(fields=['municipality'], name='spot_municipality_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(fields=['state'], name='spot_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='state',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='state_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='municipality',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='municipality_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='region',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='region_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='corridor',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='corridor_name_lower_idx'),
+        ),
+    ]
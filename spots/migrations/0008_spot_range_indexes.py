@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0007_spot_municipality_state'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_rent_mxn__isnull', False), ('removed_at__isnull', True)), fields=['-price_total_rent_mxn', 'spot_id'], name='spot_top_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_rent_mxn__isnull', False), ('removed_at__isnull', True)), fields=['sector_id', '-price_total_rent_mxn'], name='spot_sector_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_sale_mxn__isnull', False), ('removed_at__isnull', True)), fields=['sector_id', 'price_total_sale_mxn'], name='spot_sector_sale_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('area_sqm__isnull', False), ('removed_at__isnull', True)), fields=['sector_id', 'area_sqm'], name='spot_sector_area_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('removed_at__isnull', True)), fields=['created_date'], name='spot_created_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-18 20:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0008_spot_range_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='spot',
+            name='spot_sector_rent_idx',
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_rent_mxn__isnull', False), ('removed_at__isnull', True)), fields=['sector_id', '-price_total_rent_mxn', 'spot_id'], name='spot_sector_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_rent_mxn__isnull', False), ('removed_at__isnull', True)), fields=['municipality', '-price_total_rent_mxn', 'spot_id'], name='spot_municipality_rent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='spot',
+            index=models.Index(condition=models.Q(('price_total_rent_mxn__isnull', False), ('removed_at__isnull', True)), fields=['region', '-price_total_rent_mxn', 'spot_id'], name='spot_region_rent_idx'),
+        ),
+    ]
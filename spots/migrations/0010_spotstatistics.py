@@ -0,0 +1,21 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0009_spot_top_rent_group_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpotStatistics',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_by', models.CharField(blank=True, max_length=20, unique=True)),
+                ('data', models.JSONField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.0.6 on 2026-10-18 21:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spots', '0010_spotstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SpotGridCell',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('level', models.SmallIntegerField()),
+                ('cx', models.IntegerField()),
+                ('cy', models.IntegerField()),
+                ('sector_id', models.IntegerField(blank=True, null=True)),
+                ('type_id', models.IntegerField(blank=True, null=True)),
+                ('spot_count', models.IntegerField()),
+                ('sum_x', models.FloatField()),
+                ('sum_y', models.FloatField()),
+                ('price_count', models.IntegerField()),
+                ('price_sum', models.DecimalField(blank=True, decimal_places=2, max_digits=24, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['level', 'cx', 'cy'], name='grid_level_cell_idx')],
+            },
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.contrib.gis.db import models
-
+from django.contrib.postgres.indexes import GistIndex
+from django.db.models.functions import Cast, Lower
 
 
 class State(models.Model):
@@ -7,6 +8,7 @@ class State(models.Model):
     geom = models.MultiPolygonField(srid=4326, null=True, blank=True)
 
     class Meta:
+        indexes = [models.Index(Lower("name"), name="state_name_lower_idx")]
         ordering = ["name"]
 
     def __str__(self) -> str:
@@ -20,7 +22,10 @@ class Municipality(models.Model):
 
     class Meta:
         unique_together = [("name", "state")]
-        indexes = [models.Index(fields=["name"], name="municipality_name_idx")]
+        indexes = [
+            models.Index(fields=["name"], name="municipality_name_idx"),
+            models.Index(Lower("name"), name="municipality_name_lower_idx"),
+        ]
         ordering = ["state__name", "name"]
 
     def __str__(self) -> str:
@@ -46,6 +51,7 @@ class Region(models.Model):
     geom = models.MultiPolygonField(srid=4326, null=True, blank=True)
 
     class Meta:
+        indexes = [models.Index(Lower("name"), name="region_name_lower_idx")]
         ordering = ["name"]
 
     def __str__(self) -> str:
@@ -56,6 +62,7 @@ class Corridor(models.Model):
     name = models.CharField(max_length=255, unique=True)
 
     class Meta:
+        indexes = [models.Index(Lower("name"), name="corridor_name_lower_idx")]
         ordering = ["name"]
 
     def __str__(self) -> str:
@@ -88,6 +95,11 @@ class Spot(models.Model):
     settlement = models.ForeignKey(Settlement, null=True, blank=True, on_delete=models.SET_NULL, related_name="spots")
     region = models.ForeignKey(Region, null=True, blank=True, on_delete=models.SET_NULL, related_name="spots")
     corridor = models.ForeignKey(Corridor, null=True, blank=True, on_delete=models.SET_NULL, related_name="spots")
+    # Copias de settlement.municipality y su estado, para filtrar sin joins (ver save()).
+    municipality = models.ForeignKey(
+        Municipality, null=True, blank=True, on_delete=models.SET_NULL, related_name="spots", db_index=False
+    )
+    state = models.ForeignKey(State, null=True, blank=True, on_delete=models.SET_NULL, related_name="spots", db_index=False)
 
     address = models.CharField(max_length=512, blank=True)
 
@@ -105,13 +117,120 @@ class Spot(models.Model):
     user_id = models.CharField(max_length=64, blank=True)
     created_date = models.DateTimeField(null=True, blank=True)
 
+    content_hash = models.CharField(max_length=40, blank=True, default="")
+    removed_at = models.DateTimeField(null=True, blank=True)
+
     class Meta:
         indexes = [
-            models.Index(fields=["location"], name="spot_point_idx"),
+            GistIndex(Cast("location", models.PointField(geography=True, srid=4326)), name="spot_location_geog_idx"),
             models.Index(fields=["sector_id"], name="spot_sector_idx"),
             models.Index(fields=["type_id"], name="spot_type_idx"),
+            models.Index(fields=["municipality"], name="spot_municipality_idx"),
+            models.Index(fields=["state"], name="spot_state_idx"),
+            # Ranking top-rent (global y por grupo) y rangos de precio/área sobre spots activos.
+            models.Index(
+                fields=["-price_total_rent_mxn", "spot_id"], name="spot_top_rent_idx",
+                condition=models.Q(price_total_rent_mxn__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(
+                fields=["sector_id", "-price_total_rent_mxn", "spot_id"], name="spot_sector_rent_idx",
+                condition=models.Q(price_total_rent_mxn__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(
+                fields=["municipality", "-price_total_rent_mxn", "spot_id"], name="spot_municipality_rent_idx",
+                condition=models.Q(price_total_rent_mxn__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(
+                fields=["region", "-price_total_rent_mxn", "spot_id"], name="spot_region_rent_idx",
+                condition=models.Q(price_total_rent_mxn__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(
+                fields=["sector_id", "price_total_sale_mxn"], name="spot_sector_sale_idx",
+                condition=models.Q(price_total_sale_mxn__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(
+                fields=["sector_id", "area_sqm"], name="spot_sector_area_idx",
+                condition=models.Q(area_sqm__isnull=False, removed_at__isnull=True),
+            ),
+            models.Index(fields=["created_date"], name="spot_created_idx", condition=models.Q(removed_at__isnull=True)),
         ]
         ordering = ["spot_id"]
 
     def __str__(self) -> str:
         return f"{self.spot_id} - {self.title or ''}"
+
+    def save(self, *args, **kwargs):
+        settlement = self.settlement if self.settlement_id else None
+        self.municipality_id = settlement.municipality_id if settlement else None
+        self.state_id = settlement.municipality.state_id if settlement else None
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "settlement" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "municipality", "state"}
+        super().save(*args, **kwargs)
+
+
+class SpotPriceRollup(models.Model):
+    """
+    Suma y conteo de `price_total_rent_mxn` por (sector, tipo, municipio) de
+    los spots activos. Lo recalcula load_data al final de cada carga.
+    """
+
+    sector_id = models.IntegerField(null=True, blank=True)
+    type_id = models.IntegerField(null=True, blank=True)
+    municipality = models.ForeignKey(
+        Municipality, null=True, blank=True, on_delete=models.CASCADE, related_name="+"
+    )
+    price_count = models.BigIntegerField()
+    price_sum = models.DecimalField(max_digits=24, decimal_places=2)
+
+    class Meta:
+        indexes = [models.Index(fields=["sector_id", "type_id"], name="rollup_sector_type_idx")]
+
+
+class SpotGridCell(models.Model):
+    """
+    Conteo, suma de coordenadas y de precios de los spots activos por celda
+    de la grilla de cada zoom (ver spots/clusters.py) y por (sector, tipo).
+    Lo recalcula load_data al final de cada carga.
+    """
+
+    level = models.SmallIntegerField()
+    cx = models.IntegerField()
+    cy = models.IntegerField()
+    sector_id = models.IntegerField(null=True, blank=True)
+    type_id = models.IntegerField(null=True, blank=True)
+    spot_count = models.IntegerField()
+    sum_x = models.FloatField()
+    sum_y = models.FloatField()
+    price_count = models.IntegerField()
+    price_sum = models.DecimalField(max_digits=24, decimal_places=2, null=True, blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["level", "cx", "cy"], name="grid_level_cell_idx")]
+
+
+class SpotStatistics(models.Model):
+    """
+    Estadísticas de precios y áreas de los spots activos sin filtros, total
+    (`group_by` vacío) y por cada agrupación. Las recalcula load_data.
+    """
+
+    group_by = models.CharField(max_length=20, unique=True, blank=True)
+    data = models.JSONField()
+
+    def __str__(self) -> str:
+        return self.group_by or "total"
+
+
+class DatasetVersion(models.Model):
+    """
+    Fila única con la versión del dataset. load_data la incrementa en cada
+    carga; los caches de respuestas e índices en memoria la usan como clave.
+    """
+
+    version = models.BigIntegerField(default=0)
+    token = models.CharField(max_length=32, blank=True)
+    loaded_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self) -> str:
+        return f"v{self.version}"
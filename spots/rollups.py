@@ -0,0 +1,57 @@
+from django.db import connection
+from django.db.models import DecimalField, ExpressionWrapper, F, Sum
+
+from spots.api.filters import FILTER_PARAMS, filter_values, int_values, lookup_ids
+from spots.models import Municipality, Spot, SpotPriceRollup
+
+# Filtros de la lista que el rollup puede responder sin tocar spots_spot.
+ROLLUP_FILTERS = {"sector", "type", "municipality"}
+
+
+def refresh_price_rollups():
+    """Recalcula SpotPriceRollup desde spots_spot; devuelve la cantidad de grupos."""
+    table = SpotPriceRollup._meta.db_table
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} (sector_id, type_id, municipality_id, price_count, price_sum)
+            SELECT s.sector_id, s.type_id, s.municipality_id, count(*), sum(s.price_total_rent_mxn)
+            FROM {Spot._meta.db_table} s
+            WHERE s.removed_at IS NULL AND s.price_total_rent_mxn IS NOT NULL
+            GROUP BY s.sector_id, s.type_id, s.municipality_id
+        """)
+        return cursor.rowcount
+
+
+def covers(params):
+    active = {p for p in FILTER_PARAMS if params.get(p)}
+    return active <= ROLLUP_FILTERS
+
+
+def average_price_by_sector(params):
+    """
+    Filas (sector_id, promedio) desde el rollup, o None si el rollup no
+    cubre los filtros o todavía no se calculó. El promedio se combina como
+    sum(price_sum) / sum(price_count), igual que AVG sobre las filas.
+    """
+    if not covers(params) or not SpotPriceRollup.objects.exists():
+        return None
+
+    qs = SpotPriceRollup.objects.all()
+    sectors = int_values(params, "sector")
+    if sectors:
+        qs = qs.filter(sector_id__in=sectors)
+    types = int_values(params, "type")
+    if types:
+        qs = qs.filter(type_id__in=types)
+    municipalities = filter_values(params, "municipality")
+    if municipalities:
+        qs = qs.filter(municipality_id__in=lookup_ids(Municipality, municipalities))
+
+    return (
+        qs.values("sector_id")
+        .annotate(total=Sum("price_sum"), n=Sum("price_count"))
+        .annotate(average_price_total_rent_mxn=ExpressionWrapper(F("total") / F("n"), output_field=DecimalField()))
+        .values("sector_id", "average_price_total_rent_mxn")
+        .order_by("sector_id")
+    )
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Se envía cuando load_data confirma una carga; los índices y caches en
+# memoria del proceso se reconstruyen a partir de la nueva versión del dataset.
+spots_loaded = Signal()
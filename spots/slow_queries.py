@@ -0,0 +1,145 @@
+"""
+Captura de consultas lentas de SpotViewSet y load_data.
+
+Dentro de `tagged(...)` (SpotViewSet.dispatch y load_data) cada consulta que
+tarda SPOTS_SLOW_QUERY_MS o más se guarda con su SQL, sus parámetros y las
+etiquetas de quien la hizo (acción, filtros, opciones de la carga). Una
+fracción SPOTS_SLOW_QUERY_EXPLAIN_RATE de ellas se vuelve a correr en la misma
+conexión con EXPLAIN (ANALYZE, BUFFERS) para guardar el plan real; las que no
+son SELECT sólo se explican, sin ejecutarlas de nuevo.
+
+Las entradas van a un buffer circular de SPOTS_SLOW_QUERY_BUFFER posiciones en
+el cache SPOTS_SLOW_QUERY_CACHE_ALIAS (por defecto "profiling", en archivos
+bajo data/profiling, visible para todos los procesos del mismo host). Se leen
+en GET /api/admin/slow-queries/ o con `python manage.py slow_queries`.
+
+El número de cada entrada sale de cache.incr, que en FileBasedCache no es
+atómico (lee y después escribe): dos workers que capturan a la vez pueden
+quedarse con el mismo número y uno pisa la entrada del otro. Sirve para
+desarrollo y un solo host; en producción conviene apuntar el cache
+"profiling" a Redis o Memcached, donde incr es atómico.
+"""
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from psycopg2 import Error as PsycopgError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "spots:slow-queries"
+MAX_SQL_CHARS = 20_000
+
+_tags = contextvars.ContextVar("spots_slow_query_tags", default=None)
+
+
+@contextmanager
+def tagged(**tags):
+    """Las consultas lentas de este contexto se guardan con estas etiquetas."""
+    token = _tags.set(tags)
+    try:
+        yield tags
+    finally:
+        _tags.reset(token)
+
+
+def capture_slow(execute, sql, params, many, context):
+    """execute_wrapper que instala el backend; fuera de `tagged()` no mide nada."""
+    tags = _tags.get()
+    if tags is None or many or not getattr(settings, "SPOTS_SLOW_QUERIES", True):
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    result = execute(sql, params, many, context)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if elapsed_ms >= getattr(settings, "SPOTS_SLOW_QUERY_MS", 250):
+        try:
+            record(context["connection"], sql, params, elapsed_ms, tags)
+        except Exception:
+            # Perder una captura no puede romper el request ni la carga.
+            logger.exception("No se pudo guardar la consulta lenta (%.0f ms)", elapsed_ms)
+    return result
+
+
+def _param(value):
+    return value if value is None or isinstance(value, (bool, int, float, str)) else str(value)
+
+
+def record(connection, sql, params, elapsed_ms, tags):
+    # Cursores de psycopg2 directamente: no vuelven a pasar por los execute_wrappers.
+    raw = connection.connection
+    with raw.cursor() as cursor:
+        query = cursor.mogrify(sql, params).decode()
+    plan = None
+    if random.random() < getattr(settings, "SPOTS_SLOW_QUERY_EXPLAIN_RATE", 0.1):
+        plan = explain(raw, sql, params)
+    push({
+        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "alias": connection.alias,
+        "duration_ms": round(elapsed_ms, 2),
+        **tags,
+        "sql": sql[:MAX_SQL_CHARS],
+        "params": [_param(p) for p in params or ()],
+        "query": query[:MAX_SQL_CHARS],
+        "plan": plan,
+    })
+
+
+def explain(raw, sql, params):
+    """Plan de la consulta; EXPLAIN ANALYZE sólo para SELECT, que se pueden repetir sin efectos."""
+    analyze = sql.lstrip()[:6].upper() == "SELECT"
+    options = "ANALYZE, BUFFERS, FORMAT TEXT" if analyze else "FORMAT TEXT"
+    # En una transacción un EXPLAIN fallido la abortaría: se aísla con un savepoint.
+    in_transaction = raw.info.transaction_status != TRANSACTION_STATUS_IDLE
+    with raw.cursor() as cursor:
+        try:
+            if in_transaction:
+                cursor.execute("SAVEPOINT spots_explain")
+            cursor.execute(f"EXPLAIN ({options}) {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+            if in_transaction:
+                cursor.execute("RELEASE SAVEPOINT spots_explain")
+        except PsycopgError as exc:
+            if in_transaction:
+                cursor.execute("ROLLBACK TO SAVEPOINT spots_explain")
+            return f"EXPLAIN falló: {exc}".strip()
+    return plan
+
+
+def _cache():
+    return caches[getattr(settings, "SPOTS_SLOW_QUERY_CACHE_ALIAS", "profiling")]
+
+
+def _size():
+    return max(1, getattr(settings, "SPOTS_SLOW_QUERY_BUFFER", 100))
+
+
+def push(entry):
+    """
+    Guarda la entrada en la próxima posición del buffer, pisando la más vieja.
+    Sólo con un incr atómico (Redis, Memcached) no se pierden entradas concurrentes.
+    """
+    cache = _cache()
+    cache.add(f"{KEY_PREFIX}:seq", 0, timeout=None)
+    seq = cache.incr(f"{KEY_PREFIX}:seq")
+    cache.set(f"{KEY_PREFIX}:{seq % _size()}", {"seq": seq, **entry}, timeout=None)
+    return seq
+
+
+def entries(limit=None, action=None):
+    """Las consultas del buffer, de la más reciente a la más vieja."""
+    slots = _cache().get_many([f"{KEY_PREFIX}:{i}" for i in range(_size())])
+    found = sorted(slots.values(), key=lambda entry: entry["seq"], reverse=True)
+    if action:
+        found = [entry for entry in found if entry.get("action") == action]
+    return found[:limit] if limit else found
+
+
+def clear():
+    cache = _cache()
+    cache.delete_many([f"{KEY_PREFIX}:seq", *(f"{KEY_PREFIX}:{i}" for i in range(_size()))])
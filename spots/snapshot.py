@@ -0,0 +1,174 @@
+"""
+Snapshot columnar (Parquet o Arrow IPC) de los spots activos.
+
+Los nombres de entidades van como columnas de diccionario con un único
+diccionario global por columna (el mismo en todos los row groups / record
+batches), así el archivo Arrow se puede mapear en memoria y concatenar sin
+unificar diccionarios.
+"""
+import os
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.conf import settings
+from django.db.models import F, FloatField, Func
+
+from spots.cache import dataset_version
+from spots.models import Corridor, Municipality, Region, Settlement, Spot, State
+
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow"}
+
+DECIMAL = pa.decimal128(14, 2)
+NAME = pa.dictionary(pa.int32(), pa.string())
+
+SCHEMA = pa.schema([
+    ("spot_id", pa.int64()),
+    ("title", pa.string()),
+    ("address", pa.string()),
+    ("sector_id", pa.int16()),
+    ("type_id", pa.int16()),
+    ("modality", pa.dictionary(pa.int8(), pa.string())),
+    ("lat", pa.float64()),
+    ("lng", pa.float64()),
+    ("area_sqm", DECIMAL),
+    ("price_sqm_rent_mxn", DECIMAL),
+    ("price_total_rent_mxn", DECIMAL),
+    ("price_sqm_sale_mxn", DECIMAL),
+    ("price_total_sale_mxn", DECIMAL),
+    ("maintenance_cost_mxn", DECIMAL),
+    ("state", NAME),
+    ("municipality", NAME),
+    ("settlement", NAME),
+    ("region", NAME),
+    ("corridor", NAME),
+    ("created_date", pa.timestamp("us", tz="UTC")),
+])
+
+# Columna de diccionario -> (modelo, id en values_list).
+LOOKUPS = {
+    "state": (State, "state_id"),
+    "municipality": (Municipality, "municipality_id"),
+    "settlement": (Settlement, "settlement_id"),
+    "region": (Region, "region_id"),
+    "corridor": (Corridor, "corridor_id"),
+}
+
+# Columna del esquema -> expresión en values_list (si difiere).
+SOURCES = {"lat": "y", "lng": "x", **{name: column for name, (_, column) in LOOKUPS.items()}}
+
+
+class Dictionary:
+    """Nombres únicos ordenados de una tabla y el índice de cada id en ellos."""
+
+    def __init__(self, model):
+        rows = list(model.objects.values_list("id", "name"))
+        unique = sorted({name for _, name in rows})
+        position = {name: i for i, name in enumerate(unique)}
+        self.values = pa.array(unique, type=pa.string())
+        self.index = {pk: position[name] for pk, name in rows}
+
+    def encode(self, ids):
+        indices = pa.array([None if pk is None else self.index[pk] for pk in ids], type=pa.int32())
+        return pa.DictionaryArray.from_arrays(indices, self.values)
+
+
+MODALITIES = [value for value, _ in Spot.Modality.choices]
+_MODALITY_INDEX = {value: i for i, value in enumerate(MODALITIES)}
+
+
+def _modality(values):
+    indices = pa.array([_MODALITY_INDEX.get(v) for v in values], type=pa.int8())
+    return pa.DictionaryArray.from_arrays(indices, pa.array(MODALITIES, type=pa.string()))
+
+
+def record_batches(queryset=None, batch_size=100_000, metadata=None):
+    """RecordBatches de a `batch_size` spots, leídos con un cursor del lado del servidor."""
+    queryset = queryset if queryset is not None else Spot.objects.filter(removed_at__isnull=True)
+    dictionaries = {name: Dictionary(model) for name, (model, _) in LOOKUPS.items()}
+    schema = SCHEMA.with_metadata(metadata) if metadata else SCHEMA
+    rows = (
+        queryset.order_by("spot_id")
+        .annotate(
+            x=Func(F("location"), function="ST_X", output_field=FloatField()),
+            y=Func(F("location"), function="ST_Y", output_field=FloatField()),
+        )
+        .values_list(*(SOURCES.get(name, name) for name in SCHEMA.names))
+        .iterator(chunk_size=min(batch_size, 20_000))
+    )
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield _to_batch(batch, dictionaries, schema)
+            batch = []
+    if batch:
+        yield _to_batch(batch, dictionaries, schema)
+
+
+def _to_batch(rows, dictionaries, schema):
+    arrays = []
+    for field, values in zip(schema, zip(*rows)):
+        if field.name == "modality":
+            arrays.append(_modality(values))
+        elif field.name in dictionaries:
+            arrays.append(dictionaries[field.name].encode(values))
+        else:
+            arrays.append(pa.array(values, type=field.type))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def write_snapshot(path, fmt="parquet", row_group_size=100_000, queryset=None):
+    """
+    Escribe el snapshot en `path` de a un row group / record batch por vez;
+    la memoria queda acotada por `row_group_size`. Devuelve la cantidad de filas.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Formato desconocido: {fmt}")
+    schema = SCHEMA.with_metadata({"dataset_version": dataset_version() or ""})
+    if fmt == "parquet":
+        writer = pq.ParquetWriter(str(path), schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+    total = 0
+    with writer:
+        for batch in record_batches(queryset, row_group_size, schema.metadata):
+            if fmt == "parquet":
+                writer.write_batch(batch, row_group_size=row_group_size)
+            else:
+                writer.write_batch(batch)
+            total += batch.num_rows
+    return total
+
+
+def snapshot_dir():
+    return Path(settings.SPOTS_SNAPSHOT_DIR)
+
+
+def current_snapshot(fmt):
+    """
+    Archivo del snapshot para la versión actual del dataset; se genera la
+    primera vez que se pide y se reemplaza de forma atómica. None si nunca se
+    corrió load_data: sin versión no hay con qué identificar el archivo.
+    """
+    version = dataset_version()
+    if version is None:
+        return None
+    directory = snapshot_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"spots-{version}{FORMATS[fmt]}"
+    if not path.exists():
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=FORMATS[fmt])
+        os.close(fd)
+        try:
+            write_snapshot(tmp, fmt)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        for old in directory.glob(f"spots-*{FORMATS[fmt]}"):
+            if old != path:
+                old.unlink(missing_ok=True)
+    return path
@@ -0,0 +1,130 @@
+"""
+Estadísticas de distribución (conteo, mínimo, máximo, media, percentiles e
+histograma) de precios y áreas, opcionalmente por grupo, en una sola
+consulta sobre spots_spot.
+"""
+from django.db import connections
+
+from spots.api.filters import FILTER_PARAMS
+from spots.models import Municipality, Region, Spot, SpotStatistics
+
+METRICS = ("price_total_rent_mxn", "price_sqm_rent_mxn", "area_sqm")
+PERCENTILES = (0.25, 0.5, 0.75, 0.9)
+GROUPS = {"sector": "sector_id", "type": "type_id", "municipality": "municipality_id", "region": "region_id"}
+DEFAULT_BUCKETS = 10
+MAX_BUCKETS = 50
+
+
+def group_labels(group_by, keys):
+    """Etiqueta de cada clave de grupo: choices para sector/tipo, nombre para municipio/región."""
+    if group_by == "sector":
+        return dict(Spot.Sector.choices)
+    if group_by == "type":
+        return dict(Spot.Type.choices)
+    model = Municipality if group_by == "municipality" else Region
+    return dict(model.objects.filter(pk__in=[k for k in keys if k is not None]).values_list("id", "name"))
+
+
+def _sql(inner_sql, column, buckets):
+    """
+    WITH materializado sobre el queryset (la única lectura de spots_spot),
+    agregados por grupo con percentile_cont y un histograma width_bucket por
+    métrica entre el mínimo y el máximo del grupo.
+    """
+    group = f"t.{column}" if column else "NULL::integer"
+    metrics = ", ".join(f"t.{metric} AS m{i}" for i, metric in enumerate(METRICS))
+    percentiles = ", ".join(map(str, PERCENTILES))
+    aggregates = ["count(*) AS n"]
+    histograms = []
+    selects = []
+    for i in range(len(METRICS)):
+        aggregates += [
+            f"count(m{i}) AS n{i}", f"min(m{i}) AS lo{i}", f"max(m{i}) AS hi{i}", f"avg(m{i}) AS mean{i}",
+            f"percentile_cont(ARRAY[{percentiles}]::float8[]) WITHIN GROUP (ORDER BY m{i}::float8) AS p{i}",
+        ]
+        histograms.append(f"""
+            h{i} AS (
+                SELECT s.g, CASE WHEN a.hi{i} = a.lo{i} THEN 1
+                    ELSE least(width_bucket(s.m{i}, a.lo{i}, a.hi{i}, {buckets}), {buckets}) END AS b,
+                    count(*) AS c
+                FROM s JOIN agg a ON a.g IS NOT DISTINCT FROM s.g
+                WHERE s.m{i} IS NOT NULL
+                GROUP BY 1, 2
+            )""")
+        selects.append(f"(SELECT json_object_agg(h.b, h.c) FROM h{i} h WHERE h.g IS NOT DISTINCT FROM a.g) AS h{i}")
+    return f"""
+        WITH s AS MATERIALIZED (SELECT {group} AS g, {metrics} FROM ({inner_sql}) t),
+        agg AS (SELECT g, {", ".join(aggregates)} FROM s GROUP BY g),
+        {",".join(histograms)}
+        SELECT a.*, {", ".join(selects)}
+        FROM agg a
+        ORDER BY a.g NULLS LAST
+    """
+
+
+def _number(value):
+    return None if value is None else float(value)
+
+
+def _histogram(lo, hi, counts, buckets):
+    if lo is None:
+        return []
+    counts = {int(k): v for k, v in (counts or {}).items()}
+    if lo == hi:
+        return [{"lower": float(lo), "upper": float(hi), "count": counts.get(1, 0)}]
+    width = (hi - lo) / buckets
+    return [
+        {
+            "lower": float(lo + width * (b - 1)),
+            "upper": float(hi if b == buckets else lo + width * b),
+            "count": counts.get(b, 0),
+        }
+        for b in range(1, buckets + 1)
+    ]
+
+
+def compute(queryset, group_by=None, buckets=DEFAULT_BUCKETS):
+    """Estadísticas de METRICS sobre `queryset`, por `group_by` (una clave de GROUPS) o en total."""
+    column = GROUPS[group_by] if group_by else None
+    inner = queryset.order_by().values(*((column,) if column else ()), *METRICS)
+    sql, params = inner.query.sql_with_params()
+    with connections[queryset.db].cursor() as cursor:
+        cursor.execute(_sql(sql, column, int(buckets)), params)
+        names = [col.name for col in cursor.description]
+        rows = [dict(zip(names, row)) for row in cursor.fetchall()]
+
+    labels = group_labels(group_by, [row["g"] for row in rows]) if group_by else {}
+    groups = []
+    for row in rows:
+        group = {"key": row["g"], "label": labels.get(row["g"]), "count": row["n"]}
+        for i, metric in enumerate(METRICS):
+            percentiles = row[f"p{i}"] or [None] * len(PERCENTILES)
+            group[metric] = {
+                "count": row[f"n{i}"],
+                "min": _number(row[f"lo{i}"]),
+                "max": _number(row[f"hi{i}"]),
+                "mean": _number(row[f"mean{i}"]),
+                **{f"p{round(q * 100)}": _number(v) for q, v in zip(PERCENTILES, percentiles)},
+                "histogram": _histogram(row[f"lo{i}"], row[f"hi{i}"], row[f"h{i}"], buckets),
+            }
+        groups.append(group)
+    return {"group_by": group_by, "buckets": buckets, "groups": groups}
+
+
+def refresh_statistics():
+    """Precalcula las estadísticas sin filtros (total y por cada grupo); devuelve cuántas guardó."""
+    active = Spot.objects.filter(removed_at__isnull=True)
+    SpotStatistics.objects.all().delete()
+    rows = SpotStatistics.objects.bulk_create([
+        SpotStatistics(group_by=group_by or "", data=compute(active, group_by))
+        for group_by in (None, *GROUPS)
+    ])
+    return len(rows)
+
+
+def precomputed(params, group_by, buckets):
+    """Las estadísticas guardadas por refresh_statistics si aplican (sin filtros, buckets por defecto), o None."""
+    if buckets != DEFAULT_BUCKETS or any(params.get(p) for p in FILTER_PARAMS):
+        return None
+    row = SpotStatistics.objects.filter(group_by=group_by or "").first()
+    return row.data if row else None
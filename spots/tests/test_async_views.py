@@ -0,0 +1,87 @@
+from asgiref.sync import async_to_sync
+from django.contrib.gis.geos import Point
+from django.test import TransactionTestCase
+
+from spots.cache import bump_dataset_version, forget_dataset_version
+from spots.models import Spot
+
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [[[-99.25, 19.35], [-99.25, 19.41], [-99.18, 19.41], [-99.18, 19.35], [-99.25, 19.35]]],
+}
+
+
+class AsyncViewsTests(TransactionTestCase):
+    """
+    Las vistas async corren en hilos del pool con su propia conexión, así que
+    los datos tienen que estar commiteados (TransactionTestCase). Los tests
+    son sync para poder comparar con self.client en el mismo método.
+    """
+
+    def setUp(self):
+        self.addCleanup(forget_dataset_version)
+        for spot_id, sector, lng, lat, rent in (
+            (25501, 9, -99.21, 19.37, "35000.00"),
+            (25502, 12, -99.22, 19.39, "52000.00"),
+            (25503, 9, -99.14, 19.33, None),
+        ):
+            Spot.objects.create(
+                spot_id=spot_id, title=f"Spot {spot_id}", location=Point(lng, lat, srid=4326),
+                sector_id=sector, type_id=1, modality="rent", price_total_rent_mxn=rent,
+            )
+
+    def assert_same(self, url, **kwargs):
+        method = "post" if "data" in kwargs else "get"
+        if method == "post":
+            kwargs["content_type"] = "application/json"
+        sync = getattr(self.client, method)(f"/api/spots/{url}", **kwargs)
+        r = async_to_sync(getattr(self.async_client, method))(f"/api/async/spots/{url}", **kwargs)
+        assert r.status_code == sync.status_code
+        assert r["Content-Type"] == sync["Content-Type"]
+        assert r.content == sync.content
+        return r
+
+    def test_read_endpoints_match_sync(self):
+        for url in (
+            "",
+            "?sector=9",
+            "25502/",
+            "nearby/?lat=19.37&lng=-99.21&radius=5000",
+            "average-price-by-sector/",
+            "top-rent/?limit=2",
+            "price-statistics/?group_by=sector",
+            "clusters/?bbox=-99.5,19.2,-98.9,19.6&zoom=8",
+            "tiles/10/229/455.mvt",
+        ):
+            r = self.assert_same(url)
+            assert r.status_code == 200, url
+
+    def test_within_post(self):
+        r = self.assert_same("within/", data={"polygon": POLYGON})
+        assert {x["spot_id"] for x in r.json()["results"]} == {25501, 25502}
+
+    def test_errors(self):
+        assert self.assert_same("99999/").status_code == 404
+        assert self.assert_same("nearby/?lat=19.37").status_code == 400
+        assert self.assert_same("tiles/2/4/0.mvt").status_code == 404
+
+    def test_response_cache_is_per_route(self):
+        bump_dataset_version()
+        assert self.client.get("/api/spots/top-rent/")["X-Cache"] == "MISS"
+        assert async_to_sync(self.async_client.get)("/api/async/spots/top-rent/")["X-Cache"] == "MISS"
+        assert async_to_sync(self.async_client.get)("/api/async/spots/top-rent/")["X-Cache"] == "HIT"
+
+    def test_pagination_links_stay_on_their_route(self):
+        bump_dataset_version()
+        for query in ("?page_size=2", "?page_size=2&pagination=keyset"):
+            for prefix in ("/api/spots/", "/api/async/spots/", "/api/spots/"):
+                with self.subTest(prefix=prefix, query=query):
+                    get = self.client.get if prefix == "/api/spots/" else async_to_sync(self.async_client.get)
+                    ids = []
+                    url = f"{prefix}{query}"
+                    while url:
+                        data = get(url).json()
+                        ids += [x["spot_id"] for x in data["results"]]
+                        url = data["next"]
+                        assert url is None or url.startswith(f"http://testserver{prefix}?")
+                    assert ids == [25501, 25502, 25503]
@@ -0,0 +1,86 @@
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots.clusters import refresh_grid
+from spots.models import Municipality, Settlement, Spot, SpotGridCell, State
+
+CDMX = "-99.5,19.2,-98.9,19.6"
+
+
+class ClusterTests(APITestCase):
+    def setUp(self):
+        st = State.objects.create(name="Ciudad de México")
+        setl = Settlement.objects.create(
+            name="Col. A", municipality=Municipality.objects.create(name="Álvaro Obregón", state=st)
+        )
+        for spot_id, sector, type_, lng, lat, price, settlement in (
+            (25501, 9, 1, -99.21, 19.37, 1000, setl),
+            (25502, 12, 1, -99.22, 19.39, 3000, setl),
+            (25503, 9, 2, -99.14, 19.33, None, None),
+            (25504, 9, 1, -99.05, 19.30, 2000, None),
+            (25505, 11, 1, -103.35, 20.67, 5000, None),
+        ):
+            Spot.objects.create(
+                spot_id=spot_id, title=str(spot_id), sector_id=sector, type_id=type_, modality="rent",
+                location=Point(lng, lat, srid=4326), price_total_rent_mxn=price, settlement=settlement,
+            )
+        Spot.objects.create(
+            spot_id=25506, title="Baja", sector_id=9, type_id=1, modality="rent",
+            location=Point(-99.2, 19.4, srid=4326), removed_at="2026-01-01T00:00:00Z",
+        )
+
+    def clusters(self, query):
+        r = self.client.get(f"/api/spots/clusters/?{query}")
+        assert r.status_code == 200, r.content
+        return r.json()
+
+    def test_cells_by_zoom(self):
+        data = self.clusters(f"bbox={CDMX}&zoom=8")
+        assert data["zoom"] == 8 and data["cell"] == 0.3515625
+        assert data["cells"] == [
+            {"cx": -282, "cy": 54, "count": 2, "lng": -99.095, "lat": 19.315, "avg_price_total_rent_mxn": 2000.0},
+            {"cx": -283, "cy": 55, "count": 2, "lng": -99.215, "lat": 19.38, "avg_price_total_rent_mxn": 2000.0},
+        ]
+
+        [cell] = self.clusters(f"bbox={CDMX}&zoom=6")["cells"]
+        assert (cell["cx"], cell["cy"], cell["count"]) == (-71, 13, 4)
+
+    def test_bbox_returns_whole_cells(self):
+        cells = self.clusters("bbox=-99.06,19.29,-99.04,19.31&zoom=8")["cells"]
+        assert [(c["cx"], c["cy"], c["count"]) for c in cells] == [(-282, 54, 2)]
+
+    def test_honors_filters(self):
+        cells = self.clusters(f"bbox={CDMX}&zoom=8&sector=9")["cells"]
+        assert [c["count"] for c in cells] == [2, 1]
+        cells = self.clusters(f"bbox={CDMX}&cell=1&municipality=álvaro obregón")["cells"]
+        assert [(c["cx"], c["cy"], c["count"]) for c in cells] == [(-100, 19, 2)]
+
+    def test_grid_matches_live_query(self):
+        queries = [
+            f"bbox={CDMX}&zoom=8", f"bbox={CDMX}&zoom=6&sector=9", f"bbox={CDMX}&zoom=10&type=1&sector=9,12",
+            "bbox=-180,-90,180,90&zoom=0", "bbox=-104,20,-103,21&zoom=10",
+        ]
+        live = {q: self.clusters(q) for q in queries}
+        with override_settings(SPOTS_GRID_MAX_ZOOM=10):
+            assert refresh_grid() == SpotGridCell.objects.count() > 0
+            for q in queries:
+                with self.subTest(query=q):
+                    assert self.clusters(q) == live[q]
+
+            Spot.objects.filter(spot_id=25504).update(price_total_rent_mxn=8000)
+            grid = self.clusters(f"bbox={CDMX}&zoom=8")["cells"][0]
+            assert grid["avg_price_total_rent_mxn"] == 2000.0
+            filtered = self.clusters(f"bbox={CDMX}&zoom=8&modality=rent")["cells"][0]
+            assert filtered["avg_price_total_rent_mxn"] == 8000.0
+
+    @override_settings(SPOTS_GRID_MAX_ZOOM=4)
+    def test_zoom_beyond_grid_is_live(self):
+        refresh_grid()
+        assert not SpotGridCell.objects.filter(level=8).exists()
+        assert len(self.clusters(f"bbox={CDMX}&zoom=8")["cells"]) == 2
+
+    def test_invalid_params(self):
+        for query in ("zoom=8", f"bbox={CDMX}", f"bbox={CDMX}&zoom=8&cell=0.1", "bbox=1,2,3&zoom=1", "bbox=5,0,1,1&zoom=1"):
+            with self.subTest(query=query):
+                assert self.client.get(f"/api/spots/clusters/?{query}").status_code == 400
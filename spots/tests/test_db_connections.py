@@ -0,0 +1,141 @@
+import threading
+
+import psycopg2
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from rest_framework.test import APITestCase
+
+from spots.db.pool import ConnectionPool, PoolTimeout
+from spots.db import prepared
+from spots.db.prepared import PreparingConnection, PreparingCursor, numbered, prepared_statements
+from spots.models import Spot
+
+
+class FakeInfo:
+    transaction_status = TRANSACTION_STATUS_IDLE
+
+
+class FakeConnection:
+    info = FakeInfo()
+
+    def __init__(self):
+        self.closed = 0
+
+    def close(self):
+        self.closed = 1
+
+
+class ConnectionPoolTests(SimpleTestCase):
+    def test_reuses_released_connections(self):
+        pool = ConnectionPool(FakeConnection, max_size=2)
+        first = pool.acquire()
+        pool.release(first)
+        assert pool.acquire() is first
+        stats = pool.stats()
+        assert stats["connects"] == 1 and stats["acquired"] == 2
+        assert stats["in_use"] == 1 and stats["idle"] == 0
+
+    def test_waits_for_a_free_connection_and_times_out(self):
+        pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+        held = pool.acquire()
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+        assert pool.stats()["timeouts"] == 1
+
+        pool.timeout = 5
+        threading.Timer(0.05, pool.release, [held]).start()
+        assert pool.acquire() is held
+        stats = pool.stats()
+        assert stats["waits"] == 1 and stats["wait_seconds_max"] > 0
+
+    def test_discards_closed_and_expired_connections(self):
+        pool = ConnectionPool(FakeConnection, max_size=2, max_lifetime=0)
+        conn = pool.acquire()
+        pool.release(conn)
+        assert conn.closed and pool.stats()["size"] == 0
+
+        pool.max_lifetime = 3600
+        conn = pool.acquire()
+        conn.close()
+        pool.release(conn)
+        assert pool.acquire() is not conn
+        assert pool.stats()["discarded"] == 2
+
+
+class PreparedStatementTests(TestCase):
+    def setUp(self):
+        Spot.objects.create(
+            spot_id=25501, title="Spot", location=Point(-99.21, 19.37, srid=4326),
+            sector_id=9, type_id=1, modality="rent", price_total_rent_mxn="35000.00",
+        )
+
+    def test_numbered_placeholders(self):
+        assert numbered("SELECT %s, '%%' LIKE %s") == ("SELECT $1, '%' LIKE $2", 2)
+
+    def test_select_is_prepared_once_per_connection(self):
+        params = {**connection.get_connection_params(), "connection_factory": PreparingConnection,
+                  "cursor_factory": PreparingCursor}
+        conn = psycopg2.connect(**params)
+        try:
+            sql = "SELECT spot_id FROM spots_spot WHERE sector_id = %s AND title LIKE %s"
+            with conn.cursor() as cursor:
+                cursor.execute(sql, [9, "Sp%"])
+                assert conn.prepared == {}
+                with prepared_statements():
+                    for _ in range(3):
+                        cursor.execute(sql, [9, "Sp%"])
+                        assert cursor.fetchall() == []  # los datos del test no están commiteados
+                cursor.execute("SELECT count(*) FROM pg_prepared_statements")
+                assert cursor.fetchone()[0] == 1
+            assert list(conn.prepared) == [sql]
+        finally:
+            conn.close()
+
+    def test_orm_queries_inside_a_transaction(self):
+        qs = Spot.objects.filter(sector_id=9, price_total_rent_mxn__gte=1000).values_list("spot_id", flat=True)
+        with prepared_statements():
+            assert list(qs) == [25501]
+            assert list(qs) == [25501]
+
+
+@override_settings(SPOTS_RESPONSE_CACHE=False)
+class PreparedEndpointTests(APITestCase):
+    def setUp(self):
+        Spot.objects.create(
+            spot_id=25501, title="Spot", location=Point(-99.21, 19.37, srid=4326),
+            sector_id=9, type_id=1, modality="rent", price_total_rent_mxn="35000.00",
+        )
+        connection.ensure_connection()
+        if not isinstance(connection.connection, PreparingConnection):
+            self.skipTest("Requiere DB_PREPARED_STATEMENTS=1 sin PgBouncer")
+
+    def test_named_actions_use_prepared_statements(self):
+        for url in (
+            "/api/spots/nearby/?lat=19.37&lng=-99.21&radius=100",
+            "/api/spots/top-rent/",
+            "/api/spots/average-price-by-sector/",
+        ):
+            with self.subTest(url=url):
+                # Las sentencias sobreviven a los rollbacks de otros tests: se empieza de cero.
+                with connection.cursor() as cursor:
+                    cursor.execute("DEALLOCATE ALL")
+                connection.connection.prepared.clear()
+                connection.connection.unpreparable.clear()
+                before = prepared.stats()
+                for _ in range(2):
+                    assert self.client.get(url).status_code == 200
+                after = prepared.stats()
+                assert after["prepared"] > before["prepared"]
+                assert after["executed"] >= before["executed"] + 2
+
+
+class HealthDbTests(APITestCase):
+    def test_reports_connection_and_counters(self):
+        r = self.client.get("/api/health/db/")
+        assert r.status_code == 200
+        data = r.json()
+        assert data["status"] == "ok"
+        assert isinstance(data["pools"], list)
+        assert set(data["prepared_statements"]) == {"prepared", "executed", "failed", "deallocated"}
@@ -0,0 +1,105 @@
+import csv
+import io
+import json
+
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots.models import Spot, State, Municipality, Settlement
+
+
+class GeoJSONExportTests(APITestCase):
+    def setUp(self):
+        for spot_id, sector, lng, lat in (
+            (25501, 9, -99.21, 19.37),
+            (25502, 12, -99.22, 19.39),
+            (25503, 9, -99.14, 19.33),
+        ):
+            Spot.objects.create(
+                spot_id=spot_id, title=f"Spot {spot_id}",
+                location=Point(lng, lat, srid=4326),
+                sector_id=sector, type_id=1, modality="rent", price_total_rent_mxn=1000,
+            )
+        Spot.objects.create(
+            spot_id=25504, title="Baja", location=Point(-99.2, 19.4, srid=4326),
+            sector_id=9, type_id=1, modality="rent", removed_at="2026-01-01T00:00:00Z",
+        )
+
+    def export(self, url):
+        r = self.client.get(url)
+        assert r.status_code == 200
+        assert r.streaming
+        assert r["Content-Type"] == "application/geo+json"
+        return json.loads(b"".join(r.streaming_content))
+
+    def test_feature_collection(self):
+        data = self.export("/api/spots/export/geojson/")
+        assert data["type"] == "FeatureCollection"
+        assert [f["properties"]["spot_id"] for f in data["features"]] == [25501, 25502, 25503]
+        first = data["features"][0]
+        assert first["type"] == "Feature"
+        assert first["geometry"] == {"type": "Point", "coordinates": [-99.21, 19.37]}
+        assert first["properties"]["price_total_rent_mxn"] == 1000
+        assert "geom" not in first["properties"]
+
+    def test_honors_filters(self):
+        data = self.export("/api/spots/export/geojson/?sector=9")
+        assert [f["properties"]["spot_id"] for f in data["features"]] == [25501, 25503]
+
+    @override_settings(SPOTS_EXPORT_CHUNK_SIZE=2)
+    def test_chunk_boundaries(self):
+        assert len(self.export("/api/spots/export/geojson/")["features"]) == 3
+        assert self.export("/api/spots/export/geojson/?sector=15")["features"] == []
+
+
+class StreamingExportTests(APITestCase):
+    def setUp(self):
+        st = State.objects.create(name="Ciudad de México")
+        muni = Municipality.objects.create(name="Álvaro Obregón", state=st)
+        setl = Settlement.objects.create(name="Col. A", municipality=muni)
+        Spot.objects.create(
+            spot_id=25501, title='Oficina "A", piso 2', location=Point(-99.21, 19.37, srid=4326),
+            sector_id=11, type_id=1, modality="rent", settlement=setl,
+            area_sqm="120.50", price_total_rent_mxn="35000.00",
+        )
+        Spot.objects.create(
+            spot_id=25502, title="Bodega", location=Point(-99.22, 19.39, srid=4326),
+            sector_id=9, type_id=2, modality="sale",
+        )
+
+    def body(self, url):
+        r = self.client.get(url)
+        assert r.status_code == 200
+        assert r.streaming
+        return r, b"".join(r.streaming_content).decode("utf-8")
+
+    def test_ndjson(self):
+        r, body = self.body("/api/spots/export/ndjson/")
+        assert r["Content-Type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [row["spot_id"] for row in rows] == [25501, 25502]
+        assert rows[0]["municipality"] == "Álvaro Obregón"
+        assert rows[0]["state"] == "Ciudad de México"
+        assert rows[0]["price_total_rent_mxn"] == "35000.00"
+        assert (rows[0]["lng"], rows[0]["lat"]) == (-99.21, 19.37)
+        assert rows[1]["settlement"] is None
+
+    def test_csv(self):
+        r, body = self.body("/api/spots/export/csv/?sector=11")
+        assert r["Content-Type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(body)))
+        assert len(rows) == 1
+        assert rows[0]["title"] == 'Oficina "A", piso 2'
+        assert rows[0]["settlement"] == "Col. A"
+        assert rows[0]["area_sqm"] == "120.50"
+
+    @override_settings(SPOTS_EXPORT_CHUNK_SIZE=1)
+    def test_chunked(self):
+        r = self.client.get("/api/spots/export/ndjson/")
+        chunks = list(r.streaming_content)
+        assert len(chunks) == 2
+        assert b"".join(chunks).count(b"\n") == 2
+
+    def test_unknown_format_is_404(self):
+        assert self.client.get("/api/spots/export/xml/").status_code == 404
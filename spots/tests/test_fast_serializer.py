@@ -0,0 +1,80 @@
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots import memindex
+from spots.api import fast
+from spots.models import Spot, State, Municipality, Settlement, Region, Corridor
+
+
+class FastSerializerTests(APITestCase):
+    def setUp(self):
+        st = State.objects.create(name="Ciudad de México")
+        muni = Municipality.objects.create(name="Álvaro Obregón", state=st)
+        setl = Settlement.objects.create(name="Col. A", municipality=muni)
+        region = Region.objects.create(name="Centro")
+        corridor = Corridor.objects.create(name="Reforma")
+        Spot.objects.create(
+            spot_id=25501, title='Oficina "Ñandú" piso 3',
+            location=Point(-99.2100000000001, 19.37, srid=4326),
+            sector_id=11, type_id=1, modality="rent", settlement=setl, region=region, corridor=corridor,
+            area_sqm="120.50", price_total_rent_mxn="35000.00",
+        )
+        Spot.objects.create(
+            spot_id=25502, title="",
+            location=Point(-99.123456789012345, 19.987654321098765, srid=4326),
+            sector_id=None, type_id=None, modality="sale",
+        )
+        Spot.objects.create(
+            spot_id=25503, title="Bodega",
+            location=Point(-99.2, 19.4, srid=4326),
+            sector_id=13, type_id=3, modality="rent_sale", settlement=setl,
+            area_sqm="1000", price_total_rent_mxn="1.5",
+        )
+
+    def both(self, method, url, data=None):
+        call = getattr(self.client, method)
+        kwargs = {"format": "json"} if data is not None else {}
+        with override_settings(SPOTS_FAST_SERIALIZER=True):
+            fast_response = call(url, data, **kwargs) if data is not None else call(url)
+        with override_settings(SPOTS_FAST_SERIALIZER=False):
+            slow_response = call(url, data, **kwargs) if data is not None else call(url)
+        assert fast_response.status_code == slow_response.status_code == 200
+        return fast_response.content, slow_response.content
+
+    def assert_identical(self, method, url, data=None):
+        fast_body, slow_body = self.both(method, url, data)
+        assert fast_body == slow_body, (fast_body, slow_body)
+
+    def test_list_is_byte_identical(self):
+        self.assert_identical("get", "/api/spots/")
+        self.assert_identical("get", "/api/spots/?page_size=2&page=2")
+        self.assert_identical("get", "/api/spots/?pagination=keyset&page_size=2&count=true")
+
+    def test_nearby_is_byte_identical(self):
+        self.assert_identical("get", "/api/spots/nearby/?lat=19.4&lng=-99.2&radius=100000")
+        self.assert_identical("get", "/api/spots/nearby/?lat=19.4&lng=-99.2&radius=100000&pagination=keyset&page_size=1")
+
+    def test_within_is_byte_identical(self):
+        poly = {"type": "Polygon", "coordinates": [[[-99.3, 19.3], [-99.3, 20], [-99.1, 20], [-99.1, 19.3]]]}
+        self.assert_identical("post", "/api/spots/within/", {"polygon": poly})
+
+    def test_top_rent_is_byte_identical(self):
+        self.assert_identical("get", "/api/spots/top-rent/?limit=5")
+
+    def test_memory_index_path_is_byte_identical(self):
+        memindex.invalidate()
+        self.addCleanup(memindex.invalidate)
+        with override_settings(SPOTS_MEMORY_INDEX=True):
+            self.assert_identical("get", "/api/spots/nearby/?lat=19.4&lng=-99.2&radius=100000&page_size=2")
+
+    def test_browsable_api_keeps_serializer(self):
+        r = self.client.get("/api/spots/", HTTP_ACCEPT="text/html")
+        assert r.status_code == 200
+        assert r["Content-Type"].startswith("text/html")
+
+    def test_row_encoder_columns(self):
+        assert fast.encoder.columns == (
+            "spot_id", "title", "sector_id", "type_id", "modality", "area_sqm",
+            "price_total_rent_mxn", "settlement_id", "region_id", "corridor_id",
+        )
@@ -0,0 +1,61 @@
+from django.contrib.gis.geos import Point
+from rest_framework.test import APITestCase
+from spots.models import Spot
+
+BASE_LNG, BASE_LAT = -99.1332, 19.4326
+
+
+class KeysetPaginationTests(APITestCase):
+    def setUp(self):
+        for i in range(55):
+            Spot.objects.create(
+                spot_id=i + 25001,
+                title=f"Spot {i+1}",
+                location=Point(BASE_LNG + i * 0.0001, BASE_LAT + i * 0.0001, srid=4326),
+                sector_id=9,
+                type_id=1,
+                modality="rent",
+            )
+
+    def crawl(self, url):
+        ids = []
+        pages = 0
+        while url:
+            resp = self.client.get(url)
+            assert resp.status_code == 200
+            data = resp.json()
+            ids += [x["spot_id"] for x in data["results"]]
+            url = data["next"]
+            pages += 1
+        return ids, pages
+
+    def test_list_first_page_has_no_count(self):
+        resp = self.client.get("/api/spots/?pagination=keyset")
+        assert resp.status_code == 200
+        data = resp.json()
+        assert set(data.keys()) == {"next", "results"}
+        assert len(data["results"]) == 50
+        assert "cursor=" in data["next"]
+
+    def test_list_crawl_visits_every_spot_once(self):
+        ids, pages = self.crawl("/api/spots/?pagination=keyset&page_size=20")
+        assert ids == list(range(25001, 25056))
+        assert pages == 3
+
+    def test_optional_exact_count(self):
+        resp = self.client.get("/api/spots/?pagination=keyset&count=true")
+        assert resp.json()["count"] == 55
+
+    def test_nearby_orders_by_distance_across_pages(self):
+        ids, _ = self.crawl(
+            f"/api/spots/nearby/?lat={BASE_LAT}&lng={BASE_LNG}&radius=5000&pagination=keyset&page_size=7"
+        )
+        assert ids == list(range(25001, 25056))
+
+    def test_invalid_cursor_returns_404(self):
+        resp = self.client.get("/api/spots/?cursor=no-es-un-cursor")
+        assert resp.status_code == 404
+
+    def test_page_number_pagination_is_still_the_default(self):
+        data = self.client.get("/api/spots/").json()
+        assert set(data.keys()) == {"count", "next", "previous", "results"}
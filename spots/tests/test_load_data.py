@@ -0,0 +1,143 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+from spots.cache import forget_dataset_version
+from spots.models import Spot, SpotPriceRollup, State, Municipality, Settlement, Region, Corridor
+
+CSV = """spot_id,spot_sector_id,spot_type_id,spot_settlement,spot_municipality,spot_state,spot_region,spot_corridor,spot_latitude,spot_longitude,spot_area_in_sqm,spot_price_sqm_mxn_rent,spot_price_total_mxn_rent,spot_price_sqm_mxn_sale,spot_price_total_mxn_sale,spot_modality,uuiid,spot_created_date
+25564,9,2,POBLADO COMPUERTAS,Mexicali,Baja California,North,,32.6534234,-115.3740755,6800,400,2720000,,,Rent,5,2024-02-29
+28099,15,1,REAL DEL RIO,Mexicali,baja california,North,Corredor 1,32.6478699,-115.5325106,3637,100,363700,10000,36370000,Rent & Sale,13934,4/7/2024
+28100,12,1,Col. A,Álvaro Obregón,Ciudad de México,,,19.4,-99.2,120.5,,,,,Sale,7,
+28101,12,1,,,,,,,,100,,,,,Rent,8,
+28102,12,1,,Zapopan,Jalisco,,,20.7,-103.4,50,,,,,Rent,9,
+28099,15,1,REAL DEL RIO,Mexicali,Baja California,North,Corredor 1,32.6478699,-115.5325106,4000,100,400000,,,Rent,13934,2024-07-05
+"""
+
+# Sin la fila duplicada de 28099: cada spot aparece una sola vez.
+CSV_UNIQUE = "".join(CSV.splitlines(keepends=True)[:-1])
+
+
+def snapshot():
+    spots = [
+        (
+            s.spot_id, s.title, s.sector_id, s.type_id, s.modality,
+            s.location.x, s.location.y, s.area_sqm, s.price_sqm_rent_mxn,
+            s.price_total_rent_mxn, s.price_sqm_sale_mxn, s.price_total_sale_mxn,
+            s.user_id, s.created_date,
+            s.settlement and (s.settlement.name, s.settlement.municipality.name,
+                              s.settlement.municipality.state.name),
+            s.region and s.region.name,
+            s.corridor and s.corridor.name,
+            s.municipality and s.municipality.name,
+            s.state and s.state.name,
+        )
+        for s in Spot.objects.select_related(
+            "settlement__municipality__state", "region", "corridor", "municipality", "state"
+        ).order_by("spot_id")
+    ]
+    lookups = [
+        sorted(State.objects.values_list("name", flat=True)),
+        sorted(Municipality.objects.values_list("name", "state__name")),
+        sorted(Settlement.objects.values_list("name", "municipality__name")),
+        sorted(Region.objects.values_list("name", flat=True)),
+        sorted(Corridor.objects.values_list("name", flat=True)),
+    ]
+    return spots, lookups
+
+
+class LoadDataTests(TestCase):
+    def setUp(self):
+        self.addCleanup(forget_dataset_version)
+        tmp = tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8")
+        tmp.write(CSV)
+        tmp.close()
+        self.path = Path(tmp.name)
+        self.addCleanup(self.path.unlink)
+
+    def load(self, **opts):
+        call_command("load_data", csv=str(self.path), stdout=StringIO(), **opts)
+
+    def test_row_by_row_load(self):
+        self.load()
+        assert Spot.objects.count() == 4
+        spot = Spot.objects.get(spot_id=28099)
+        assert spot.area_sqm == 4000
+        assert spot.settlement.municipality.state.name == "Baja California"
+        assert spot.municipality_id == spot.settlement.municipality_id
+        assert spot.state.name == "Baja California"
+        assert State.objects.count() == 3
+        # Sin asentamiento no hay municipio ni estado, aunque el CSV los traiga.
+        spot = Spot.objects.get(spot_id=28102)
+        assert spot.municipality_id is None and spot.state_id is None
+        assert SpotPriceRollup.objects.filter(sector_id=15).get().price_sum == 400000
+
+    def clear(self):
+        Spot.objects.all().delete()
+        for model in (Settlement, Municipality, State, Region, Corridor):
+            model.objects.all().delete()
+
+    def test_bulk_matches_row_by_row(self):
+        self.load()
+        expected = snapshot()
+
+        self.clear()
+        self.load(bulk=True, batch_size=2)
+        assert snapshot() == expected
+
+    def test_bulk_is_idempotent(self):
+        self.load(bulk=True)
+        first = snapshot()
+        self.load(bulk=True)
+        assert snapshot() == first
+
+    def test_parallel_parsing_matches_serial(self):
+        self.load()
+        expected = snapshot()
+
+        self.clear()
+        self.load(workers=2, chunk_bytes=64)
+        assert Spot.objects.count() == 4
+        assert snapshot() == expected
+
+    def _rewrite(self, content):
+        self.path.write_text(content, encoding="utf-8")
+
+    def _stats(self, **opts):
+        out = StringIO()
+        call_command("load_data", csv=str(self.path), stdout=out, **opts)
+        return out.getvalue()
+
+    def test_incremental_skips_unchanged_rows(self):
+        for bulk in (False, True):
+            with self.subTest(bulk=bulk):
+                Spot.objects.all().delete()
+                self._rewrite(CSV_UNIQUE)
+                assert "Insertados: 4, actualizados: 0" in self._stats(bulk=bulk, incremental=True)
+
+                changed = CSV_UNIQUE.replace("32.6534234,-115.3740755,6800", "32.6534234,-115.3740755,7000")
+                self._rewrite(changed)
+                out = self._stats(bulk=bulk, incremental=True)
+                assert "Insertados: 0, actualizados: 1, sin cambios: 3, dados de baja: 0" in out
+                assert Spot.objects.get(spot_id=25564).area_sqm == 7000
+
+    def test_snapshot_soft_deletes_missing_spots(self):
+        for bulk in (False, True):
+            with self.subTest(bulk=bulk):
+                Spot.objects.all().delete()
+                self._rewrite(CSV_UNIQUE)
+                self._stats(bulk=bulk)
+
+                lines = [l for l in CSV_UNIQUE.splitlines() if not l.startswith("28100,")]
+                self._rewrite("\n".join(lines) + "\n")
+                out = self._stats(bulk=bulk, incremental=True, snapshot=True)
+                assert "sin cambios: 3, dados de baja: 1" in out
+                assert Spot.objects.get(spot_id=28100).removed_at is not None
+                assert self.client.get("/api/spots/28100/").status_code == 404
+
+                self._rewrite(CSV_UNIQUE)
+                out = self._stats(bulk=bulk, incremental=True, snapshot=True)
+                assert "actualizados: 1, sin cambios: 3, dados de baja: 0" in out
+                assert Spot.objects.get(spot_id=28100).removed_at is None
@@ -0,0 +1,100 @@
+from django.contrib.gis.geos import Point
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots import memindex
+from spots.models import Spot, State, Municipality, Settlement
+from spots.signals import spots_loaded
+
+REF_LAT, REF_LNG = 19.4326, -99.1332
+
+
+@override_settings(SPOTS_MEMORY_INDEX=True)
+class MemoryIndexTests(APITestCase):
+    def setUp(self):
+        memindex.invalidate()
+        st = State.objects.create(name="Ciudad de México")
+        muni = Municipality.objects.create(name="Cuauhtémoc", state=st)
+        setl = Settlement.objects.create(name="Centro", municipality=muni)
+        points = [
+            (25501, REF_LNG, REF_LAT, 9),
+            (25502, REF_LNG, REF_LAT + 0.01, 11),
+            (25503, REF_LNG, REF_LAT + 0.1, 9),
+            (25504, REF_LNG + 0.005, REF_LAT, 9),
+        ]
+        for spot_id, lng, lat, sector in points:
+            Spot.objects.create(
+                spot_id=spot_id, title=str(spot_id),
+                location=Point(lng, lat, srid=4326),
+                sector_id=sector, type_id=1, modality="rent", settlement=setl,
+            )
+
+    def tearDown(self):
+        memindex.invalidate()
+
+    def get_ids(self, url):
+        r = self.client.get(url)
+        assert r.status_code == 200
+        return [x["spot_id"] for x in r.json()["results"]]
+
+    def test_nearby_matches_postgis(self):
+        url = f"/api/spots/nearby/?lat={REF_LAT}&lng={REF_LNG}&radius=2000"
+        memory = self.get_ids(url)
+        with override_settings(SPOTS_MEMORY_INDEX=False):
+            postgis = self.get_ids(url)
+        assert memory == postgis == [25501, 25504, 25502]
+
+    def test_nearby_filters_in_memory(self):
+        url = f"/api/spots/nearby/?lat={REF_LAT}&lng={REF_LNG}&radius=2000"
+        assert self.get_ids(url + "&sector=9") == [25501, 25504]
+        assert self.get_ids(url + "&municipality=cuauhtémoc") == [25501, 25504, 25502]
+        assert self.get_ids(url + "&municipality=Coyoacán") == []
+
+    def test_nearby_paginates_ids(self):
+        r = self.client.get(f"/api/spots/nearby/?lat={REF_LAT}&lng={REF_LNG}&radius=20000&page_size=2")
+        data = r.json()
+        assert data["count"] == 4
+        assert [x["spot_id"] for x in data["results"]] == [25501, 25504]
+        assert data["next"] is not None
+
+    def test_within_polygon_with_hole(self):
+        poly = {
+            "type": "Polygon",
+            "coordinates": [[
+                [REF_LNG - 0.02, REF_LAT - 0.02], [REF_LNG - 0.02, REF_LAT + 0.02],
+                [REF_LNG + 0.02, REF_LAT + 0.02], [REF_LNG + 0.02, REF_LAT - 0.02],
+            ]],
+        }
+        r = self.client.post("/api/spots/within/", {"polygon": poly}, format="json")
+        assert [x["spot_id"] for x in r.json()["results"]] == [25501, 25502, 25504]
+
+        shell = poly["coordinates"][0] + [poly["coordinates"][0][0]]
+        hole = [
+            [REF_LNG + 0.002, REF_LAT - 0.002], [REF_LNG + 0.008, REF_LAT - 0.002],
+            [REF_LNG + 0.008, REF_LAT + 0.002], [REF_LNG + 0.002, REF_LAT + 0.002],
+            [REF_LNG + 0.002, REF_LAT - 0.002],
+        ]
+        index = memindex.get_index()
+        inside = index.within([[shell, hole]])
+        spot_ids = dict(Spot.objects.values_list("id", "spot_id"))
+        assert sorted(spot_ids[i] for i in inside.tolist()) == [25501, 25502]
+
+    def test_rebuilds_on_load_signal(self):
+        url = f"/api/spots/nearby/?lat={REF_LAT}&lng={REF_LNG}&radius=500"
+        assert self.get_ids(url) == [25501]
+        Spot.objects.create(
+            spot_id=25505, title="Nuevo", location=Point(REF_LNG, REF_LAT + 0.001, srid=4326),
+            sector_id=9, type_id=1, modality="rent",
+        )
+        assert self.get_ids(url) == [25501]
+        spots_loaded.send(sender=None)
+        assert self.get_ids(url) == [25501, 25505]
+
+    def test_keyset_falls_back_to_postgis(self):
+        r = self.client.get(f"/api/spots/nearby/?lat={REF_LAT}&lng={REF_LNG}&radius=2000&pagination=keyset")
+        assert r.status_code == 200
+        assert set(r.json().keys()) == {"next", "results"}
+
+    def test_check_command(self):
+        call_command("check_memory_index", samples=5, verbosity=0)
@@ -0,0 +1,67 @@
+from django.contrib.gis.geos import Point
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots import metrics
+from spots.cache import bump_dataset_version, forget_dataset_version
+from spots.models import Spot
+
+
+def requests_recorded():
+    return sum(value for name, _, value in metrics.REQUESTS.samples() if name.endswith("_count"))
+
+
+class MetricsMiddlewareTests(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        forget_dataset_version()
+        self.addCleanup(forget_dataset_version)
+        Spot.objects.create(
+            spot_id=25501, title="A", location=Point(-99.21, 19.37, srid=4326),
+            sector_id=9, type_id=1, modality="rent", price_total_rent_mxn=1000,
+        )
+
+    def test_records_latency_queries_and_size_per_action(self):
+        _, before = metrics.REQUESTS.value("nearby", "GET", 200)
+        queries_before, _ = metrics.QUERIES.value("nearby", "GET", 200)
+        _, sizes_before = metrics.RESPONSE_SIZE.value("nearby")
+
+        r = self.client.get("/api/spots/nearby/?lat=19.37&lng=-99.21&radius=100")
+        assert r.status_code == 200
+
+        assert metrics.REQUESTS.value("nearby", "GET", 200)[1] == before + 1
+        assert metrics.QUERIES.value("nearby", "GET", 200)[0] > queries_before
+        total, count = metrics.RESPONSE_SIZE.value("nearby")
+        assert count == sizes_before + 1 and total >= len(r.content)
+
+    def test_cache_hits_and_misses(self):
+        bump_dataset_version()
+        hits, misses = metrics.CACHE.value("top_rent", "HIT"), metrics.CACHE.value("top_rent", "MISS")
+        self.client.get("/api/spots/top-rent/")
+        self.client.get("/api/spots/top-rent/")
+        assert metrics.CACHE.value("top_rent", "MISS") == misses + 1
+        assert metrics.CACHE.value("top_rent", "HIT") == hits + 1
+
+    def test_other_views_are_not_recorded(self):
+        before = requests_recorded()
+        self.client.get("/api/health/")
+        assert requests_recorded() == before
+
+    def test_over_budget_is_logged(self):
+        before = metrics.OVER_BUDGET.value("list", "queries")
+        with override_settings(SPOTS_METRICS_QUERY_BUDGET=0), self.assertLogs("spots.middleware", "WARNING") as logs:
+            self.client.get("/api/spots/")
+        assert metrics.OVER_BUDGET.value("list", "queries") == before + 1
+        assert "/api/spots/" in logs.output[0]
+
+    def test_prometheus_endpoint(self):
+        self.client.get("/api/spots/")
+        r = self.client.get("/metrics")
+        assert r.status_code == 200
+        assert r["Content-Type"].startswith("text/plain; version=0.0.4")
+        body = r.content.decode()
+        assert "# TYPE spots_request_duration_seconds histogram" in body
+        assert 'spots_request_duration_seconds_count{action="list",method="GET",status="200"}' in body
+        assert 'spots_request_db_queries_bucket{action="list",method="GET",status="200",le="+Inf"}' in body
+        assert "spots_db_prepared_statements_total" in body
@@ -0,0 +1,33 @@
+from decimal import Decimal
+from datetime import datetime
+
+from django.test import SimpleTestCase
+from spots.management.commands.utils import DateColumn, RowParser, parse_date, to_dec
+
+
+class ColumnParserTests(SimpleTestCase):
+    def test_date_column_detects_format_and_falls_back(self):
+        col = DateColumn()
+        assert col.parse("2024-02-29") == datetime(2024, 2, 29)
+        assert col.fmt == "%Y-%m-%d"
+        assert col.parse("4/7/2024") == datetime(2024, 7, 4)
+        assert col.fmt == "%Y-%m-%d"
+        assert col.parse("no es fecha") is None
+        assert col.parse("") is None
+
+    def test_date_column_matches_parse_date(self):
+        col = DateColumn()
+        for raw in ("29/2/2024", "2024-02-29", "2024-02-29T10:00:00", "2024-02-29T10:00:00+0000", "01-03-2024", " ", None):
+            assert col.parse(raw) == parse_date(raw)
+
+    def test_decimals_match_to_dec(self):
+        parse = RowParser().decimals[0][2]
+        for raw in ("1,200", " 12 ", "", None, "abc", "1.5e3", "2720000"):
+            assert parse(raw) == to_dec(raw)
+        assert parse("1,200") == Decimal("1200")
+
+    def test_row_without_coordinates_is_skipped(self):
+        parser = RowParser()
+        assert parser({"spot_id": "1", "spot_latitude": "", "spot_longitude": "-99"}) is None
+        rec = parser({"spot_id": "1", "spot_latitude": "19,4", "spot_longitude": "-99.2", "spot_modality": "Sale"})
+        assert rec["lat"] == 19.4 and rec["modality"] == "sale"
@@ -0,0 +1,62 @@
+from django.contrib.gis.geos import Point
+from rest_framework.test import APITestCase
+
+from spots.models import Spot, SpotPriceRollup, State, Municipality, Settlement
+from spots.rollups import refresh_price_rollups
+
+
+class PriceRollupTests(APITestCase):
+    def setUp(self):
+        st = State.objects.create(name="Ciudad de México")
+        setl_ao = Settlement.objects.create(
+            name="Col. A", municipality=Municipality.objects.create(name="Álvaro Obregón", state=st)
+        )
+        setl_co = Settlement.objects.create(
+            name="Col. C", municipality=Municipality.objects.create(name="Coyoacán", state=st)
+        )
+        rows = [
+            (25501, 9, 1, setl_ao, 1000),
+            (25502, 9, 2, setl_ao, 3000),
+            (25503, 9, 1, setl_co, 2500),
+            (25504, 12, 1, setl_ao, 500),
+            (25505, 12, 1, None, 700),
+            (25506, 9, 1, setl_ao, None),
+        ]
+        for spot_id, sector, type_, settlement, price in rows:
+            Spot.objects.create(
+                spot_id=spot_id, title=str(spot_id),
+                sector_id=sector, type_id=type_, modality="rent",
+                location=Point(-99.2, 19.4, srid=4326),
+                settlement=settlement, price_total_rent_mxn=price,
+            )
+
+    def averages(self, query=""):
+        r = self.client.get(f"/api/spots/average-price-by-sector/{query}")
+        assert r.status_code == 200
+        return {row["sector_id"]: float(row["average_price_total_rent_mxn"]) for row in r.json()}
+
+    def test_rollup_matches_live_query(self):
+        queries = ["", "?sector=9", "?type=1", "?municipality=álvaro obregón", "?municipality=Coyoacán&type=1",
+                   "?sector=abc", "?municipality=Nada"]
+        live = {q: self.averages(q) for q in queries}
+        assert refresh_price_rollups() == 5
+        for q in queries:
+            with self.subTest(query=q):
+                assert self.averages(q) == live[q]
+
+    def test_endpoint_reads_rollup_once_refreshed(self):
+        refresh_price_rollups()
+        Spot.objects.filter(spot_id=25504).update(price_total_rent_mxn=10000)
+        assert self.averages("?sector=12")[12] == 600.0
+
+        refresh_price_rollups()
+        assert self.averages("?sector=12")[12] == 5350.0
+
+    def test_removed_spots_are_excluded(self):
+        Spot.objects.filter(spot_id=25505).update(removed_at="2026-01-01T00:00:00Z")
+        refresh_price_rollups()
+        assert self.averages("?sector=12") == {12: 500.0}
+
+    def test_empty_rollup_falls_back_to_live_query(self):
+        assert not SpotPriceRollup.objects.exists()
+        assert self.averages() == {9: 2166.6666666666665, 12: 600.0}
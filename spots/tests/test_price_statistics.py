@@ -0,0 +1,82 @@
+from django.contrib.gis.geos import Point
+from rest_framework.test import APITestCase
+
+from spots.models import Spot, SpotStatistics
+from spots.stats import refresh_statistics
+
+
+class PriceStatisticsTests(APITestCase):
+    def setUp(self):
+        rows = [
+            (25501, 9, 1, 1000, "100.00"),
+            (25502, 9, 1, 2000, "200.00"),
+            (25503, 9, 2, 3000, None),
+            (25504, 9, 2, 4000, "400.00"),
+            (25505, 12, 1, 500, None),
+            (25506, 12, 1, None, None),
+        ]
+        for spot_id, sector, type_, price, area in rows:
+            Spot.objects.create(
+                spot_id=spot_id, title=str(spot_id), sector_id=sector, type_id=type_, modality="rent",
+                location=Point(-99.2, 19.4, srid=4326), price_total_rent_mxn=price, area_sqm=area,
+            )
+        Spot.objects.create(
+            spot_id=25507, title="Baja", sector_id=9, type_id=1, modality="rent",
+            location=Point(-99.2, 19.4, srid=4326), price_total_rent_mxn=999999,
+            removed_at="2026-01-01T00:00:00Z",
+        )
+
+    def statistics(self, query=""):
+        r = self.client.get(f"/api/spots/price-statistics/{query}")
+        assert r.status_code == 200
+        return r.json()
+
+    def test_by_sector(self):
+        data = self.statistics("?group_by=sector&buckets=3")
+        assert data["group_by"] == "sector" and data["buckets"] == 3
+        assert [(g["key"], g["label"], g["count"]) for g in data["groups"]] == [(9, "Industrial", 4), (12, "Retail", 2)]
+
+        rent = data["groups"][0]["price_total_rent_mxn"]
+        assert rent["count"] == 4
+        assert (rent["min"], rent["max"], rent["mean"]) == (1000.0, 4000.0, 2500.0)
+        assert (rent["p25"], rent["p50"], rent["p75"], rent["p90"]) == (1750.0, 2500.0, 3250.0, 3700.0)
+        assert rent["histogram"] == [
+            {"lower": 1000.0, "upper": 2000.0, "count": 1},
+            {"lower": 2000.0, "upper": 3000.0, "count": 1},
+            {"lower": 3000.0, "upper": 4000.0, "count": 2},
+        ]
+        assert data["groups"][0]["area_sqm"]["count"] == 3
+
+        retail = data["groups"][1]
+        assert retail["price_total_rent_mxn"]["histogram"] == [{"lower": 500.0, "upper": 500.0, "count": 1}]
+        assert retail["area_sqm"] == {
+            "count": 0, "min": None, "max": None, "mean": None,
+            "p25": None, "p50": None, "p75": None, "p90": None, "histogram": [],
+        }
+
+    def test_total_honors_filters(self):
+        data = self.statistics("?type=2")
+        assert data["group_by"] is None
+        [total] = data["groups"]
+        assert total["key"] is None and total["count"] == 2
+        assert total["price_total_rent_mxn"]["p50"] == 3500.0
+        assert len(total["price_total_rent_mxn"]["histogram"]) == 10
+
+    def test_precomputed_matches_live_query(self):
+        queries = ["", "?group_by=sector", "?group_by=type", "?group_by=municipality", "?group_by=region"]
+        live = {q: self.statistics(q) for q in queries}
+        assert refresh_statistics() == 5
+        assert SpotStatistics.objects.count() == 5
+        for q in queries:
+            with self.subTest(query=q):
+                assert self.statistics(q) == live[q]
+
+        Spot.objects.filter(spot_id=25505).update(price_total_rent_mxn=100)
+        assert self.statistics()["groups"][0]["price_total_rent_mxn"]["min"] == 500.0
+        assert self.statistics("?sector=12")["groups"][0]["price_total_rent_mxn"]["min"] == 100.0
+        assert self.statistics("?buckets=4")["groups"][0]["price_total_rent_mxn"]["min"] == 100.0
+
+    def test_invalid_group_by(self):
+        r = self.client.get("/api/spots/price-statistics/?group_by=corridor")
+        assert r.status_code == 400
+        assert "group_by" in r.json()
@@ -0,0 +1,114 @@
+from datetime import datetime, timedelta, timezone
+
+from django.contrib.gis.geos import Point
+from django.db import connection
+from django.db.models import F, Window
+from django.db.models.functions import Lower, RowNumber
+from django.test import TestCase
+from spots.api.filters import apply_nearby, apply_spot_filters
+from spots.models import Corridor, Municipality, Region, Settlement, Spot, State
+
+REF_LAT, REF_LNG = 19.4326, -99.1332
+
+
+class QueryPlanTests(TestCase):
+    """
+    Con enable_seqscan=off el planner sólo elige un Seq Scan si no existe
+    un índice que pueda resolver el predicado.
+    """
+
+    def setUp(self):
+        st = State.objects.create(name="Ciudad de México")
+        muni = Municipality.objects.create(name="Álvaro Obregón", state=st)
+        setl = Settlement.objects.create(name="Col. A", municipality=muni)
+        region = Region.objects.create(name="Poniente")
+        corridor = Corridor.objects.create(name="Santa Fe")
+        for i in range(50):
+            Spot.objects.create(
+                spot_id=30000 + i,
+                title=f"Spot {i}",
+                location=Point(REF_LNG + i * 0.001, REF_LAT + i * 0.001, srid=4326),
+                sector_id=(9, 11, 12, 15)[i % 4], type_id=1, modality="rent",
+                settlement=setl if i % 2 else None, region=region if i % 3 else None,
+                corridor=corridor if i % 5 else None,
+                price_total_rent_mxn=None if i % 7 == 0 else 1000 * i,
+                price_total_sale_mxn=None if i % 3 else 90000 * i,
+                area_sqm=100 + i,
+                created_date=datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(days=i),
+            )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            cursor.execute(f"ANALYZE {Spot._meta.db_table}")
+
+    def plan(self, qs):
+        return qs.explain()
+
+    def listing(self, **params):
+        return apply_spot_filters(Spot.objects.filter(removed_at__isnull=True), params)
+
+    def top_rent(self, **params):
+        return (
+            self.listing(**params)
+            .exclude(price_total_rent_mxn__isnull=True)
+            .order_by("-price_total_rent_mxn", "spot_id")[:10]
+        )
+
+    def test_nearby_uses_geography_gist_index(self):
+        plan = self.plan(apply_nearby(Spot.objects.all(), REF_LAT, REF_LNG, 2000))
+        assert "spot_location_geog_idx" in plan, plan
+        assert "Seq Scan on spots_spot" not in plan, plan
+
+    def test_name_filters_use_spot_indexes_without_joins(self):
+        for params, index in (
+            ({"municipality": "álvaro obregón,Coyoacán"}, "spot_municipality_idx"),
+            ({"state": "CIUDAD DE MÉXICO"}, "spot_state_idx"),
+            ({"region": "poniente"}, "spots_spot_region_id"),
+            ({"corridor": "santa fe"}, "spots_spot_corridor_id"),
+        ):
+            plan = self.plan(apply_spot_filters(Spot.objects.all(), params))
+            assert index in plan, plan
+            assert "Seq Scan on spots_spot" not in plan, plan
+            assert "spots_settlement" not in plan and "spots_municipality" not in plan, plan
+
+    def test_name_lookup_uses_lower_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {Municipality._meta.db_table}")
+        plan = self.plan(
+            Municipality.objects.alias(name_lower=Lower("name")).filter(name_lower__in=["álvaro obregón"])
+        )
+        assert "municipality_name_lower_idx" in plan, plan
+
+    def test_top_rent_reads_partial_index_in_order(self):
+        plan = self.plan(self.top_rent())
+        assert "spot_top_rent_idx" in plan, plan
+        assert "Sort" not in plan, plan
+
+    def test_top_rent_by_sector_uses_composite_index(self):
+        plan = self.plan(self.top_rent(sector="9"))
+        assert "spot_sector_rent_idx" in plan, plan
+        assert "Seq Scan on spots_spot" not in plan, plan
+
+    def test_top_rent_per_sector_window_reads_index_order(self):
+        ranked = (
+            self.listing()
+            .exclude(price_total_rent_mxn__isnull=True)
+            .annotate(rank=Window(
+                RowNumber(), partition_by=[F("sector_id")],
+                order_by=[F("price_total_rent_mxn").desc(), F("spot_id").asc()],
+            ))
+            .filter(rank__lte=3)
+        )
+        plan = self.plan(ranked)
+        assert "spot_sector_rent_idx" in plan, plan
+        assert "Seq Scan on spots_spot" not in plan, plan
+
+    def test_range_filters_use_partial_indexes(self):
+        for params, index in (
+            ({"sector": "9", "area_sqm_min": "110", "area_sqm_max": "130"}, "spot_sector_area_idx"),
+            ({"sector": "12", "price_total_sale_mxn_max": "2000000"}, "spot_sector_sale_idx"),
+            ({"sector": "11", "price_total_rent_mxn_min": "20000"}, "spot_sector_rent_idx"),
+            ({"created_date_min": "2026-02-01", "created_date_max": "2026-02-05"}, "spot_created_idx"),
+        ):
+            plan = self.plan(self.listing(**params))
+            assert index in plan, (params, plan)
+            assert "Seq Scan on spots_spot" not in plan, plan
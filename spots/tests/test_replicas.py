@@ -0,0 +1,83 @@
+import json
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.gis.geos import Point
+from django.db import router
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots.cache import forget_dataset_version
+from spots.db import replicas
+from spots.models import Spot
+
+REPLICA = settings.SPOTS_READ_REPLICAS[0] if settings.SPOTS_READ_REPLICAS else None
+
+
+def create_spot(alias, spot_id, rent):
+    Spot.objects.db_manager(alias).create(
+        spot_id=spot_id, title=f"Spot {spot_id}", location=Point(-99.21, 19.37, srid=4326),
+        sector_id=9, type_id=1, modality="rent", price_total_rent_mxn=rent,
+    )
+
+
+class RouterDefaultsTests(APITestCase):
+    def test_reads_and_writes_go_to_primary_outside_requests(self):
+        assert router.db_for_read(Spot) == "default"
+        assert router.db_for_write(Spot) == "default"
+        with replicas.reading_from("default"):
+            assert router.db_for_read(Spot) == "default"
+
+    def test_without_replicas_requests_read_from_primary(self):
+        with override_settings(SPOTS_READ_REPLICAS=[]):
+            assert replicas.choose() == "default"
+            assert self.client.get("/api/spots/").status_code == 200
+
+
+@skipUnless(REPLICA, "Requiere DATABASE_REPLICA_URLS (p.ej. una segunda base local como réplica)")
+class ReplicaRoutingTests(APITestCase):
+    """
+    La "réplica" es otra base local con datos distintos al primario: lo que
+    devuelve la API muestra de dónde se leyó.
+    """
+
+    databases = {"default", REPLICA}
+
+    def setUp(self):
+        replicas.forget_status()
+        forget_dataset_version()
+        self.addCleanup(replicas.forget_status)
+        create_spot("default", 1, "10000.00")
+        create_spot(REPLICA, 2, "20000.00")
+
+    def spot_ids(self, url, **headers):
+        r = self.client.get(url, **headers)
+        assert r.status_code == 200
+        data = r.json()
+        return [x["spot_id"] for x in (data["results"] if isinstance(data, dict) else data)]
+
+    def test_read_actions_use_the_replica(self):
+        assert self.spot_ids("/api/spots/") == [2]
+        assert self.spot_ids("/api/spots/top-rent/") == [2]
+        assert self.spot_ids("/api/spots/nearby/?lat=19.37&lng=-99.21&radius=100") == [2]
+        r = self.client.get("/api/spots/average-price-by-sector/")
+        assert r.json()[0]["average_price_total_rent_mxn"] == 20000
+
+        # La exportación se lee al recorrer la respuesta, fuera de dispatch().
+        body = b"".join(self.client.get("/api/spots/export/ndjson/").streaming_content)
+        assert [json.loads(line)["spot_id"] for line in body.splitlines()] == [2]
+
+    def test_primary_header_opts_out(self):
+        assert self.spot_ids("/api/spots/", HTTP_X_READ_FROM="primary") == [1]
+        assert self.client.get("/api/spots/1/", HTTP_X_READ_FROM="primary").status_code == 200
+        assert self.client.get("/api/spots/1/").status_code == 404
+
+    def test_lagging_replica_is_skipped(self):
+        with override_settings(SPOTS_REPLICA_MAX_LAG=-1):
+            assert self.spot_ids("/api/spots/") == [1]
+
+    def test_health_reports_replica_status(self):
+        self.client.get("/api/spots/")
+        data = self.client.get("/api/health/db/").json()
+        status = {r["alias"]: r for r in data["replicas"]}[REPLICA]
+        assert status["healthy"] is True and status["lag_seconds"] == 0
@@ -0,0 +1,86 @@
+from django.contrib.gis.geos import Point
+from django.core.cache import caches
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots.cache import bump_dataset_version, forget_dataset_version
+from spots.models import DatasetVersion, Spot
+
+
+class ResponseCacheTests(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        forget_dataset_version()
+        self.addCleanup(forget_dataset_version)
+        Spot.objects.create(
+            spot_id=25501, title="A", location=Point(-99.21, 19.37, srid=4326),
+            sector_id=9, type_id=1, modality="rent", price_total_rent_mxn=1000,
+        )
+        bump_dataset_version()
+
+    def test_second_request_is_served_from_cache(self):
+        first = self.client.get("/api/spots/?sector=9")
+        assert first["X-Cache"] == "MISS"
+        with self.assertNumQueries(0):
+            second = self.client.get("/api/spots/?sector=9")
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+        assert second["ETag"] == first["ETag"]
+
+    def test_equivalent_query_strings_share_the_entry(self):
+        self.client.get("/api/spots/?sector=9&type=1")
+        assert self.client.get("/api/spots/?type=1&sector=9")["X-Cache"] == "HIT"
+        assert self.client.get("/api/spots/?type=1&sector=12")["X-Cache"] == "MISS"
+
+    def test_if_none_match_returns_304(self):
+        etag = self.client.get("/api/spots/25501/")["ETag"]
+        r = self.client.get("/api/spots/25501/", HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 304
+        assert r["ETag"] == etag
+
+    def test_304_does_not_touch_the_db(self):
+        etag = self.client.get("/api/spots/top-rent/")["ETag"]
+        with self.assertNumQueries(0):
+            r = self.client.get("/api/spots/top-rent/", HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 304
+
+    def test_without_ttl_each_request_reads_the_version(self):
+        with override_settings(SPOTS_DATASET_VERSION_TTL=0):
+            etag = self.client.get("/api/spots/top-rent/")["ETag"]
+            with self.assertNumQueries(1):
+                r = self.client.get("/api/spots/top-rent/", HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 304
+
+    def test_load_bumps_version_and_invalidates(self):
+        etag = self.client.get("/api/spots/average-price-by-sector/")["ETag"]
+        Spot.objects.filter(spot_id=25501).update(price_total_rent_mxn=3000)
+        assert DatasetVersion.objects.get().version == 1
+        bump_dataset_version()
+
+        r = self.client.get("/api/spots/average-price-by-sector/", HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 200
+        assert r["X-Cache"] == "MISS"
+        assert r.json()[0]["average_price_total_rent_mxn"] == 3000
+
+    def test_post_is_keyed_by_body(self):
+        square = [[-99.25, 19.35], [-99.25, 19.41], [-99.18, 19.41], [-99.18, 19.35]]
+        far = [[0, 0], [0, 1], [1, 1], [1, 0]]
+        r = self.client.post("/api/spots/within/", {"polygon": {"type": "Polygon", "coordinates": [square]}}, format="json")
+        assert r["X-Cache"] == "MISS" and r.json()["count"] == 1
+        r = self.client.post("/api/spots/within/", {"polygon": {"coordinates": [square], "type": "Polygon"}}, format="json")
+        assert r["X-Cache"] == "HIT"
+        r = self.client.post("/api/spots/within/", {"polygon": {"type": "Polygon", "coordinates": [far]}}, format="json")
+        assert r["X-Cache"] == "MISS" and r.json()["count"] == 0
+
+    def test_errors_are_not_cached(self):
+        assert self.client.get("/api/spots/99999/").status_code == 404
+        r = self.client.get("/api/spots/99999/")
+        assert r.status_code == 404
+        assert "X-Cache" not in r
+
+    def test_disabled_without_dataset_version(self):
+        DatasetVersion.objects.all().delete()
+        forget_dataset_version()
+        r = self.client.get("/api/spots/")
+        assert r.status_code == 200
+        assert "X-Cache" not in r and "ETag" not in r
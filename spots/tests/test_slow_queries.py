@@ -0,0 +1,88 @@
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.contrib.gis.geos import Point
+from django.core.cache import caches
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots import slow_queries
+from spots.cache import forget_dataset_version
+from spots.models import Spot
+
+
+@override_settings(
+    SPOTS_SLOW_QUERY_MS=0, SPOTS_SLOW_QUERY_EXPLAIN_RATE=1, SPOTS_SLOW_QUERY_BUFFER=50,
+    SPOTS_SLOW_QUERY_CACHE_ALIAS="default", SPOTS_RESPONSE_CACHE=False,
+)
+class SlowQueryCaptureTests(APITestCase):
+    def setUp(self):
+        caches["default"].clear()
+        forget_dataset_version()
+        self.addCleanup(forget_dataset_version)
+        Spot.objects.create(
+            spot_id=25601, title="A", location=Point(-99.21, 19.37, srid=4326),
+            sector_id=9, type_id=1, modality="rent", price_total_rent_mxn=1000,
+        )
+
+    def test_captures_queries_tagged_with_action_and_filters(self):
+        r = self.client.get("/api/spots/nearby/?lat=19.37&lng=-99.21&radius=100&sector=9")
+        assert r.status_code == 200
+
+        captured = slow_queries.entries(action="nearby")
+        assert captured
+        entry = next(e for e in captured if "spots_spot" in e["sql"])
+        assert entry["source"] == "api" and entry["method"] == "GET" and entry["path"] == "/api/spots/nearby/"
+        assert entry["filters"] == {"lat": "19.37", "lng": "-99.21", "radius": "100", "sector": "9"}
+        assert entry["params"] and "%s" not in entry["query"]
+        assert "actual time" in entry["plan"] and "Buffers" in entry["plan"]
+
+    def test_queries_outside_tagged_contexts_are_ignored(self):
+        Spot.objects.count()
+        self.client.get("/api/health/db/")
+        assert slow_queries.entries() == []
+
+    def test_below_threshold_is_ignored(self):
+        with override_settings(SPOTS_SLOW_QUERY_MS=60_000):
+            self.client.get("/api/spots/")
+        assert slow_queries.entries() == []
+
+    def test_writes_are_explained_without_running_them_again(self):
+        with slow_queries.tagged(source="load_data", action="load_data", options={"bulk": False}):
+            Spot.objects.filter(spot_id=25601).update(title="B")
+        entry = slow_queries.entries(action="load_data")[0]
+        assert entry["sql"].startswith("UPDATE") and entry["options"] == {"bulk": False}
+        assert "actual time" not in entry["plan"]
+        assert Spot.objects.filter(title="B").count() == 1
+
+    def test_ring_buffer_keeps_the_newest(self):
+        with override_settings(SPOTS_SLOW_QUERY_BUFFER=3):
+            for i in range(5):
+                slow_queries.push({"action": "nearby", "i": i})
+            assert [e["i"] for e in slow_queries.entries()] == [4, 3, 2]
+            assert [e["i"] for e in slow_queries.entries(limit=1)] == [4]
+
+    def test_admin_endpoint(self):
+        self.client.get("/api/spots/top-rent/")
+        assert self.client.get("/api/admin/slow-queries/").status_code in (401, 403)
+
+        admin = get_user_model().objects.create_user("ops", password="x", is_staff=True)
+        self.client.force_authenticate(admin)
+        r = self.client.get("/api/admin/slow-queries/?action=top_rent&limit=1")
+        assert r.status_code == 200
+        assert len(r.json()) == 1 and r.json()[0]["action"] == "top_rent"
+
+        assert self.client.delete("/api/admin/slow-queries/").status_code == 204
+        assert self.client.get("/api/admin/slow-queries/").json() == []
+
+    def test_management_command(self):
+        self.client.get("/api/spots/nearby/?lat=19.37&lng=-99.21&radius=100")
+        out = StringIO()
+        call_command("slow_queries", action="nearby", limit=1, stdout=out)
+        assert "api/nearby" in out.getvalue() and "actual time" in out.getvalue()
+
+        call_command("slow_queries", clear=True, stdout=StringIO())
+        out = StringIO()
+        call_command("slow_queries", stdout=out)
+        assert "No hay consultas lentas" in out.getvalue()
@@ -0,0 +1,101 @@
+import io
+import tempfile
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+from django.contrib.gis.geos import Point
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots.cache import bump_dataset_version, forget_dataset_version
+from spots.models import Municipality, Region, Settlement, Spot, State
+from spots.snapshot import write_snapshot
+
+
+class SnapshotTests(APITestCase):
+    def setUp(self):
+        self.addCleanup(forget_dataset_version)
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.dir = Path(self.tmp.name)
+
+        st = State.objects.create(name="Ciudad de México")
+        muni = Municipality.objects.create(name="Álvaro Obregón", state=st)
+        setl = Settlement.objects.create(name="Col. A", municipality=muni)
+        region = Region.objects.create(name="Poniente")
+        for spot_id, lng, lat in ((25501, -99.21, 19.37), (25502, -99.22, 19.39), (25503, -99.14, 19.33)):
+            Spot.objects.create(
+                spot_id=spot_id, title=f"Spot {spot_id}", location=Point(lng, lat, srid=4326),
+                sector_id=9, type_id=1, modality="rent", settlement=setl, region=region,
+                area_sqm="120.50", price_total_rent_mxn="35000.00",
+            )
+        Spot.objects.create(
+            spot_id=25504, title="Sin entidades", location=Point(-99.2, 19.4, srid=4326),
+            sector_id=11, type_id=2, modality="sale",
+        )
+        Spot.objects.create(
+            spot_id=25505, title="Baja", location=Point(-99.2, 19.4, srid=4326),
+            sector_id=9, type_id=1, modality="rent", removed_at="2026-01-01T00:00:00Z",
+        )
+
+    def test_parquet_row_groups_and_columns(self):
+        path = self.dir / "spots.parquet"
+        assert write_snapshot(path, "parquet", row_group_size=2) == 4
+
+        file = pq.ParquetFile(path)
+        assert file.metadata.num_row_groups == 2
+        table = pq.read_table(path)
+        assert table.column("spot_id").to_pylist() == [25501, 25502, 25503, 25504]
+        assert table.schema.field("lat").type == pa.float64()
+        assert table.column("lng").to_pylist()[0] == -99.21
+        assert pa.types.is_dictionary(table.schema.field("municipality").type)
+        assert table.column("municipality").to_pylist() == ["Álvaro Obregón"] * 3 + [None]
+        assert table.column("state").to_pylist()[0] == "Ciudad de México"
+        assert table.column("corridor").null_count == 4
+        assert str(table.column("area_sqm")[0]) == "120.50"
+
+    def test_arrow_file(self):
+        path = self.dir / "spots.arrow"
+        assert write_snapshot(path, "arrow", row_group_size=3) == 4
+
+        with pa.memory_map(str(path)) as source:
+            reader = pa.ipc.open_file(source)
+            assert reader.num_record_batches == 2
+            table = reader.read_all()
+        assert table.column("modality").to_pylist() == ["rent", "rent", "rent", "sale"]
+        assert table.column("region").to_pylist() == ["Poniente"] * 3 + [None]
+
+    def test_endpoint_serves_current_version(self):
+        bump_dataset_version()
+        with override_settings(SPOTS_SNAPSHOT_DIR=self.dir):
+            r = self.client.get("/api/spots/export/parquet/")
+            assert r.status_code == 200
+            assert r["Content-Type"] == "application/vnd.apache.parquet"
+            assert 'filename="spots.parquet"' in r["Content-Disposition"]
+            table = pq.read_table(io.BytesIO(b"".join(r.streaming_content)))
+            assert table.num_rows == 4
+            first = list(self.dir.glob("spots-*.parquet"))
+            assert len(first) == 1
+
+            self.client.get("/api/spots/export/parquet/").close()
+            assert list(self.dir.glob("spots-*.parquet")) == first
+
+            bump_dataset_version()
+            self.client.get("/api/spots/export/parquet/").close()
+            files = list(self.dir.glob("spots-*.parquet"))
+            assert len(files) == 1 and files != first
+
+    def test_endpoint_without_dataset_version(self):
+        forget_dataset_version()
+        with override_settings(SPOTS_SNAPSHOT_DIR=self.dir):
+            assert self.client.get("/api/spots/export/arrow/").status_code == 503
+        assert list(self.dir.glob("spots-*")) == []
+
+    def test_command(self):
+        path = self.dir / "out" / "spots.arrow"
+        out = io.StringIO()
+        call_command("export_snapshot", output=str(path), row_group_size=2, stdout=out)
+        assert "4 spots" in out.getvalue()
+        assert pa.ipc.open_file(str(path)).read_all().num_rows == 4
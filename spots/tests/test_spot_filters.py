@@ -1,6 +1,8 @@
 from django.contrib.gis.geos import Point
+from django.http import QueryDict
 from rest_framework.test import APITestCase
-from spots.models import Spot, State, Municipality, Settlement
+from spots.api.filters import apply_spot_filters
+from spots.models import Spot, State, Municipality, Settlement, Region, Corridor
 
 
 class SpotsFilterTests(APITestCase):
@@ -12,6 +14,12 @@ class SpotsFilterTests(APITestCase):
         muni_co = Municipality.objects.create(name="Coyoacán", state=st)
         setl_co = Settlement.objects.create(name="Col. C", municipality=muni_co)
 
+        jal = State.objects.create(name="Jalisco")
+        muni_gdl = Municipality.objects.create(name="Guadalajara", state=jal)
+        setl_gdl = Settlement.objects.create(name="Col. G", municipality=muni_gdl)
+        region = Region.objects.create(name="Occidente")
+        corridor = Corridor.objects.create(name="Av. Vallarta")
+
         Spot.objects.create(
             spot_id=25001,
             title="AO retail single",
@@ -48,6 +56,22 @@ class SpotsFilterTests(APITestCase):
             settlement=setl_co,
             location=Point(-99.14, 19.33, srid=4326),
         )
+        Spot.objects.create(
+            spot_id=25505,
+            title="GDL retail single",
+            sector_id=12,
+            type_id=1,
+            modality="rent",
+            settlement=setl_gdl,
+            region=region,
+            corridor=corridor,
+            location=Point(-103.35, 20.67, srid=4326),
+        )
+
+    def ids(self, url):
+        r = self.client.get(url)
+        assert r.status_code == 200
+        return sorted(x["spot_id"] for x in r.json()["results"])
 
     def test_filter_by_sector_and_type_and_municipality(self):
         url = "/api/spots/?sector=9&type=1&municipality=Álvaro Obregón"
@@ -66,6 +90,12 @@ class SpotsFilterTests(APITestCase):
         ids = sorted(x["spot_id"] for x in data["results"])
         assert set(ids) == {25001, 25502, 25503}
 
+    def test_name_filters_run_in_the_same_query(self):
+        params = QueryDict("municipality=Álvaro OBREGóN&state=ciudad de méxico")
+        qs = apply_spot_filters(Spot.objects.all(), params).values_list("spot_id", flat=True)
+        with self.assertNumQueries(1):
+            assert sorted(qs) == [25001, 25502, 25503]
+
     def test_filter_by_sector_only(self):
         url = "/api/spots/?sector=12"
         r = self.client.get(url)
@@ -81,3 +111,50 @@ class SpotsFilterTests(APITestCase):
         data = r.json()
         ids = [x["spot_id"] for x in data["results"]]
         assert ids == [25502]
+
+    def test_denormalized_municipality_and_state(self):
+        spot = Spot.objects.get(spot_id=25505)
+        assert spot.municipality.name == "Guadalajara"
+        assert spot.state.name == "Jalisco"
+
+        spot.settlement = Settlement.objects.get(name="Col. C")
+        spot.save(update_fields=["settlement"])
+        spot.refresh_from_db()
+        assert spot.municipality.name == "Coyoacán"
+        assert spot.state.name == "Ciudad de México"
+
+    def test_filter_by_several_municipalities(self):
+        assert self.ids("/api/spots/?municipality=coyoacán,GUADALAJARA") == [25504, 25505]
+        assert self.ids("/api/spots/?municipality=Coyoacán&municipality=Guadalajara") == [25504, 25505]
+        assert self.ids("/api/spots/?municipality=Coyoacán,No existe") == [25504]
+        assert self.ids("/api/spots/?municipality=No existe") == []
+
+    def test_filter_by_state_region_corridor(self):
+        assert self.ids("/api/spots/?state=ciudad de méxico") == [25001, 25502, 25503, 25504]
+        assert self.ids("/api/spots/?state=Jalisco&sector=12") == [25505]
+        assert self.ids("/api/spots/?region=occidente") == [25505]
+        assert self.ids("/api/spots/?corridor=Av. Vallarta&municipality=Coyoacán") == []
+
+    def test_multi_value_sector_type_and_modality(self):
+        Spot.objects.filter(spot_id=25502).update(modality="sale")
+        assert self.ids("/api/spots/?sector=9,12&type=2") == [25502]
+        assert self.ids("/api/spots/?sector=12&sector=9&type=1") == [25001, 25503, 25504, 25505]
+        assert self.ids("/api/spots/?modality=sale,rent_sale") == [25502]
+        assert self.ids("/api/spots/?sector=abc&modality=otra") == [25001, 25502, 25503, 25504, 25505]
+
+    def test_range_filters(self):
+        for spot_id, area, rent, sale, created in (
+            (25001, "80.00", "15000.00", None, "2026-03-01T12:00:00Z"),
+            (25502, "450.00", "60000.00", "9000000.00", "2026-03-15T09:30:00Z"),
+            (25503, "120.00", None, "2500000.00", "2026-04-02T00:00:00Z"),
+        ):
+            Spot.objects.filter(spot_id=spot_id).update(
+                area_sqm=area, price_total_rent_mxn=rent, price_total_sale_mxn=sale, created_date=created,
+            )
+        assert self.ids("/api/spots/?area_sqm_min=100") == [25502, 25503]
+        assert self.ids("/api/spots/?area_sqm_min=80&area_sqm_max=120") == [25001, 25503]
+        assert self.ids("/api/spots/?price_total_rent_mxn_max=15000") == [25001]
+        assert self.ids("/api/spots/?price_total_sale_mxn_min=3000000&sector=9") == [25502]
+        assert self.ids("/api/spots/?created_date_min=2026-03-01&created_date_max=2026-03-15") == [25001, 25502]
+        assert self.ids("/api/spots/?created_date_max=2026-03-15T09:00:00Z") == [25001]
+        assert self.ids("/api/spots/?area_sqm_min=mucho") == [25001, 25502, 25503, 25504, 25505]
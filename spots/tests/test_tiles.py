@@ -0,0 +1,63 @@
+from django.contrib.gis.geos import Point
+from rest_framework.test import APITestCase
+
+from spots.cache import bump_dataset_version, forget_dataset_version
+from spots.models import Spot
+
+# Tile z=10 con los dos spots de Álvaro Obregón.
+TILE = "/api/spots/tiles/10/229/455.mvt"
+
+
+class VectorTileTests(APITestCase):
+    def setUp(self):
+        self.addCleanup(forget_dataset_version)
+        for spot_id, sector, lng, lat in (
+            (25501, 9, -99.21, 19.37),
+            (25502, 12, -99.22, 19.39),
+            (25503, 9, -99.05, 19.30),
+        ):
+            Spot.objects.create(
+                spot_id=spot_id, title=f"Spot {spot_id}", location=Point(lng, lat, srid=4326),
+                sector_id=sector, type_id=1, modality="rent", price_total_rent_mxn="35000.50",
+            )
+
+    def tile(self, url):
+        r = self.client.get(url)
+        assert r.status_code == 200
+        assert r["Content-Type"] == "application/vnd.mapbox-vector-tile"
+        return r
+
+    def test_tile_with_default_attributes(self):
+        body = self.tile(TILE).content
+        assert body
+        assert b"spots" in body
+        for key in (b"spot_id", b"sector_id", b"type_id", b"price_total_rent_mxn"):
+            assert key in body
+        assert b"title" not in body
+
+    def test_fields_and_filters(self):
+        body = self.tile(f"{TILE}?fields=title,sector_id,desconocido").content
+        assert b"Spot 25501" in body and b"Spot 25502" in body
+        assert b"price_total_rent_mxn" not in body and b"desconocido" not in body
+
+        body = self.tile(f"{TILE}?fields=title&sector=9").content
+        assert b"Spot 25501" in body and b"Spot 25502" not in body
+
+    def test_empty_and_out_of_range_tiles(self):
+        assert self.tile("/api/spots/tiles/10/0/0.mvt").content == b""
+        assert self.tile(f"{TILE}?sector=15").content == b""
+        assert self.client.get("/api/spots/tiles/2/4/0.mvt").status_code == 404
+        assert self.client.get("/api/spots/tiles/23/0/0.mvt").status_code == 404
+
+    def test_cached_by_dataset_version(self):
+        bump_dataset_version()
+        first = self.tile(TILE)
+        assert first["X-Cache"] == "MISS"
+        second = self.tile(TILE)
+        assert second["X-Cache"] == "HIT"
+        assert second.content == first.content
+
+        Spot.objects.filter(spot_id=25502).delete()
+        assert self.tile(TILE).content == first.content
+        bump_dataset_version()
+        assert b"Spot 25502" not in self.tile(f"{TILE}?fields=title").content
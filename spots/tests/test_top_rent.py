@@ -1,4 +1,5 @@
 from django.contrib.gis.geos import Point
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from spots.models import Spot, State, Municipality, Settlement
 
@@ -63,3 +64,37 @@ class TopRentRankingTests(APITestCase):
         data = r.json()
         titles = [x["title"] for x in data]
         assert titles == ["E-7000", "A-5000", "B-2000"]
+
+    def test_top_k_per_sector(self):
+        r = self.client.get("/api/spots/top-rent/?group_by=sector&limit=1")
+        assert r.status_code == 200
+        data = r.json()
+        assert [(g["key"], g["label"]) for g in data] == [(9, "Industrial"), (12, "Retail")]
+        assert [[x["title"] for x in g["results"]] for g in data] == [["A-5000"], ["C-8000"]]
+
+    def test_top_k_per_municipality_respects_filters(self):
+        r = self.client.get("/api/spots/top-rent/?group_by=municipality&limit=2")
+        data = r.json()
+        assert [g["label"] for g in data] == ["Álvaro Obregón", "Coyoacán"]
+        assert [x["title"] for x in data[0]["results"]] == ["E-7000", "A-5000"]
+
+        r = self.client.get("/api/spots/top-rent/?group_by=municipality&sector=9")
+        assert [(g["label"], len(g["results"])) for g in r.json()] == [("Álvaro Obregón", 2)]
+
+    def test_top_k_null_group(self):
+        data = self.client.get("/api/spots/top-rent/?group_by=region&limit=2").json()
+        assert len(data) == 1
+        assert data[0]["key"] is None and data[0]["label"] is None
+        assert [x["title"] for x in data[0]["results"]] == ["C-8000", "E-7000"]
+
+    def test_top_k_invalid_group(self):
+        r = self.client.get("/api/spots/top-rent/?group_by=corridor")
+        assert r.status_code == 400
+        assert "group_by" in r.json()
+
+    def test_top_k_fast_path_matches_serializer(self):
+        url = "/api/spots/top-rent/?group_by=sector&limit=2"
+        fast = self.client.get(url).content
+        with override_settings(SPOTS_FAST_SERIALIZER=False):
+            slow = self.client.get(url).content
+        assert fast == slow
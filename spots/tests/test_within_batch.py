@@ -0,0 +1,86 @@
+from django.contrib.gis.geos import Point
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from spots import memindex
+from spots.models import Spot
+
+SQUARE_AO = [[-99.25, 19.35], [-99.25, 19.41], [-99.18, 19.41], [-99.18, 19.35]]
+SQUARE_CO = [[-99.16, 19.31], [-99.16, 19.35], [-99.12, 19.35], [-99.12, 19.31]]
+HOLE_S1 = [[-99.215, 19.365], [-99.205, 19.365], [-99.205, 19.375], [-99.215, 19.375]]
+
+
+class SpotsWithinBatchTests(APITestCase):
+    def setUp(self):
+        memindex.invalidate()
+        for spot_id, lng, lat, sector in (
+            (25501, -99.21, 19.37, 9),
+            (25502, -99.22, 19.39, 12),
+            (25503, -99.14, 19.33, 9),
+        ):
+            Spot.objects.create(
+                spot_id=spot_id, title=str(spot_id),
+                location=Point(lng, lat, srid=4326),
+                sector_id=sector, type_id=1, modality="rent",
+            )
+
+    def tearDown(self):
+        memindex.invalidate()
+
+    def post(self, payload, query=""):
+        r = self.client.post(f"/api/spots/within-batch/{query}", payload, format="json")
+        assert r.status_code == 200, r.content
+        return r.json()["results"]
+
+    def batch(self):
+        return [
+            {"type": "Polygon", "coordinates": [SQUARE_AO]},
+            {"type": "Polygon", "coordinates": [SQUARE_AO, HOLE_S1]},
+            {"type": "MultiPolygon", "coordinates": [[SQUARE_AO], [SQUARE_CO]]},
+            {"type": "Polygon", "coordinates": [[[0, 0], [0, 1], [1, 1], [1, 0]]]},
+        ]
+
+    def test_counts_per_polygon(self):
+        results = self.post({"polygons": self.batch()})
+        assert [x["count"] for x in results] == [2, 1, 3, 0]
+        assert [x["index"] for x in results] == [0, 1, 2, 3]
+        assert "spot_ids" not in results[0]
+
+    def test_ids_per_polygon(self):
+        results = self.post({"polygons": self.batch(), "mode": "ids"})
+        assert [x["spot_ids"] for x in results] == [[25501, 25502], [25502], [25501, 25502, 25503], []]
+
+    def test_respects_list_filters(self):
+        results = self.post({"polygons": self.batch(), "mode": "ids"}, query="?sector=9")
+        assert [x["spot_ids"] for x in results] == [[25501], [], [25501, 25503], []]
+
+    def test_memory_index_matches_postgis(self):
+        payload = {"polygons": self.batch(), "mode": "ids"}
+        postgis = self.post(payload)
+        with override_settings(SPOTS_MEMORY_INDEX=True):
+            assert self.post(payload) == postgis
+
+    def test_invalid_polygon_reports_position(self):
+        payload = {"polygons": [self.batch()[0], {"type": "Point", "coordinates": [-99.2, 19.4]}]}
+        r = self.client.post("/api/spots/within-batch/", payload, format="json")
+        assert r.status_code == 400
+        assert "1" in r.json()["polygons"]
+
+    def test_requires_polygons(self):
+        r = self.client.post("/api/spots/within-batch/", {"polygons": []}, format="json")
+        assert r.status_code == 400
+
+    def test_within_accepts_holes_and_multipolygons(self):
+        r = self.client.post(
+            "/api/spots/within/",
+            {"polygon": {"type": "Polygon", "coordinates": [SQUARE_AO, HOLE_S1]}},
+            format="json",
+        )
+        assert [x["spot_id"] for x in r.json()["results"]] == [25502]
+
+        r = self.client.post(
+            "/api/spots/within/",
+            {"polygon": {"type": "MultiPolygon", "coordinates": [[SQUARE_AO], [SQUARE_CO]]}},
+            format="json",
+        )
+        assert [x["spot_id"] for x in r.json()["results"]] == [25501, 25502, 25503]